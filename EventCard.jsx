@@ -17,11 +17,15 @@ export function EventCard({ event }) {
     <Card className="h-full flex flex-col hover:shadow-lg transition-shadow duration-300">
       <CardHeader className="p-0">
         <div className="relative">
-          <img 
-            src={event.image} 
-            alt={event.title}
-            className="w-full h-48 object-cover rounded-t-lg"
-          />
+          {event.image ? (
+            <img 
+              src={event.image} 
+              alt={event.title}
+              className="w-full h-48 object-cover rounded-t-lg"
+            />
+          ) : (
+            <div className="w-full h-48 bg-muted rounded-t-lg" />
+          )}
           <Badge 
             variant="secondary" 
             className="absolute top-2 right-2 bg-green-100 text-green-800 border-green-200"
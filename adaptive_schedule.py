@@ -0,0 +1,97 @@
+import logging
+from datetime import datetime, time, timezone
+from typing import Dict, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveSchedule:
+    """
+    Polling interval for one source that follows its observed change rate
+
+    After each run the share of new, changed and removed events is folded
+    into an exponentially weighted change rate. Busy sources have their
+    interval halved, quiet ones stretched by grow_factor, always within
+    [min_minutes, max_minutes]. During quiet hours (local time) the
+    interval is multiplied by quiet_multiplier, still capped at max_minutes.
+    """
+
+    def __init__(self,
+                 initial_minutes: float = 20,
+                 min_minutes: float = 10,
+                 max_minutes: float = 180,
+                 busy_rate: float = 0.2,
+                 idle_rate: float = 0.02,
+                 grow_factor: float = 1.5,
+                 smoothing: float = 0.5,
+                 quiet_hours: Optional[Tuple[str, str]] = ('01:00', '07:00'),
+                 quiet_multiplier: float = 4,
+                 timezone_name: str = 'Europe/Amsterdam'):
+        if min_minutes > max_minutes:
+            raise ValueError("min_minutes must not exceed max_minutes")
+        self.min_minutes = min_minutes
+        self.max_minutes = max_minutes
+        self.busy_rate = busy_rate
+        self.idle_rate = idle_rate
+        self.grow_factor = grow_factor
+        self.smoothing = smoothing
+        self.quiet_hours = tuple(time.fromisoformat(value) for value in quiet_hours) if quiet_hours else None
+        self.quiet_multiplier = quiet_multiplier
+        self.timezone = ZoneInfo(timezone_name)
+
+        self.interval_minutes = self._clamp(initial_minutes)
+        self.change_rate: Optional[float] = None
+        self.last_changes: Dict[str, int] = {}
+
+    def _clamp(self, minutes: float) -> float:
+        return max(self.min_minutes, min(self.max_minutes, minutes))
+
+    def record_run(self, new: int, changed: int, removed: int, total: int):
+        """Fold one run's changes into the change rate and adjust the interval"""
+        observed = (new + changed + removed) / max(total + removed, 1)
+        if self.change_rate is None:
+            self.change_rate = observed
+        else:
+            self.change_rate = self.smoothing * observed + (1 - self.smoothing) * self.change_rate
+        self.last_changes = {'new': new, 'changed': changed, 'removed': removed, 'total': total}
+
+        previous = self.interval_minutes
+        if self.change_rate >= self.busy_rate:
+            self.interval_minutes = self._clamp(self.interval_minutes / 2)
+        elif self.change_rate <= self.idle_rate:
+            self.interval_minutes = self._clamp(self.interval_minutes * self.grow_factor)
+
+        if self.interval_minutes != previous:
+            logger.info(
+                f"Polling interval changed from {previous:.0f} to {self.interval_minutes:.0f} minutes "
+                f"(change rate {self.change_rate:.2f})"
+            )
+
+    def in_quiet_hours(self, now: Optional[datetime] = None) -> bool:
+        """Whether now (UTC) falls within the configured local quiet hours"""
+        if not self.quiet_hours:
+            return False
+        now = now or datetime.utcnow()
+        local_time = now.replace(tzinfo=timezone.utc).astimezone(self.timezone).time()
+        start, end = self.quiet_hours
+        if start <= end:
+            return start <= local_time < end
+        # Quiet hours spanning midnight, e.g. 23:00 - 06:00
+        return local_time >= start or local_time < end
+
+    def current_interval(self, now: Optional[datetime] = None) -> float:
+        """Effective interval in minutes, including quiet-hours backoff"""
+        if self.in_quiet_hours(now):
+            return min(self.max_minutes, self.interval_minutes * self.quiet_multiplier)
+        return self.interval_minutes
+
+    def to_dict(self, now: Optional[datetime] = None) -> Dict:
+        """Schedule state for status endpoints"""
+        return {
+            'interval_minutes': round(self.current_interval(now), 1),
+            'base_interval_minutes': round(self.interval_minutes, 1),
+            'change_rate': round(self.change_rate, 3) if self.change_rate is not None else None,
+            'quiet_hours': self.in_quiet_hours(now),
+            'last_changes': self.last_changes
+        }
@@ -0,0 +1,214 @@
+import os
+import re
+import json
+import time
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Tuple
+from urllib.parse import parse_qsl
+from src.broadcast import (SSE_KEEPALIVE_SECONDS, SSE_POLL_SECONDS, broadcaster, sse_delivery_seconds,
+                           update_notifier)
+from src.models.event import Event
+from src.models.event_index import query_active_events
+from src.routes.events import event_filters
+from src.routes.request_metrics import request_seconds
+
+logger = logging.getLogger(__name__)
+
+# Threads running blocking database reads; keep DATABASE_POOL_SIZE at least as large
+ASYNC_READ_POOL_SIZE = int(os.environ.get('ASYNC_READ_POOL_SIZE', 16))
+
+EVENT_PATH_RE = re.compile(r'^/api/events/(\d+)$')
+
+
+class EventsASGI:
+    """
+    ASGI app serving the event read endpoints without blocking the event loop
+
+    GET /api/events, /api/events/<id> and /api/categories run their
+    queries in a thread pool inside a Flask app context, with the same
+    filter parsing (event_filters) and model queries as the Flask routes.
+    The event loop only parses requests and sends responses, so many slow
+    clients do not tie up database threads. GET /api/events/stream is an
+    event stream held by the event loop alone, so thousands of clients
+    cost no threads. Every other request is passed to the Flask app
+    through asgiref's WsgiToAsgi when it is installed.
+    """
+
+    def __init__(self, flask_app, pool_size: int = ASYNC_READ_POOL_SIZE):
+        self.flask_app = flask_app
+        self.pool = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix='asgi-read')
+        self.fallback = self._wsgi_fallback(flask_app)
+
+    @staticmethod
+    def _wsgi_fallback(flask_app):
+        try:
+            from asgiref.wsgi import WsgiToAsgi
+        except ImportError:
+            logger.warning("asgiref is not installed, only the event read endpoints are served over ASGI")
+            return None
+        return WsgiToAsgi(flask_app)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+
+        if scope['type'] == 'http' and scope['method'] == 'GET' and scope['path'] == '/api/events/stream':
+            await self._stream(scope, receive, send)
+            return
+
+        route = self._route(scope) if scope['type'] == 'http' else None
+        if route is None:
+            if self.fallback is not None:
+                await self.fallback(scope, receive, send)
+            elif scope['type'] == 'http':
+                await self._send(send, 404, json.dumps({'error': 'Not found'}).encode('utf-8'))
+            return
+
+        rule, handler = route
+        start = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        status, body = await loop.run_in_executor(self.pool, self._run, handler, scope)
+        await self._send(send, status, body)
+        request_seconds.observe(time.perf_counter() - start, route=rule, method='GET', status=status)
+
+    def _route(self, scope) -> Optional[Tuple[str, Callable]]:
+        """Flask rule and handler for the natively served read endpoints"""
+        if scope['method'] != 'GET':
+            return None
+        path = scope['path']
+        if path == '/api/events':
+            return '/api/events', self._get_events
+        if path == '/api/categories':
+            return '/api/categories', self._get_categories
+        match = EVENT_PATH_RE.match(path)
+        if match:
+            return '/api/events/<int:event_id>', lambda args: self._get_event(int(match.group(1)))
+        return None
+
+    def _run(self, handler: Callable, scope) -> Tuple[int, bytes]:
+        """Run a handler in a read pool thread and serialize its result"""
+        args = dict(parse_qsl(scope.get('query_string', b'').decode('latin-1')))
+        try:
+            with self.flask_app.app_context():
+                status, data = handler(args)
+        except Exception as e:
+            logger.error(f"Error serving {scope['path']}: {str(e)}")
+            status, data = 500, {'error': str(e)}
+        return status, json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    def _get_events(self, args):
+        try:
+            filters = event_filters(args)
+        except ValueError as e:
+            return 400, {'error': str(e)}
+        events_data, _ = query_active_events(**filters)
+        return 200, {'events': events_data, 'total': len(events_data)}
+
+    def _get_event(self, event_id: int):
+        event = Event.get_active_event(event_id)
+        if event:
+            return 200, event.to_dict()
+        return 404, {'error': 'Event not found'}
+
+    def _get_categories(self, args):
+        return 200, {'categories': Event.get_categories()}
+
+    async def _send(self, send, status: int, body: bytes):
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [
+                (b'content-type', b'application/json'),
+                (b'content-length', str(len(body)).encode('ascii')),
+                (b'access-control-allow-origin', b'*'),
+            ]
+        })
+        await send({'type': 'http.response.body', 'body': body})
+
+    async def _stream(self, scope, receive, send):
+        """Event stream of update summaries, as GET /api/events/stream in Flask"""
+        update_notifier.start_watcher(self.flask_app)
+        headers = dict(scope.get('headers') or [])
+        last_event_id = headers.get(b'last-event-id', b'').decode('latin-1')
+        subscriber = broadcaster.subscribe_async(last_event_id)
+
+        disconnected = asyncio.ensure_future(self._wait_disconnect(receive))
+        message = None
+        try:
+            await send({
+                'type': 'http.response.start',
+                'status': 200,
+                'headers': [
+                    (b'content-type', b'text/event-stream; charset=utf-8'),
+                    (b'cache-control', b'no-cache'),
+                    (b'x-accel-buffering', b'no'),
+                    (b'access-control-allow-origin', b'*'),
+                ]
+            })
+            await self._send_chunk(send, f'retry: {int(SSE_POLL_SECONDS * 1000)}\n\n'.encode('ascii'))
+            while True:
+                if message is None:
+                    message = asyncio.ensure_future(subscriber.queue.get())
+                done, _ = await asyncio.wait({message, disconnected}, timeout=SSE_KEEPALIVE_SECONDS,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                if disconnected in done:
+                    break
+                if message not in done:
+                    await self._send_chunk(send, b': keepalive\n\n')
+                    continue
+                item, message = message.result(), None
+                if item is None:
+                    break
+                published_at, body = item
+                await self._send_chunk(send, body)
+                sse_delivery_seconds.observe(time.monotonic() - published_at, transport=subscriber.transport)
+            if not disconnected.done():
+                await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
+        except OSError:
+            # The client went away while a message was being written
+            pass
+        finally:
+            disconnected.cancel()
+            if message is not None:
+                message.cancel()
+            broadcaster.unsubscribe(subscriber)
+
+    @staticmethod
+    async def _wait_disconnect(receive):
+        while (await receive())['type'] != 'http.disconnect':
+            pass
+
+    @staticmethod
+    async def _send_chunk(send, body: bytes):
+        await send({'type': 'http.response.body', 'body': body, 'more_body': True})
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.pool.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+
+def create_asgi_app(flask_app=None) -> EventsASGI:
+    """ASGI entry point wrapping the Flask app from create_app()"""
+    if flask_app is None:
+        from src.main import create_app
+
+        flask_app = create_app()
+    return EventsASGI(flask_app)
+
+
+def __getattr__(name):
+    """Create the module-level app on first access (e.g. uvicorn 'src.asgi:app'), not on import"""
+    if name == 'app':
+        global app
+        app = create_asgi_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,81 @@
+"""
+Flask (threaded WSGI) vs ASGI read path for the event endpoints
+
+Usage:
+    python benchmarks/bench_async_api.py --events 5000 --concurrency 64 --duration 10
+
+Seeds a throwaway SQLite database (the local stand-in database), serves the
+same app through werkzeug's threaded server and through src.asgi under
+uvicorn, replays the same mix of /api/events, /api/events/<id> and
+/api/categories requests against both and prints requests/s and latency
+percentiles as JSON. The ASGI run is skipped when uvicorn is not installed.
+"""
+import os
+import sys
+import json
+import random
+import argparse
+import tempfile
+from urllib.parse import urlencode
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fixtures import TOPICS
+from loadgen import run_load, serve_asgi, serve_wsgi
+
+from src.scrapers.synthetic import CATEGORIES
+
+
+def seed(app, count: int):
+    from src.scrapers.data_manager import DataManager
+
+    with app.app_context():
+        DataManager(source_config={}).seed_sample_data(count=count)
+
+
+def request_mix(count: int) -> list:
+    rng = random.Random(1)
+    paths = []
+    for _ in range(200):
+        roll = rng.random()
+        if roll < 0.4:
+            paths.append(f'/api/events/{rng.randint(1, count)}')
+        elif roll < 0.6:
+            paths.append('/api/categories')
+        elif roll < 0.8:
+            paths.append('/api/events?' + urlencode({'category': rng.choice(CATEGORIES), 'date': 'today'}))
+        else:
+            paths.append('/api/events?' + urlencode({'search': rng.choice(TOPICS).split()[0].lower(), 'date': 'tomorrow'}))
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--events', type=int, default=5000)
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--duration', type=float, default=10.0)
+    args = parser.parse_args()
+
+    database = os.path.join(tempfile.mkdtemp(prefix='bench-api-'), 'events.db')
+    os.environ['DATABASE_URL'] = f'sqlite:///{database}'
+    os.environ['SCHEDULER_ENABLED'] = '0'
+
+    from src.main import create_app
+    from src.asgi import create_asgi_app
+
+    app = create_app(start_scheduler=False)
+    seed(app, args.events)
+    paths = request_mix(args.events)
+
+    report = {'events': args.events, 'database': 'sqlite (temporary)'}
+    report['wsgi_threaded'] = run_load(serve_wsgi(app), paths, args.concurrency, args.duration)
+    try:
+        report['asgi'] = run_load(serve_asgi(create_asgi_app(app)), paths, args.concurrency, args.duration)
+    except ImportError:
+        report['asgi'] = {'skipped': 'uvicorn is not installed'}
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
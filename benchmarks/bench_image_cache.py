@@ -0,0 +1,102 @@
+"""
+Image cache against a local stand-in image host
+
+Usage:
+    python benchmarks/bench_image_cache.py --images 50 --max-kb 64
+
+Serves generated PNGs from a local HTTP server, localizes a batch of events
+twice (cold, then warm) into a temporary cache directory and prints a JSON
+report with timings, hit/miss counts and the cache size after eviction.
+"""
+import os
+import sys
+import json
+import time
+import zlib
+import struct
+import shutil
+import argparse
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.scrapers.image_cache import ImageCache, image_cache_lookups_total
+
+
+def png(width: int, height: int, seed: int) -> bytes:
+    """RGB PNG with a per-seed pattern, so every image has distinct content"""
+    rows = b''.join(
+        b'\x00' + bytes(value for x in range(width) for value in ((x + seed) % 256, (y + seed) % 256, (x * y) % 256))
+        for y in range(height)
+    )
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data) & 0xffffffff)
+
+    header = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+    return b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', header) + chunk(b'IDAT', zlib.compress(rows)) + chunk(b'IEND', b'')
+
+
+class ImageHandler(BaseHTTPRequestHandler):
+    images = {}
+
+    def do_GET(self):
+        body = self.images.get(self.path)
+        if body is None:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/png')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def lookups() -> dict:
+    return {result: image_cache_lookups_total.value(result=result) for result in ('hit', 'miss', 'error', 'skipped')}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--images', type=int, default=50)
+    parser.add_argument('--size', type=int, default=600, help='Width of the generated images in pixels')
+    parser.add_argument('--max-kb', type=int, default=0, help='Cache budget in KiB (0 = unbounded)')
+    args = parser.parse_args()
+
+    ImageHandler.images = {f'/{index}.png': png(args.size, args.size * 5 // 8, index) for index in range(args.images)}
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ImageHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f'http://127.0.0.1:{server.server_address[1]}'
+
+    directory = tempfile.mkdtemp(prefix='image-cache-')
+    cache = ImageCache(directory=directory, max_bytes=args.max_kb * 1024 or 2 ** 62)
+    report = {'images': args.images, 'source_bytes': sum(map(len, ImageHandler.images.values()))}
+    try:
+        for run in ('cold', 'warm'):
+            events = [{'title': f'Event {index}', 'image': f'{base_url}/{index}.png'} for index in range(args.images)]
+            before = lookups()
+            start = time.perf_counter()
+            localized = list(cache.iter_localized(events, max_workers=4))
+            after = lookups()
+            report[run] = {
+                'seconds': round(time.perf_counter() - start, 3),
+                'localized': sum(1 for event in localized if event['image'].startswith('/api/images/')),
+                **{result: after[result] - before[result] for result in after}
+            }
+            # Evict as trim_image_cache does after an update (no events to keep here)
+            report[run]['evicted'] = cache.evict() if cache.over_budget() else 0
+        report['cache_bytes'] = sum(size for _, size, _ in cache._scan())
+        report['cached_files'] = sum(1 for _ in cache._scan())
+    finally:
+        server.shutdown()
+        shutil.rmtree(directory, ignore_errors=True)
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+Cold-start import time of the web process
+
+Usage:
+    python benchmarks/bench_import.py --runs 10
+    python benchmarks/bench_import.py --importtime 15   # slowest modules per target
+
+Each target is imported in fresh interpreters. The report gives the median
+and max import time and whether the scraping stack (requests, bs4,
+APScheduler, DataManager) was loaded. Web workers should run with
+SCHEDULER_ENABLED=0 and must not load it.
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# What a web worker does on startup, and the heavier scheduler process for comparison
+TARGETS = {
+    'routes': ('import src.routes.events', {}),
+    'web_worker': ('import src.main; src.main.create_app()', {'SCHEDULER_ENABLED': '0'}),
+    'scheduler_process': ('import src.main; src.main.create_app(start_scheduler=False); '
+                          'import src.scrapers.data_manager, apscheduler.schedulers.background', {}),
+}
+SCRAPING_MODULES = ('requests', 'bs4', 'apscheduler', 'src.scrapers.data_manager', 'src.scrapers.sources')
+
+PROBE = '''
+import sys, time, json
+start = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'seconds': elapsed, 'loaded': [m for m in {modules!r} if m in sys.modules],
+                   'modules': len(sys.modules)}}))
+'''
+
+
+def run_target(code: str, env: dict) -> dict:
+    result = subprocess.run(
+        [sys.executable, '-c', PROBE.format(code=code, modules=SCRAPING_MODULES)],
+        cwd=ROOT, env={**os.environ, **env, 'PYTHONPATH': ROOT}, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def slowest_imports(code: str, env: dict, top: int) -> list:
+    """Cumulative import times from python -X importtime"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=ROOT, env={**os.environ, **env, 'PYTHONPATH': ROOT}, capture_output=True, text=True
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, module = line[len('import time:'):].split('|')
+        rows.append({'module': module.strip(), 'cumulative_ms': round(int(cumulative_us) / 1000, 1)})
+    return sorted(rows, key=lambda row: row['cumulative_ms'], reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--targets', nargs='*', choices=sorted(TARGETS), default=sorted(TARGETS))
+    parser.add_argument('--importtime', type=int, default=0, help='Also list the N slowest imports per target')
+    args = parser.parse_args()
+
+    report = {}
+    for name in args.targets:
+        code, env = TARGETS[name]
+        runs = [run_target(code, env) for _ in range(args.runs)]
+        seconds = [run['seconds'] for run in runs]
+        report[name] = {
+            'median_ms': round(statistics.median(seconds) * 1000, 1),
+            'max_ms': round(max(seconds) * 1000, 1),
+            'modules': runs[-1]['modules'],
+            'scraping_stack_loaded': runs[-1]['loaded'],
+        }
+        if args.importtime:
+            report[name]['slowest_imports'] = slowest_imports(code, env, args.importtime)
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
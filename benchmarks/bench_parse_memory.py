@@ -0,0 +1,88 @@
+"""
+Peak memory of parsing a listing page as one tree vs container by container
+
+Usage:
+    python benchmarks/bench_parse_memory.py --events 500 5000 50000
+    python benchmarks/bench_parse_memory.py --fixtures path/to/recorded/pages
+
+Each measurement runs in a fresh child process, which builds the page and
+then parses every container of it with the I amsterdam scraper. Reported
+per page size and mode: peak traced Python allocations during the parse,
+growth of the process's peak RSS during the parse, time and events found.
+With streaming the peaks should stay flat as pages grow.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import subprocess
+import tracemalloc
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+MODES = ('tree', 'stream')
+
+
+def max_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    scale = 1 if sys.platform == 'darwin' else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 1e6
+
+
+def child(mode: str, events: int, fixtures: str) -> dict:
+    from fixtures import fixture_pages
+    from src.scrapers.iamsterdam_scraper import IAmsterdamScraper
+
+    page = fixture_pages('iamsterdam', 1, events, fixtures)[0]
+    scraper = IAmsterdamScraper(stream_listing=(mode == 'stream'))
+    # Import BeautifulSoup and warm caches outside the measurement
+    scraper.parse_listing(b'<div class="event"><h3 class="title">Warm up</h3></div>')
+
+    rss_before = max_rss_mb()
+    tracemalloc.start()
+    start = time.perf_counter()
+    found = sum(1 for _ in scraper.iter_listing(page, max_events=10 ** 9))
+    elapsed = time.perf_counter() - start
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'mode': mode,
+        'page_bytes': len(page),
+        'events': found,
+        'seconds': round(elapsed, 3),
+        'peak_traced_mb': round(traced_peak / 1e6, 2),
+        'rss_growth_mb': round(max_rss_mb() - rss_before, 2)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--events', type=int, nargs='+', default=[500, 5000, 50000], help='Containers per page')
+    parser.add_argument('--fixtures', help='Directory with recorded iamsterdam*.html pages')
+    parser.add_argument('--child', nargs=2, metavar=('MODE', 'EVENTS'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(child(args.child[0], int(args.child[1]), args.fixtures)))
+        return
+
+    results = []
+    for events in args.events:
+        for mode in MODES:
+            command = [sys.executable, os.path.abspath(__file__), '--child', mode, str(events)]
+            if args.fixtures:
+                command += ['--fixtures', args.fixtures]
+            output = subprocess.run(command, capture_output=True, text=True)
+            if output.returncode != 0:
+                results.append({'mode': mode, 'events': events, 'error': output.stderr.strip().splitlines()[-1:]})
+                continue
+            results.append(json.loads(output.stdout.strip().splitlines()[-1]))
+
+    print(json.dumps({'source': 'iamsterdam', 'results': results}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Parse throughput with and without the parse process pool
+
+Usage:
+    python benchmarks/bench_parsing.py --source iamsterdam --pages 32 --events 500
+    python benchmarks/bench_parsing.py --fixtures path/to/recorded/pages
+    python benchmarks/bench_parsing.py --source eventbrite --dom-only   # without structured data
+
+Prints a JSON report with pages/s and speedup per worker count.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fixtures import fixture_pages
+from src.scrapers.sources import get_registered_sources
+from src.scrapers.parsing import ParsePool
+
+
+def run(source_key: str, pages, workers: int, options: dict) -> dict:
+    source = get_registered_sources()[source_key](max_events=100000, adaptive=None, circuit_breaker=None, **options)
+    pool = ParsePool(workers=workers)
+    try:
+        # Warm up the worker processes outside the measurement
+        if workers:
+            for _ in pool.parse_pages(source, pages[:1]):
+                pass
+        start = time.perf_counter()
+        events = 0
+        for parsed in pool.parse_pages(source, pages):
+            events += sum(1 for _ in parsed)
+        elapsed = time.perf_counter() - start
+    finally:
+        pool.shutdown()
+    return {'workers': workers, 'seconds': round(elapsed, 3), 'events': events,
+            'pages_per_second': round(len(pages) / elapsed, 2)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--source', default='iamsterdam', choices=sorted(get_registered_sources()))
+    parser.add_argument('--pages', type=int, default=32)
+    parser.add_argument('--events', type=int, default=500, help='Events per synthetic page')
+    parser.add_argument('--fixtures', help='Directory with recorded <source>*.html pages')
+    parser.add_argument('--dom-only', action='store_true',
+                        help='Eventbrite: disable structured-data-first extraction')
+    parser.add_argument('--workers', type=int, nargs='*', help='Worker counts to compare (0 = in-process)')
+    args = parser.parse_args()
+
+    cpus = os.cpu_count() or 1
+    worker_counts = args.workers or sorted({0, 1, 2, max(1, cpus // 2), cpus})
+    pages = fixture_pages(args.source, args.pages, args.events, args.fixtures)
+
+    options = {'structured_first': False} if args.dom_only else {}
+    results = [run(args.source, pages, workers, options) for workers in worker_counts]
+    baseline = results[0]['seconds']
+    for result in results:
+        result['speedup'] = round(baseline / result['seconds'], 2) if result['seconds'] else None
+
+    print(json.dumps({
+        'source': args.source,
+        'pages': len(pages),
+        'page_bytes': sum(len(page) for page in pages) // len(pages),
+        'cpus': cpus,
+        'results': results
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""Listing page fixtures for the scraper benchmarks"""
+import os
+import json
+import random
+from datetime import date, timedelta
+
+VENUES = [
+    'Vondelpark', 'Paradiso', 'Melkweg', 'OBA Oosterdok', 'NDSM Wharf', 'Concertgebouw',
+    'Westergas', 'De Hallen', 'Muziekgebouw aan het IJ', 'Zoku Amsterdam'
+]
+TOPICS = [
+    'Free Concert', 'Open Air Cinema', 'Gallery Opening', 'Yoga in the Park', 'Community Lunch',
+    'Jazz Night', 'Street Art Tour', 'Meditation Session', 'Comedy Show', 'Networking Meetup'
+]
+
+
+def load_fixture(path: str) -> bytes:
+    """Read a recorded listing page"""
+    with open(path, 'rb') as fixture:
+        return fixture.read()
+
+
+def synthetic_listing_page(source: str, events: int, seed: int = 0, structured: bool = True) -> bytes:
+    """
+    Build a listing page resembling the source's markup
+
+    Args:
+        source: 'iamsterdam' or 'eventbrite'
+        events: Number of event containers
+        seed: Random seed, so pages are reproducible
+        structured: Also embed the events as JSON-LD (eventbrite only)
+    """
+    rng = random.Random(seed)
+    start = date.today()
+    cards = []
+    json_ld = []
+    for index in range(events):
+        topic = rng.choice(TOPICS)
+        venue = rng.choice(VENUES)
+        day = start + timedelta(days=rng.randint(0, 90))
+        hour = rng.randint(9, 21)
+        title = f'{topic} #{index} at {venue}'
+        description = f'{topic} in {venue}. ' * rng.randint(3, 12)
+        if source == 'eventbrite':
+            cards.append(
+                f'<article class="search-event-card">'
+                f'<h3 class="event-card__title">{title}</h3>'
+                f'<a href="/e/event-{index}">Details</a>'
+                f'<time datetime="{day.isoformat()}T{hour:02d}:00:00">{day.strftime("%A, %B %d, %Y")}</time>'
+                f'<div class="event-card__location">{venue}</div>'
+                f'<p class="event-card__summary">{description}</p>'
+                f'<img src="//img.example.com/{index}.jpg">'
+                f'<div class="event-card__organizer">Host {index % 50}</div>'
+                f'</article>'
+            )
+            json_ld.append({
+                '@type': 'Event',
+                'name': title,
+                'url': f'https://www.eventbrite.com/e/event-{index}',
+                'startDate': f'{day.isoformat()}T{hour:02d}:00:00',
+                'description': description,
+                'location': {'@type': 'Place', 'name': venue,
+                             'address': {'streetAddress': venue, 'addressLocality': 'Amsterdam'}},
+                'image': f'https://img.example.com/{index}.jpg',
+                'organizer': {'name': f'Host {index % 50}'}
+            })
+        else:
+            cards.append(
+                f'<div class="event-card">'
+                f'<h3 class="event-title">{title}</h3>'
+                f'<span class="event-date">{day.day} {day.strftime("%B")} {day.year} {hour}:00 - {hour + 2}:00</span>'
+                f'<p class="event-location">{venue}</p>'
+                f'<p class="event-description">Free entry. {description}</p>'
+                f'<img src="/images/{index}.jpg">'
+                f'</div>'
+            )
+    head = '<title>Events</title>'
+    if structured and json_ld:
+        head += f'<script type="application/ld+json">{json.dumps(json_ld)}</script>'
+    page = f'<html><head>{head}</head><body><main>' + ''.join(cards) + '</main></body></html>'
+    return page.encode('utf-8')
+
+
+def fixture_pages(source: str, pages: int, events_per_page: int, fixture_dir: str = None):
+    """Recorded pages from fixture_dir when present, synthetic pages otherwise"""
+    if fixture_dir and os.path.isdir(fixture_dir):
+        recorded = sorted(
+            os.path.join(fixture_dir, name) for name in os.listdir(fixture_dir)
+            if name.startswith(source) and name.endswith('.html')
+        )
+        if recorded:
+            return [load_fixture(recorded[index % len(recorded)]) for index in range(pages)]
+    return [synthetic_listing_page(source, events_per_page, seed=index) for index in range(pages)]
@@ -0,0 +1,148 @@
+"""HTTP load generator and server helpers for the API benchmarks"""
+import math
+import time
+import socket
+import threading
+from collections import Counter
+from http.client import HTTPConnection
+from typing import Dict, List, Sequence
+from urllib.parse import urlsplit
+
+
+def percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def latency_summary(latencies: List[float]) -> Dict:
+    """Latency percentiles in milliseconds"""
+    latencies = sorted(latencies)
+    return {
+        name: round(percentile(latencies, fraction) * 1000, 2)
+        for name, fraction in (('p50', 0.5), ('p90', 0.9), ('p99', 0.99), ('max', 1.0))
+    }
+
+
+def run_load(base_url: str, paths: Sequence[str], concurrency: int = 16, duration: float = 10.0,
+             warmup: float = 1.0) -> Dict:
+    """
+    Replay paths round-robin from concurrent keep-alive clients
+
+    Paths are URLs or (label, URL) pairs; labelled requests also get
+    per-label latency percentiles. Requests during the warmup period are
+    sent but not recorded.
+
+    Returns:
+        Throughput, latency percentiles, status counts and errors
+    """
+    target = urlsplit(base_url)
+    paths = [path if isinstance(path, tuple) else (None, path) for path in paths]
+    latencies: List[float] = []
+    labelled: Dict[str, List[float]] = {}
+    statuses = Counter()
+    errors = Counter()
+    lock = threading.Lock()
+    start = time.perf_counter()
+    record_from = start + warmup
+    stop_at = record_from + duration
+
+    def client(offset: int):
+        connection = HTTPConnection(target.hostname, target.port, timeout=60)
+        local_latencies = []
+        local_labelled: Dict[str, List[float]] = {}
+        local_statuses = Counter()
+        local_errors = Counter()
+        index = offset
+        while True:
+            sent = time.perf_counter()
+            if sent >= stop_at:
+                break
+            label, path = paths[index % len(paths)]
+            index += concurrency
+            try:
+                connection.request('GET', path)
+                response = connection.getresponse()
+                response.read()
+                status = response.status
+            except (OSError, ValueError) as e:
+                connection.close()
+                connection = HTTPConnection(target.hostname, target.port, timeout=60)
+                if sent >= record_from:
+                    local_errors[type(e).__name__] += 1
+                continue
+            if sent >= record_from:
+                elapsed = time.perf_counter() - sent
+                local_latencies.append(elapsed)
+                local_statuses[status] += 1
+                if label:
+                    local_labelled.setdefault(label, []).append(elapsed)
+        connection.close()
+        with lock:
+            latencies.extend(local_latencies)
+            for label, values in local_labelled.items():
+                labelled.setdefault(label, []).extend(values)
+            statuses.update(local_statuses)
+            errors.update(local_errors)
+
+    threads = [threading.Thread(target=client, args=(offset,), daemon=True) for offset in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    result = {
+        'concurrency': concurrency,
+        'duration_seconds': duration,
+        'requests': len(latencies),
+        'requests_per_second': round(len(latencies) / duration, 1),
+        'latency_ms': latency_summary(latencies),
+        'statuses': {str(status): count for status, count in sorted(statuses.items())},
+        'errors': dict(errors)
+    }
+    if labelled:
+        result['by_label'] = {
+            label: {'requests': len(values), 'latency_ms': latency_summary(values)}
+            for label, values in sorted(labelled.items())
+        }
+    return result
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port: int, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.05)
+    raise TimeoutError(f"Server on port {port} did not start")
+
+
+def serve_wsgi(app, threads: bool = True) -> str:
+    """Serve a WSGI app with werkzeug's threaded server in the background; returns its URL"""
+    from werkzeug.serving import make_server
+
+    server = make_server('127.0.0.1', free_port(), app, threaded=threads)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    wait_for_port(server.server_port)
+    return f'http://127.0.0.1:{server.server_port}'
+
+
+def serve_asgi(app) -> str:
+    """Serve an ASGI app with uvicorn in the background; returns its URL (needs uvicorn)"""
+    import uvicorn
+
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host='127.0.0.1', port=port, log_level='warning', lifespan='on'))
+    threading.Thread(target=server.run, daemon=True).start()
+    wait_for_port(port)
+    return f'http://127.0.0.1:{port}'
@@ -0,0 +1,169 @@
+"""
+Load test of the events API at several database sizes
+
+Usage:
+    python benchmarks/loadtest.py --scales 1000 100000 1000000 --output loadtest.json
+    python benchmarks/loadtest.py --scales 1000 --baseline loadtest.json --max-regression 0.2
+
+For each scale a fresh SQLite database is seeded with synthetic events
+(DataManager.seed_sample_data), then a weighted mix of search, category and
+date queries is replayed against /api/events for --duration seconds. The
+JSON report has throughput and latency percentiles overall and per query
+kind. With --baseline the run fails (exit code 1) when p99 latency or
+throughput regressed by more than --max-regression against the baseline.
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tempfile
+import subprocess
+from urllib.parse import urlencode
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from loadgen import run_load, serve_asgi, serve_wsgi
+
+SEARCH_TERMS = ['concert', 'yoga', 'jazz', 'market', 'vondelpark', 'comedy', 'free', 'walk', 'xyz-no-match']
+DATE_FILTERS = ['today', 'tomorrow', 'this-week', 'this-weekend']
+
+# Share of requests per query kind, modelled on the frontend filter bar
+QUERY_MIX = {
+    'list_all': 0.05,
+    'category': 0.25,
+    'date': 0.20,
+    'search': 0.20,
+    'category_date': 0.15,
+    'search_category': 0.05,
+    'event_by_id': 0.10,
+}
+
+
+def query_paths(scale: int, count: int = 500, seed: int = 1) -> list:
+    """(kind, path) pairs drawn from QUERY_MIX, reproducible for a seed"""
+    from src.scrapers.synthetic import CATEGORIES
+
+    rng = random.Random(seed)
+    kinds = list(QUERY_MIX)
+    weights = list(QUERY_MIX.values())
+    paths = []
+    for kind in rng.choices(kinds, weights, k=count):
+        params = {}
+        if kind == 'event_by_id':
+            paths.append((kind, f'/api/events/{rng.randint(1, scale)}'))
+            continue
+        if 'category' in kind:
+            params['category'] = rng.choice(CATEGORIES)
+        if 'date' in kind:
+            params['date'] = rng.choice(DATE_FILTERS)
+        if 'search' in kind:
+            params['search'] = rng.choice(SEARCH_TERMS)
+        paths.append((kind, '/api/events' + ('?' + urlencode(params) if params else '')))
+    return paths
+
+
+def run_scale(scale: int, args) -> dict:
+    """Seed a fresh database in a child process and load test it"""
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--child', str(scale),
+         '--concurrency', str(args.concurrency), '--duration', str(args.duration), '--server', args.server],
+        capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        return {'error': result.stderr.strip().splitlines()[-1] if result.stderr.strip() else 'failed'}
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def child(scale: int, args) -> dict:
+    """Runs in its own process so every scale starts with a fresh app and database"""
+    database = os.path.join(tempfile.mkdtemp(prefix='loadtest-'), 'events.db')
+    os.environ['DATABASE_URL'] = f'sqlite:///{database}'
+    os.environ['SCHEDULER_ENABLED'] = '0'
+
+    from src.main import create_app
+    from src.scrapers.data_manager import DataManager
+
+    app = create_app(start_scheduler=False)
+    start = time.perf_counter()
+    with app.app_context():
+        DataManager(source_config={}).seed_sample_data(count=scale)
+    seed_seconds = time.perf_counter() - start
+
+    if args.server == 'asgi':
+        from src.asgi import create_asgi_app
+        base_url = serve_asgi(create_asgi_app(app))
+    else:
+        base_url = serve_wsgi(app)
+
+    report = run_load(base_url, query_paths(scale), args.concurrency, args.duration)
+    report['seed_seconds'] = round(seed_seconds, 1)
+    report['database_bytes'] = os.path.getsize(database)
+    return report
+
+
+def regressions(report: dict, baseline: dict, max_regression: float) -> list:
+    """Scales whose p99 latency or throughput got worse than allowed"""
+    problems = []
+    for scale, result in report['scales'].items():
+        before = baseline.get('scales', {}).get(scale)
+        if not before or 'error' in before or 'error' in result:
+            continue
+        if result['latency_ms']['p99'] > before['latency_ms']['p99'] * (1 + max_regression):
+            problems.append(f"{scale}: p99 {before['latency_ms']['p99']} -> {result['latency_ms']['p99']} ms")
+        if result['requests_per_second'] < before['requests_per_second'] * (1 - max_regression):
+            problems.append(f"{scale}: {before['requests_per_second']} -> {result['requests_per_second']} req/s")
+    return problems
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        return ''
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scales', type=int, nargs='+', default=[1000, 100000, 1000000])
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=15.0)
+    parser.add_argument('--server', choices=('wsgi', 'asgi'), default='wsgi')
+    parser.add_argument('--output', help='Write the JSON report to this file')
+    parser.add_argument('--baseline', help='Earlier report to compare against')
+    parser.add_argument('--max-regression', type=float, default=0.2)
+    parser.add_argument('--child', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(child(args.child, args)))
+        return
+
+    report = {
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'server': args.server,
+        'query_mix': QUERY_MIX,
+        'scales': {str(scale): run_scale(scale, args) for scale in args.scales}
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as report_file:
+            report_file.write(output)
+    print(output)
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            problems = regressions(report, json.load(baseline_file), args.max_regression)
+        for problem in problems:
+            print(f"Regression: {problem}", file=sys.stderr)
+        if problems:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,349 @@
+import os
+import json
+import time
+import queue
+import logging
+import threading
+from collections import deque
+from typing import Dict, Iterator, List, Optional, Tuple
+from src.instrumentation import metrics
+
+logger = logging.getLogger(__name__)
+
+# Messages a client may fall behind by before it is disconnected (it reconnects with Last-Event-ID)
+SSE_CLIENT_QUEUE_SIZE = int(os.environ.get('SSE_CLIENT_QUEUE_SIZE', 64))
+# Seconds between keepalive comments on idle streams, so proxies keep them open
+SSE_KEEPALIVE_SECONDS = float(os.environ.get('SSE_KEEPALIVE_SECONDS', 15))
+# Seconds between checks for finished runs in processes without the scheduler
+SSE_POLL_SECONDS = float(os.environ.get('SSE_POLL_SECONDS', 5))
+# New and changed events listed per update summary; counts are always complete
+SUMMARY_MAX_EVENTS = int(os.environ.get('SUMMARY_MAX_EVENTS', 100))
+# Summaries kept for clients reconnecting with Last-Event-ID
+SSE_HISTORY_SIZE = 16
+
+sse_connections = metrics.gauge('sse_connections', 'Connected event stream clients', ('transport',))
+sse_messages_total = metrics.counter('sse_messages_total', 'Messages broadcast to event stream clients', ('event',))
+sse_dropped_total = metrics.counter('sse_dropped_total', 'Event stream clients disconnected for falling behind')
+sse_fanout_seconds = metrics.histogram(
+    'sse_fanout_seconds', 'Time to serialize a message and queue it for every client',
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0))
+sse_delivery_seconds = metrics.histogram(
+    'sse_delivery_seconds', 'Time from broadcast until a message is written to a client', ('transport',))
+
+SUMMARY_FIELDS = ('id', 'title', 'date', 'time', 'category', 'location')
+
+
+def format_sse(event: str, data: Dict, message_id: Optional[int] = None) -> bytes:
+    """One Server-Sent Events message; JSON data has no newlines, so it is a single data line"""
+    lines = [f'event: {event}']
+    if message_id is not None:
+        lines.append(f'id: {message_id}')
+    lines.append('data: ' + json.dumps(data, ensure_ascii=False, separators=(',', ':')))
+    return ('\n'.join(lines) + '\n\n').encode('utf-8')
+
+
+class Subscriber:
+    """A connected client: a bounded queue of (published_at, message bytes), None when closed"""
+
+    transport = 'wsgi'
+
+    def __init__(self, maxsize: int = SSE_CLIENT_QUEUE_SIZE):
+        self.queue = queue.Queue(maxsize)
+        self.closed = False
+
+    def offer(self, item: Tuple[float, bytes]) -> bool:
+        try:
+            self.queue.put_nowait(item)
+            return True
+        except queue.Full:
+            return False
+
+    def close(self):
+        self.closed = True
+        # Wake the writer even when the queue is full
+        try:
+            self.queue.get_nowait()
+        except queue.Empty:
+            pass
+        self.queue.put_nowait(None)
+
+
+class AsyncSubscriber(Subscriber):
+    """Subscriber read by a coroutine; its queue must only be touched on its event loop"""
+
+    transport = 'asgi'
+
+    def __init__(self, loop, maxsize: int = SSE_CLIENT_QUEUE_SIZE):
+        import asyncio
+
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize)
+        self.closed = False
+
+    def offer(self, item: Tuple[float, bytes]) -> bool:
+        import asyncio
+
+        try:
+            self.queue.put_nowait(item)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    def close(self):
+        import asyncio
+
+        self.closed = True
+        try:
+            self.queue.get_nowait()
+        except asyncio.QueueEmpty:
+            pass
+        self.queue.put_nowait(None)
+
+
+class Broadcaster:
+    """
+    Fan-out of messages to every connected event stream client
+
+    publish() serializes a message once and hands the same bytes to all
+    subscribers: thread subscribers (WSGI) get them put on their queue
+    directly, async subscribers (ASGI) with one call_soon_threadsafe per
+    event loop. A client whose queue is full is disconnected rather than
+    slowing down the others; it resumes with Last-Event-ID from the
+    recent history.
+    """
+
+    def __init__(self, history_size: int = SSE_HISTORY_SIZE):
+        self._subscribers = set()
+        self._history = deque(maxlen=history_size)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._subscribers)
+
+    def _add(self, subscriber: Subscriber, last_event_id: Optional[str]) -> Subscriber:
+        with self._lock:
+            try:
+                last_id = int(last_event_id) if last_event_id else None
+            except ValueError:
+                last_id = None
+            if last_id is not None:
+                for message_id, item in self._history:
+                    if message_id > last_id:
+                        subscriber.offer(item)
+            self._subscribers.add(subscriber)
+        sse_connections.inc(transport=subscriber.transport)
+        return subscriber
+
+    def subscribe(self, last_event_id: Optional[str] = None) -> Subscriber:
+        """Register a client read from a thread (see Broadcaster.iter_sse)"""
+        return self._add(Subscriber(), last_event_id)
+
+    def subscribe_async(self, last_event_id: Optional[str] = None) -> AsyncSubscriber:
+        """Register a client read from the running event loop"""
+        import asyncio
+
+        return self._add(AsyncSubscriber(asyncio.get_running_loop()), last_event_id)
+
+    def unsubscribe(self, subscriber: Subscriber):
+        with self._lock:
+            if subscriber not in self._subscribers:
+                return
+            self._subscribers.remove(subscriber)
+        sse_connections.dec(transport=subscriber.transport)
+
+    def _drop(self, subscriber: Subscriber):
+        sse_dropped_total.inc()
+        self.unsubscribe(subscriber)
+        subscriber.close()
+
+    def _deliver(self, subscribers: List[AsyncSubscriber], item: Tuple[float, bytes]):
+        """Queue a message for the async subscribers of one loop (runs on that loop)"""
+        for subscriber in subscribers:
+            if not subscriber.closed and not subscriber.offer(item):
+                self._drop(subscriber)
+
+    def publish(self, event: str, data: Dict, message_id: Optional[int] = None) -> int:
+        """
+        Send a message to every connected client
+
+        Returns:
+            Number of clients it was queued for
+        """
+        start = time.perf_counter()
+        item = (time.monotonic(), format_sse(event, data, message_id))
+        with self._lock:
+            if message_id is not None:
+                self._history.append((message_id, item))
+            subscribers = list(self._subscribers)
+
+        by_loop: Dict = {}
+        for subscriber in subscribers:
+            if isinstance(subscriber, AsyncSubscriber):
+                by_loop.setdefault(subscriber.loop, []).append(subscriber)
+            elif not subscriber.offer(item):
+                self._drop(subscriber)
+        for loop, loop_subscribers in by_loop.items():
+            try:
+                loop.call_soon_threadsafe(self._deliver, loop_subscribers, item)
+            except RuntimeError:
+                # The loop is closed; its clients are gone
+                for subscriber in loop_subscribers:
+                    self.unsubscribe(subscriber)
+
+        sse_messages_total.inc(event=event)
+        sse_fanout_seconds.observe(time.perf_counter() - start)
+        return len(subscribers)
+
+    def iter_sse(self, subscriber: Subscriber, keepalive: float = SSE_KEEPALIVE_SECONDS) -> Iterator[bytes]:
+        """
+        Response body of a WSGI event stream
+
+        Yields the queued messages as they arrive and a comment line when the
+        stream was idle for keepalive seconds. The client is unsubscribed when
+        the server closes the generator (client gone) or it was dropped.
+        """
+        try:
+            yield f'retry: {int(SSE_POLL_SECONDS * 1000)}\n\n'.encode('ascii')
+            while True:
+                try:
+                    item = subscriber.queue.get(timeout=keepalive)
+                except queue.Empty:
+                    yield b': keepalive\n\n'
+                    continue
+                if item is None:
+                    return
+                published_at, message = item
+                yield message
+                sse_delivery_seconds.observe(time.monotonic() - published_at, transport=subscriber.transport)
+        finally:
+            self.unsubscribe(subscriber)
+
+
+broadcaster = Broadcaster()
+
+
+class UpdateNotifier:
+    """
+    Publishes a summary of what each scrape run changed
+
+    The summary covers the events whose change_seq moved past the last
+    published position: counts of new, changed and removed events, the
+    first SUMMARY_MAX_EVENTS new and changed ones with their list fields,
+    the removed ids and a change feed token to fetch the rest. It is built
+    with one query per run, however many clients are connected.
+
+    The scheduler publishes right after recording a run. Web processes
+    without a scheduler start a watcher thread with the first client,
+    which publishes runs recorded by other processes.
+    """
+
+    def __init__(self, broadcaster: Broadcaster):
+        self.broadcaster = broadcaster
+        self.last_seq: Optional[int] = None
+        self.last_run_id = 0
+        self.last_finished_at = None
+        self._lock = threading.Lock()
+        self._watcher: Optional[threading.Thread] = None
+
+    def prime(self):
+        """Start summaries from the current change position (requires app context)"""
+        from src.models.change_sequence import ChangeSequence
+        from src.models.scrape_run import ScrapeRun
+        from src.models.event import db
+
+        with self._lock:
+            if self.last_seq is None:
+                self.last_seq = ChangeSequence.current_value()
+                self.last_run_id = db.session.query(db.func.max(ScrapeRun.id)).scalar() or 0
+
+    def summarize(self, run, since_seq: int, until_seq: int) -> Dict:
+        """Summary of the changes in (since_seq, until_seq] for a finished run (requires app context)"""
+        from src.models.event import Event, db
+
+        # The primary, so a replica lagging behind cannot hide the run's changes
+        rows = db.session.query(
+            Event.id, Event.title, Event.date, Event.time, Event.category, Event.location,
+            Event.is_active, Event.created_at, Event.change_seq
+        ).filter(
+            Event.change_seq > since_seq, Event.change_seq <= until_seq
+        ).order_by(Event.change_seq.asc(), Event.id.asc()).all()
+
+        new_since = self.last_finished_at or run.started_at
+        new, changed, removed = [], [], []
+        for row in rows:
+            if not row.is_active:
+                removed.append(row.id)
+            elif row.created_at is not None and row.created_at >= new_since:
+                new.append(row)
+            else:
+                changed.append(row)
+
+        def compact(events):
+            return [{field: getattr(event, field) for field in SUMMARY_FIELDS} for event in events[:SUMMARY_MAX_EVENTS]]
+
+        return {
+            'run_id': run.id,
+            'status': run.status,
+            'finished_at': run.finished_at.isoformat() if run.finished_at else None,
+            'token': f"{rows[-1].change_seq}-{rows[-1].id}" if rows else None,
+            'counts': {'new': len(new), 'changed': len(changed), 'removed': len(removed)},
+            'new': compact(new),
+            'changed': compact(changed),
+            'removed': removed[:SUMMARY_MAX_EVENTS],
+            'truncated': max(len(new), len(changed), len(removed)) > SUMMARY_MAX_EVENTS
+        }
+
+    def publish_run(self, run) -> Optional[Dict]:
+        """Broadcast the summary of a recorded run once (requires app context)"""
+        from src.models.change_sequence import ChangeSequence
+
+        self.prime()
+        with self._lock:
+            if run.id <= self.last_run_id:
+                return None
+            # Read the counter first: later writers only add numbers above it
+            until_seq = ChangeSequence.current_value()
+            summary = self.summarize(run, self.last_seq, until_seq)
+            self.last_seq = until_seq
+            self.last_run_id = max(self.last_run_id, run.id)
+            self.last_finished_at = run.finished_at
+
+        clients = self.broadcaster.publish('update', summary, message_id=run.id)
+        logger.info(f"Published update summary of run {run.id} to {clients} clients: {summary['counts']}")
+        return summary
+
+    def start_watcher(self, app):
+        """Publish runs recorded by other processes while clients are connected"""
+        if self._watcher is not None:
+            return
+        with self._lock:
+            if self._watcher is not None:
+                return
+            self._watcher = threading.Thread(target=self._watch, args=(app,), name='sse-watcher', daemon=True)
+        self._watcher.start()
+
+    def _watch(self, app):
+        from src.models.scrape_run import ScrapeRun
+        from src.models.event import db
+
+        with app.app_context():
+            try:
+                self.prime()
+            except Exception as e:
+                logger.error(f"Error priming update notifier: {str(e)}")
+
+        while True:
+            time.sleep(SSE_POLL_SECONDS)
+            if not len(self.broadcaster):
+                continue
+            with app.app_context():
+                try:
+                    run = ScrapeRun.query.order_by(ScrapeRun.id.desc()).first()
+                    if run is not None and run.id > self.last_run_id:
+                        self.publish_run(run)
+                except Exception as e:
+                    db.session.rollback()
+                    logger.error(f"Error publishing update summary: {str(e)}")
+
+
+update_notifier = UpdateNotifier(broadcaster)
@@ -0,0 +1,67 @@
+import time
+import threading
+from typing import Optional
+
+
+class CancelledError(Exception):
+    """Raised when work checks a token that was cancelled or ran past its deadline"""
+
+
+class CancellationToken:
+    """
+    Cooperative cancellation with an optional deadline
+
+    Work checks the token between units (events, requests) and stops
+    when it is cancelled. Child tokens inherit their parent's cancellation
+    and may add a shorter deadline of their own.
+    """
+
+    def __init__(self, timeout: Optional[float] = None, parent: Optional['CancellationToken'] = None):
+        self.parent = parent
+        self.deadline = time.monotonic() + timeout if timeout else None
+        self.reason: Optional[str] = None
+        self._event = threading.Event()
+
+    def child(self, timeout: Optional[float] = None) -> 'CancellationToken':
+        """Token cancelled with this one, optionally with its own deadline"""
+        return CancellationToken(timeout, parent=self)
+
+    def cancel(self, reason: str = 'cancelled'):
+        if not self._event.is_set():
+            self.reason = reason
+            self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        if self._event.is_set():
+            return True
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            self.cancel('deadline exceeded')
+            return True
+        if self.parent is not None and self.parent.cancelled:
+            self.cancel(self.parent.reason)
+            return True
+        return False
+
+    def check(self):
+        """Raise CancelledError if the token is cancelled"""
+        if self.cancelled:
+            raise CancelledError(self.reason)
+
+    def remaining(self) -> Optional[float]:
+        """Seconds until the nearest deadline, None when there is none"""
+        remaining = None
+        if self.deadline is not None:
+            remaining = max(0.0, self.deadline - time.monotonic())
+        if self.parent is not None:
+            parent_remaining = self.parent.remaining()
+            if parent_remaining is not None:
+                remaining = parent_remaining if remaining is None else min(remaining, parent_remaining)
+        return remaining
+
+    def timeout(self, default: float) -> float:
+        """Request timeout bounded by the remaining time"""
+        remaining = self.remaining()
+        if remaining is None:
+            return default
+        return max(0.1, min(default, remaining))
@@ -0,0 +1,42 @@
+from sqlalchemy import update
+from src.models.event import db
+
+
+class ChangeSequence(db.Model):
+    """
+    Named counters handing out change sequence numbers (Event.change_seq)
+
+    Incrementing a counter locks its row until the transaction ends, so
+    writers that change events commit their sequence numbers in order and
+    a change feed reader never sees a lower number appear after a higher one.
+    """
+
+    __tablename__ = 'change_sequence'
+
+    name = db.Column(db.String(50), primary_key=True)
+    value = db.Column(db.BigInteger, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<ChangeSequence {self.name}={self.value}>'
+
+    @classmethod
+    def next_value(cls, name: str = 'events') -> int:
+        """Increment a counter in the current transaction and return its new value"""
+        value = db.session.execute(
+            update(cls.__table__).where(cls.name == name).values(value=cls.value + 1).returning(cls.value)
+        ).scalar()
+        if value is not None:
+            return value
+
+        # First use: continue after the highest number already handed out
+        from src.models.event import Event
+
+        value = (db.session.query(db.func.max(Event.change_seq)).scalar() or 0) + 1
+        db.session.add(cls(name=name, value=value))
+        db.session.flush()
+        return value
+
+    @classmethod
+    def current_value(cls, name: str = 'events') -> int:
+        """Last number handed out by a counter, without incrementing it"""
+        return db.session.query(cls.value).filter(cls.name == name).scalar() or 0
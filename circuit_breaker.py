@@ -0,0 +1,179 @@
+import time
+import logging
+import threading
+from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from src.instrumentation import metrics
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+breaker_state = metrics.gauge(
+    'scraper_circuit_breaker_state', 'Circuit breaker state per source (0 closed, 1 half-open, 2 open)', ('source',))
+breaker_rejections_total = metrics.counter(
+    'scraper_circuit_breaker_rejections_total', 'Requests rejected by an open circuit breaker', ('source',))
+
+
+class CircuitOpenError(requests.RequestException):
+    """Raised instead of sending a request while a source's circuit is open"""
+
+
+class CircuitBreaker:
+    """
+    Per-source circuit breaker
+
+    Opens after failure_threshold consecutive failures (connection errors,
+    timeouts, 429 and 5xx responses). While open, requests are rejected
+    without touching the network. Once the reset timeout has passed a
+    single probe request is let through (half-open); success closes the
+    circuit, failure reopens it with a doubled timeout up to
+    max_reset_timeout. A Retry-After header overrides the reset timeout.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 3, reset_timeout: float = 300,
+                 max_reset_timeout: float = 3600):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.open_until: Optional[float] = None
+        self.current_timeout = reset_timeout
+        self.last_error: Optional[str] = None
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+        breaker_state.set(STATE_VALUES[CLOSED], source=name)
+
+    def _set_state(self, state: str):
+        if state != self.state:
+            logger.info(f"Circuit for {self.name} changed from {self.state} to {state}")
+        self.state = state
+        breaker_state.set(STATE_VALUES[state], source=self.name)
+
+    def is_open(self) -> bool:
+        """Whether requests would currently be rejected (no probe due yet)"""
+        with self._lock:
+            if self.state == OPEN:
+                return time.monotonic() < self.open_until
+            return self.state == HALF_OPEN and self._probe_in_flight
+
+    def allow_request(self) -> bool:
+        """Whether a request may be sent now; claims the probe when half-open"""
+        with self._lock:
+            if self.state == OPEN and time.monotonic() >= self.open_until:
+                self._set_state(HALF_OPEN)
+                self._probe_in_flight = False
+
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+
+        breaker_rejections_total.inc(source=self.name)
+        return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self._probe_in_flight = False
+            self.current_timeout = self.reset_timeout
+            if self.state != CLOSED:
+                self._set_state(CLOSED)
+
+    def record_failure(self, error: str, retry_after: Optional[float] = None):
+        with self._lock:
+            self.failures += 1
+            self.last_error = error
+
+            if self.state == HALF_OPEN:
+                # Failed probe: back off further
+                self.current_timeout = min(self.current_timeout * 2, self.max_reset_timeout)
+                self._open(retry_after)
+            elif self.state == CLOSED and (self.failures >= self.failure_threshold or retry_after is not None):
+                self._open(retry_after)
+
+    def _open(self, retry_after: Optional[float]):
+        timeout = self.current_timeout
+        if retry_after is not None:
+            timeout = min(max(retry_after, 0), self.max_reset_timeout)
+        self.opened_at = time.monotonic()
+        self.open_until = self.opened_at + timeout
+        self._probe_in_flight = False
+        self._set_state(OPEN)
+        logger.warning(f"Circuit for {self.name} opened for {timeout:.0f}s: {self.last_error}")
+
+    def to_dict(self) -> Dict:
+        """Breaker state for health and status endpoints"""
+        with self._lock:
+            retry_at = None
+            if self.state == OPEN:
+                remaining = max(0.0, self.open_until - time.monotonic())
+                retry_at = (datetime.utcnow() + timedelta(seconds=remaining)).isoformat()
+            return {
+                'state': self.state,
+                'consecutive_failures': self.failures,
+                'retry_at': retry_at,
+                'last_error': self.last_error
+            }
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)"""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        retry_date = parsedate_to_datetime(value)
+        return max(0.0, (retry_date - datetime.now(retry_date.tzinfo)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class CircuitBreakerAdapter(HTTPAdapter):
+    """Transport adapter that routes every request of a session through a breaker"""
+
+    def __init__(self, breaker: CircuitBreaker, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.breaker = breaker
+
+    def send(self, request, *args, **kwargs):
+        if not self.breaker.allow_request():
+            raise CircuitOpenError(f"Circuit for {self.breaker.name} is open, request to {request.url} skipped")
+
+        try:
+            response = super().send(request, *args, **kwargs)
+        except requests.RequestException as e:
+            self.breaker.record_failure(str(e))
+            raise
+
+        if response.status_code == 429 or response.status_code >= 500:
+            self.breaker.record_failure(
+                f"HTTP {response.status_code} from {request.url}",
+                retry_after=parse_retry_after(response.headers.get('Retry-After'))
+            )
+        else:
+            self.breaker.record_success()
+        return response
+
+
+def mount_circuit_breaker(session: requests.Session, breaker: CircuitBreaker) -> requests.Session:
+    """Guard all HTTP(S) requests of a session with a circuit breaker"""
+    adapter = CircuitBreakerAdapter(breaker)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
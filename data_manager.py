@@ -1,55 +1,35 @@
 import logging
-from typing import Dict, List
-from datetime import datetime
+from typing import Dict, List, Optional
 from src.models.event import Event, db
-from src.scrapers.iamsterdam_scraper import IAmsterdamScraper
-from src.scrapers.eventbrite_scraper import EventbriteScraper
+from src.scrapers.sources import EventSource, create_sources
+from src.scrapers.pipeline import ScrapePipeline
+from src.scrapers.image_cache import trim_image_cache
+from src.scrapers.cancellation import CancellationToken
 
 logger = logging.getLogger(__name__)
 
 class DataManager:
     """Manages data scraping and database updates"""
     
-    def __init__(self):
-        self.iamsterdam_scraper = IAmsterdamScraper()
-        self.eventbrite_scraper = EventbriteScraper()
+    def __init__(self, source_config: Optional[Dict[str, Dict]] = None, max_workers: Optional[int] = None):
+        self.sources: List[EventSource] = create_sources(source_config)
+        self.pipeline = ScrapePipeline(self.sources, max_workers=max_workers)
     
-    def update_all_events(self) -> Dict:
-        """Update events from all sources"""
-        logger.info("Starting event update process")
-        
-        results = {
-            'timestamp': datetime.utcnow().isoformat(),
-            'sources': {},
-            'total_events': 0,
-            'errors': []
-        }
+    def update_all_events(self, force: bool = False, cancel_token: Optional[CancellationToken] = None) -> Dict:
+        """
+        Update events from all registered sources
         
-        # Update from I amsterdam
-        try:
-            iamsterdam_result = self.update_iamsterdam_events()
-            results['sources']['iamsterdam'] = iamsterdam_result
-            results['total_events'] += iamsterdam_result.get('events_processed', 0)
-        except Exception as e:
-            error_msg = f"Error updating I amsterdam events: {str(e)}"
-            logger.error(error_msg)
-            results['errors'].append(error_msg)
-            results['sources']['iamsterdam'] = {'error': error_msg}
+        Args:
+            force: Scrape every source even if its own schedule is not due
+            cancel_token: Deadline and cooperative cancellation for the run
+        """
+        logger.info("Starting event update process")
         
-        # Update from Eventbrite
-        try:
-            eventbrite_result = self.update_eventbrite_events()
-            results['sources']['eventbrite'] = eventbrite_result
-            results['total_events'] += eventbrite_result.get('events_processed', 0)
-        except Exception as e:
-            error_msg = f"Error updating Eventbrite events: {str(e)}"
-            logger.error(error_msg)
-            results['errors'].append(error_msg)
-            results['sources']['eventbrite'] = {'error': error_msg}
+        results = self.pipeline.run(force=force, cancel_token=cancel_token)
         
         # Cleanup old events
         try:
-            self.cleanup_old_events()
+            results['events_deleted'] = self.cleanup_old_events()
             results['cleanup'] = 'completed'
         except Exception as e:
             error_msg = f"Error during cleanup: {str(e)}"
@@ -57,121 +37,45 @@ class DataManager:
             results['errors'].append(error_msg)
             results['cleanup'] = error_msg
         
+        # Trim the image cache now that the stored events show which images are in use
+        try:
+            results['images_evicted'] = trim_image_cache()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error trimming image cache: {str(e)}")
+        
         logger.info(f"Event update completed. Total events: {results['total_events']}")
         return results
     
-    def update_iamsterdam_events(self) -> Dict:
-        """Update events from I amsterdam"""
-        logger.info("Scraping events from I amsterdam")
-        
-        try:
-            # Scrape events
-            scraped_events = self.iamsterdam_scraper.scrape_events(max_events=25)
-            
-            # Process and save events
-            processed_events = []
-            current_event_ids = []
-            
-            for event_data in scraped_events:
-                try:
-                    # Validate required fields
-                    if not event_data.get('title') or not event_data.get('date'):
-                        logger.warning(f"Skipping event with missing required fields: {event_data}")
-                        continue
-                    
-                    # Upsert event
-                    event = Event.upsert_event(event_data)
-                    db.session.commit()
-                    
-                    processed_events.append(event.to_dict())
-                    current_event_ids.append(event.id)
-                    
-                except Exception as e:
-                    logger.error(f"Error processing I amsterdam event: {str(e)}")
-                    db.session.rollback()
-                    continue
-            
-            # Deactivate events no longer found
-            Event.deactivate_old_events('I amsterdam', current_event_ids)
-            db.session.commit()
-            
-            result = {
-                'events_scraped': len(scraped_events),
-                'events_processed': len(processed_events),
-                'events_deactivated': Event.query.filter(
-                    Event.source == 'I amsterdam',
-                    Event.is_active == False
-                ).count(),
-                'last_updated': datetime.utcnow().isoformat()
-            }
-            
-            logger.info(f"I amsterdam update completed: {result}")
-            return result
-            
-        except Exception as e:
-            logger.error(f"Error updating I amsterdam events: {str(e)}")
-            raise
+    def get_poll_interval(self, default: float) -> float:
+        """Scheduler tick in minutes, short enough for the most eager source"""
+        intervals = [source.min_interval() for source in self.sources]
+        return min([default] + [interval for interval in intervals if interval])
     
-    def update_eventbrite_events(self) -> Dict:
-        """Update events from Eventbrite"""
-        logger.info("Scraping events from Eventbrite")
-        
-        try:
-            # Scrape events
-            scraped_events = self.eventbrite_scraper.scrape_events(max_events=25)
-            
-            # Process and save events
-            processed_events = []
-            current_event_ids = []
-            
-            for event_data in scraped_events:
-                try:
-                    # Validate required fields
-                    if not event_data.get('title') or not event_data.get('date'):
-                        logger.warning(f"Skipping event with missing required fields: {event_data}")
-                        continue
-                    
-                    # Upsert event
-                    event = Event.upsert_event(event_data)
-                    db.session.commit()
-                    
-                    processed_events.append(event.to_dict())
-                    current_event_ids.append(event.id)
-                    
-                except Exception as e:
-                    logger.error(f"Error processing Eventbrite event: {str(e)}")
-                    db.session.rollback()
-                    continue
-            
-            # Deactivate events no longer found
-            Event.deactivate_old_events('Eventbrite', current_event_ids)
-            db.session.commit()
-            
-            result = {
-                'events_scraped': len(scraped_events),
-                'events_processed': len(processed_events),
-                'events_deactivated': Event.query.filter(
-                    Event.source == 'Eventbrite',
-                    Event.is_active == False
-                ).count(),
-                'last_updated': datetime.utcnow().isoformat()
-            }
-            
-            logger.info(f"Eventbrite update completed: {result}")
-            return result
-            
-        except Exception as e:
-            logger.error(f"Error updating Eventbrite events: {str(e)}")
-            raise
+    def get_source_status(self) -> Dict:
+        """Per-source schedule state"""
+        return {source.key: source.get_status() for source in self.sources}
     
-    def cleanup_old_events(self):
+    def get_breaker_status(self) -> Dict:
+        """Circuit breaker state per source"""
+        return {source.key: source.breaker.to_dict() for source in self.sources if source.breaker}
+    
+    def update_source(self, key: str) -> Dict:
+        """Update events from a single registered source, ignoring its schedule"""
+        results = self.pipeline.run(force=True, only=[key])
+        if key not in results['sources']:
+            raise ValueError(f"Unknown event source: {key}")
+        return results['sources'][key]
+    
+    def cleanup_old_events(self) -> int:
         """Clean up old events"""
         logger.info("Cleaning up old events")
         
         try:
-            # Remove events older than 30 days
-            Event.cleanup_old_events(days_old=30)
-            logger.info("Old events cleanup completed")
+            # Remove events that took place more than 30 days ago, in batches
+            deleted = Event.cleanup_old_events(days_old=30)
+            logger.info(f"Old events cleanup completed: {deleted} events removed")
+            return deleted
             
         except Exception as e:
             logger.error(f"Error during cleanup: {str(e)}")
@@ -180,42 +84,30 @@ class DataManager:
     def get_update_status(self) -> Dict:
         """Get current status of events in database"""
         try:
-            total_events = Event.query.filter(Event.is_active == True).count()
-            iamsterdam_events = Event.query.filter(
-                Event.source == 'I amsterdam',
-                Event.is_active == True
-            ).count()
-            eventbrite_events = Event.query.filter(
-                Event.source == 'Eventbrite',
-                Event.is_active == True
-            ).count()
-            
-            # Get latest update times
-            latest_iamsterdam = Event.query.filter(
-                Event.source == 'I amsterdam',
-                Event.is_active == True
-            ).order_by(Event.updated_at.desc()).first()
-            
-            latest_eventbrite = Event.query.filter(
-                Event.source == 'Eventbrite',
-                Event.is_active == True
-            ).order_by(Event.updated_at.desc()).first()
-            
-            return {
-                'total_active_events': total_events,
-                'iamsterdam_events': iamsterdam_events,
-                'eventbrite_events': eventbrite_events,
-                'last_iamsterdam_update': latest_iamsterdam.updated_at.isoformat() if latest_iamsterdam else None,
-                'last_eventbrite_update': latest_eventbrite.updated_at.isoformat() if latest_eventbrite else None,
-                'categories': Event.get_categories()
-            }
+            return Event.get_update_status()
             
         except Exception as e:
             logger.error(f"Error getting update status: {str(e)}")
             raise
     
-    def seed_sample_data(self):
-        """Seed database with sample data for testing"""
+    def seed_sample_data(self, count: int = 0, batch_size: int = 5000, seed: int = 0) -> int:
+        """
+        Seed database with sample data for testing
+        
+        Args:
+            count: Number of synthetic events to bulk insert instead of the
+                three hand-written samples (see src.scrapers.synthetic)
+            batch_size: Events per insert statement and commit
+            seed: Random seed of the synthetic events
+            
+        Returns:
+            Number of seeded events
+        """
+        if count:
+            from src.scrapers.synthetic import seed_events
+            
+            return seed_events(count, batch_size=batch_size, seed=seed)
+        
         logger.info("Seeding database with sample data")
         
         sample_events = [
@@ -266,9 +158,9 @@ class DataManager:
             
             db.session.commit()
             logger.info(f"Seeded {len(sample_events)} sample events")
+            return len(sample_events)
             
         except Exception as e:
             logger.error(f"Error seeding sample data: {str(e)}")
             db.session.rollback()
             raise
-
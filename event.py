@@ -1,9 +1,13 @@
 from flask_sqlalchemy import SQLAlchemy
+import datetime as dt
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 db = SQLAlchemy()
 
+# Date filter values offered by the frontend
+DATE_BUCKETS = ('today', 'tomorrow', 'this-week', 'this-weekend')
+
 class Event(db.Model):
     """Event model for storing scraped events"""
     
@@ -23,6 +27,15 @@ class Event(db.Model):
     image = db.Column(db.String(500))
     source_url = db.Column(db.String(500))  # Original URL from source
     
+    # Geocoded venue; geo_cell is the grid cell used for radius queries
+    latitude = db.Column(db.Float)
+    longitude = db.Column(db.Float)
+    geo_cell = db.Column(db.Integer)
+    
+    # Change feed position: set from ChangeSequence whenever the event is
+    # created, changed or deactivated (0 for events that predate the feed)
+    change_seq = db.Column(db.BigInteger)
+    
     # Metadata
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -31,14 +44,26 @@ class Event(db.Model):
     # Unique constraint to prevent duplicates
     __table_args__ = (
         db.UniqueConstraint('title', 'date', 'source', name='unique_event'),
+        db.Index('ix_events_date', 'date'),
+        db.Index('ix_events_source_active', 'source', 'is_active'),
+        db.Index('ix_events_geo_cell', 'geo_cell'),
+        db.Index('ix_events_change_seq', 'change_seq', 'id'),
     )
     
+    # Columns populated from scraped data
+    SCRAPED_FIELDS = (
+        'title', 'description', 'date', 'time', 'location', 'address',
+        'category', 'cost', 'organizer', 'source', 'image', 'source_url'
+    )
+    # Columns derived from scraped data by geocoding
+    GEO_FIELDS = ('latitude', 'longitude', 'geo_cell')
+    
     def __repr__(self):
         return f'<Event {self.title} on {self.date}>'
     
     def to_dict(self) -> Dict:
         """Convert event to dictionary for API responses"""
-        return {
+        data = {
             'id': self.id,
             'title': self.title,
             'description': self.description,
@@ -51,36 +76,130 @@ class Event(db.Model):
             'organizer': self.organizer,
             'source': self.source,
             'image': self.image,
-            'source_url': self.source_url
+            'source_url': self.source_url,
+            'latitude': self.latitude,
+            'longitude': self.longitude
         }
+        # Set by get_active_events for radius queries
+        distance_km = getattr(self, 'distance_km', None)
+        if distance_km is not None:
+            data['distance_km'] = round(distance_km, 2)
+        return data
     
     @classmethod
     def create_from_scraped_data(cls, data: Dict) -> 'Event':
         """Create Event instance from scraped data"""
-        return cls(
-            title=data.get('title', ''),
-            description=data.get('description', ''),
-            date=data.get('date', ''),
-            time=data.get('time', ''),
-            location=data.get('location', ''),
-            address=data.get('address', ''),
-            category=data.get('category', ''),
-            cost=data.get('cost', 'Free'),
-            organizer=data.get('organizer', ''),
-            source=data.get('source', ''),
-            image=data.get('image', ''),
-            source_url=data.get('source_url', '')
-        )
+        return cls(**cls._scraped_values(data))
+    
+    @classmethod
+    def _scraped_values(cls, data: Dict) -> Dict:
+        """Column values for scraped data, with defaults for missing fields"""
+        from src.models.geo_index import cell_for
+        
+        values = {field: data.get(field, '') for field in cls.SCRAPED_FIELDS}
+        values['cost'] = data.get('cost', 'Free')
+        values['latitude'] = data.get('latitude')
+        values['longitude'] = data.get('longitude')
+        values['geo_cell'] = cell_for(values['latitude'], values['longitude'])
+        return values
+    
+    @staticmethod
+    def is_image_fallback(stored: Optional[str], scraped: Optional[str]) -> bool:
+        """
+        Whether a scraped remote image URL only stands in for an already cached image
+        
+        A scrape that cannot download an image keeps its remote URL. The
+        stored cached image is kept instead and the event is not reported
+        as changed, so the image does not flip between runs.
+        """
+        from src.scrapers.image_cache import IMAGE_ROUTE
+        
+        return bool(stored and scraped and stored.startswith(IMAGE_ROUTE)
+                    and scraped.startswith(('http://', 'https://')))
     
     @classmethod
     def get_active_events(cls, 
                          search: Optional[str] = None,
                          category: Optional[str] = None,
-                         date_filter: Optional[str] = None) -> List['Event']:
-        """Get active events with optional filtering"""
-        query = cls.query.filter(cls.is_active == True)
+                         date_filter: Optional[str] = None,
+                         near: Optional[Tuple[float, float]] = None,
+                         radius_km: float = 2.0) -> List['Event']:
+        """
+        Get active events with optional filtering
+        
+        With near=(lat, lon) only geocoded events within radius_km are
+        returned, each with a distance_km attribute. Candidates come from
+        the indexed geo_cell ranges covering the radius and are then
+        filtered by exact distance.
+        """
+        from src.models.storage import read_session
+        from src.models.geo_index import cell_ranges, haversine_km
+        
+        query = cls._apply_search(read_session().query(cls).filter(cls.is_active == True), search)
+        
+        # Apply category filter
+        if category and category != 'All':
+            query = query.filter(cls.category == category)
+        
+        # Apply date filter
+        date_range = cls.date_bucket_range(date_filter) if date_filter else None
+        if date_range:
+            query = query.filter(cls.date >= date_range[0], cls.date <= date_range[1])
+        
+        # Apply radius filter
+        if near:
+            query = query.filter(db.or_(*[
+                cls.geo_cell.between(first, last) for first, last in cell_ranges(near[0], near[1], radius_km)
+            ]))
+        
+        # Order by date, then by time (id keeps ties stable)
+        events = query.order_by(cls.date.asc(), cls.time.asc(), cls.id.asc()).all()
+        
+        if near:
+            nearby = []
+            for event in events:
+                event.distance_km = haversine_km(near[0], near[1], event.latitude, event.longitude)
+                if event.distance_km <= radius_km:
+                    nearby.append(event)
+            events = nearby
+        return events
+    
+    @classmethod
+    def get_active_event(cls, event_id: int) -> Optional['Event']:
+        """Get an active event by id"""
+        from src.models.storage import read_session
         
-        # Apply search filter
+        return read_session().query(cls).filter(cls.id == event_id, cls.is_active == True).first()
+    
+    @classmethod
+    def get_changes(cls, since: Optional[Tuple[int, int]] = None, limit: int = 500) -> List['Event']:
+        """
+        Events created, changed or deactivated after a change feed position
+        
+        Args:
+            since: (change_seq, id) of the last change the client has seen;
+                None starts a full sync with the active events
+            limit: Maximum number of events
+            
+        Returns:
+            Events (active and inactive) ordered by change_seq, then id
+        """
+        from src.models.storage import read_session
+        
+        query = read_session().query(cls)
+        if since is None:
+            query = query.filter(cls.is_active == True)
+        else:
+            change_seq, event_id = since
+            query = query.filter(db.or_(
+                cls.change_seq > change_seq,
+                db.and_(cls.change_seq == change_seq, cls.id > event_id)
+            ))
+        return query.order_by(cls.change_seq.asc(), cls.id.asc()).limit(limit).all()
+    
+    @classmethod
+    def _apply_search(cls, query, search: Optional[str]):
+        """Filter a query to events whose title, description or location contain search"""
         if search:
             search_term = f"%{search.lower()}%"
             query = query.filter(
@@ -90,49 +209,95 @@ class Event(db.Model):
                     cls.location.ilike(search_term)
                 )
             )
+        return query
+    
+    @staticmethod
+    def date_bucket_range(date_filter: str, today: Optional[dt.date] = None) -> Optional[Tuple[str, str]]:
+        """First and last date (YYYY-MM-DD) of a date filter bucket; None for unknown buckets"""
+        today = today or datetime.now().date()
         
-        # Apply category filter
-        if category and category != 'All':
-            query = query.filter(cls.category == category)
+        if date_filter == 'today':
+            return today.strftime('%Y-%m-%d'), today.strftime('%Y-%m-%d')
+        if date_filter == 'tomorrow':
+            tomorrow = today + timedelta(days=1)
+            return tomorrow.strftime('%Y-%m-%d'), tomorrow.strftime('%Y-%m-%d')
+        if date_filter == 'this-week':
+            week_from_now = today + timedelta(days=7)
+            return today.strftime('%Y-%m-%d'), week_from_now.strftime('%Y-%m-%d')
+        if date_filter == 'this-weekend':
+            # Find next Saturday and Sunday
+            days_until_saturday = (5 - today.weekday()) % 7
+            if days_until_saturday == 0 and today.weekday() == 5:  # Today is Saturday
+                saturday = today
+            else:
+                saturday = today + timedelta(days=days_until_saturday)
+            sunday = saturday + timedelta(days=1)
+            return saturday.strftime('%Y-%m-%d'), sunday.strftime('%Y-%m-%d')
+        return None
+    
+    @classmethod
+    def get_facets(cls,
+                   search: Optional[str] = None,
+                   category: Optional[str] = None,
+                   date_filter: Optional[str] = None) -> Dict:
+        """
+        Count active events per category, date bucket and source for a search
         
-        # Apply date filter
-        if date_filter:
-            today = datetime.now().date()
+        One grouped query over (category, date, source); the buckets are
+        folded in Python. Category counts respect the selected date bucket,
+        date bucket counts respect the selected category, and source counts
+        respect both, so each count is what selecting that chip would return.
+        
+        Returns:
+            Dictionary with total, categories (including 'All'), dates
+            (including 'all') and sources, each mapping a value to its count
+        """
+        from src.models.storage import read_session
+        
+        query = cls._apply_search(
+            read_session().query(cls.category, cls.date, cls.source, db.func.count(cls.id)).filter(cls.is_active == True),
+            search
+        )
+        rows = query.group_by(cls.category, cls.date, cls.source).all()
+        
+        category = category if category and category != 'All' else None
+        buckets = {bucket: cls.date_bucket_range(bucket) for bucket in DATE_BUCKETS}
+        selected_range = buckets.get(date_filter) if date_filter else None
+        
+        categories = {'All': 0}
+        dates = dict.fromkeys(('all',) + DATE_BUCKETS, 0)
+        sources = {}
+        total = 0
+        for event_category, event_date, source, count in rows:
+            in_date = selected_range is None or (event_date and selected_range[0] <= event_date <= selected_range[1])
+            in_category = category is None or event_category == category
             
-            if date_filter == 'today':
-                query = query.filter(cls.date == today.strftime('%Y-%m-%d'))
-            elif date_filter == 'tomorrow':
-                tomorrow = today + timedelta(days=1)
-                query = query.filter(cls.date == tomorrow.strftime('%Y-%m-%d'))
-            elif date_filter == 'this-week':
-                week_from_now = today + timedelta(days=7)
-                query = query.filter(
-                    cls.date >= today.strftime('%Y-%m-%d'),
-                    cls.date <= week_from_now.strftime('%Y-%m-%d')
-                )
-            elif date_filter == 'this-weekend':
-                # Find next Saturday and Sunday
-                days_until_saturday = (5 - today.weekday()) % 7
-                if days_until_saturday == 0 and today.weekday() == 5:  # Today is Saturday
-                    saturday = today
-                else:
-                    saturday = today + timedelta(days=days_until_saturday)
-                sunday = saturday + timedelta(days=1)
-                
-                query = query.filter(
-                    db.or_(
-                        cls.date == saturday.strftime('%Y-%m-%d'),
-                        cls.date == sunday.strftime('%Y-%m-%d')
-                    )
-                )
+            if in_date:
+                categories['All'] += count
+                if event_category:
+                    categories[event_category] = categories.get(event_category, 0) + count
+            if in_category:
+                dates['all'] += count
+                for bucket, (first, last) in buckets.items():
+                    if event_date and first <= event_date <= last:
+                        dates[bucket] += count
+            if in_date and in_category:
+                sources[source] = sources.get(source, 0) + count
+                total += count
         
-        # Order by date, then by time
-        return query.order_by(cls.date.asc(), cls.time.asc()).all()
+        return {
+            'total': total,
+            'categories': dict(sorted(categories.items(), key=lambda item: (item[0] != 'All', item[0]))),
+            'dates': dates,
+            'sources': dict(sorted(sources.items()))
+        }
     
     @classmethod
     def get_categories(cls) -> List[str]:
         """Get all unique categories"""
-        categories = db.session.query(cls.category).filter(
+        from src.models.storage import read_session
+        
+        categories = read_session().query(cls.category).filter(
             cls.is_active == True,
             cls.category.isnot(None)
         ).distinct().all()
@@ -142,28 +307,119 @@ class Event(db.Model):
         category_list.insert(0, 'All')
         return category_list
     
+    @classmethod
+    def get_source_stats(cls) -> Dict:
+        """
+        Get active event counts and latest update per source and category
+        
+        Computed with a single grouped aggregate query.
+        
+        Returns:
+            Dictionary with total, per-source stats and sorted categories
+        """
+        from src.models.storage import read_session
+        
+        rows = read_session().query(
+            cls.source,
+            cls.category,
+            db.func.count(cls.id),
+            db.func.max(cls.updated_at)
+        ).filter(cls.is_active == True).group_by(cls.source, cls.category).all()
+        
+        sources = {}
+        categories = set()
+        total = 0
+        for source, category, count, last_updated in rows:
+            stats = sources.setdefault(source, {'events': 0, 'last_updated': None})
+            stats['events'] += count
+            if last_updated and (stats['last_updated'] is None or last_updated > stats['last_updated']):
+                stats['last_updated'] = last_updated
+            if category:
+                categories.add(category)
+            total += count
+        
+        return {
+            'total': total,
+            'sources': sources,
+            'categories': ['All'] + sorted(categories)
+        }
+    
+    @classmethod
+    def get_update_status(cls) -> Dict:
+        """Active event counts and last update per source, for status endpoints"""
+        stats = cls.get_source_stats()
+        sources = stats['sources']
+        iamsterdam = sources.get('I amsterdam', {})
+        eventbrite = sources.get('Eventbrite', {})
+        
+        return {
+            'total_active_events': stats['total'],
+            'iamsterdam_events': iamsterdam.get('events', 0),
+            'eventbrite_events': eventbrite.get('events', 0),
+            'last_iamsterdam_update': iamsterdam['last_updated'].isoformat() if iamsterdam.get('last_updated') else None,
+            'last_eventbrite_update': eventbrite['last_updated'].isoformat() if eventbrite.get('last_updated') else None,
+            'sources': {
+                source: {
+                    'events': source_stats['events'],
+                    'last_updated': source_stats['last_updated'].isoformat() if source_stats['last_updated'] else None
+                }
+                for source, source_stats in sources.items()
+            },
+            'categories': stats['categories']
+        }
+    
+    @classmethod
+    def _merge_stored(cls, values: Dict, row) -> Dict:
+        """
+        Scraped values as an upsert stores them over an existing row
+        
+        Keeps a cached image the scrape only had the remote URL for (see
+        is_image_fallback) and stored coordinates when geocoding failed or
+        was skipped, as the COALESCE in upsert_events does.
+        """
+        if cls.is_image_fallback(row.image, values['image']):
+            values['image'] = row.image
+        for field in cls.GEO_FIELDS:
+            if values[field] is None:
+                values[field] = getattr(row, field)
+        return values
+    
     @classmethod
     def upsert_event(cls, data: Dict) -> 'Event':
-        """Insert or update an event based on unique constraint"""
+        """
+        Insert or update an event based on unique constraint
+        
+        Like upsert_events, an existing event only gets a new change
+        sequence number when its scraped values changed or it was inactive.
+        """
+        from src.models.change_sequence import ChangeSequence
+        
         try:
+            values = cls._scraped_values(data)
             # Try to find existing event
             existing = cls.query.filter(
-                cls.title == data.get('title'),
-                cls.date == data.get('date'),
-                cls.source == data.get('source')
+                cls.title == values['title'],
+                cls.date == values['date'],
+                cls.source == values['source']
             ).first()
             
             if existing:
                 # Update existing event
-                for key, value in data.items():
-                    if hasattr(existing, key):
-                        setattr(existing, key, value)
+                values = cls._merge_stored(values, existing)
+                changed = not existing.is_active or any(
+                    getattr(existing, field) != value for field, value in values.items()
+                )
+                for field, value in values.items():
+                    setattr(existing, field, value)
                 existing.updated_at = datetime.utcnow()
                 existing.is_active = True
+                if changed:
+                    existing.change_seq = ChangeSequence.next_value()
                 return existing
             else:
                 # Create new event
-                new_event = cls.create_from_scraped_data(data)
+                new_event = cls(**values)
+                new_event.change_seq = ChangeSequence.next_value()
                 db.session.add(new_event)
                 return new_event
                 
@@ -172,18 +428,166 @@ class Event(db.Model):
             raise e
     
     @classmethod
-    def deactivate_old_events(cls, source: str, current_event_ids: List[int]):
+    def count_changes(cls, source: str, events_data: List[Dict]) -> Dict[str, int]:
+        """
+        Classify a batch of scraped events from one source against the database
+        
+        Existing rows are looked up on their (title, date) key within the
+        source, so the query only returns the batch's own events.
+        
+        Returns:
+            Counts of 'new', 'changed' and 'unchanged' events
+        """
+        scraped = [cls._scraped_values(data) for data in events_data]
+        keys = {(values['title'], values['date']) for values in scraped}
+        fields = cls.SCRAPED_FIELDS + cls.GEO_FIELDS
+        columns = [getattr(cls, field) for field in fields]
+        existing = {
+            (row.title, row.date): row
+            for row in db.session.query(*columns, cls.is_active).filter(
+                cls.source == source,
+                db.tuple_(cls.title, cls.date).in_(keys)
+            )
+        } if keys else {}
+        
+        counts = {'new': 0, 'changed': 0, 'unchanged': 0}
+        for values in scraped:
+            row = existing.get((values['title'], values['date']))
+            if row is None:
+                counts['new'] += 1
+                continue
+            values = cls._merge_stored(values, row)
+            if not row.is_active or any(getattr(row, field) != values[field] for field in fields):
+                counts['changed'] += 1
+            else:
+                counts['unchanged'] += 1
+        return counts
+    
+    @classmethod
+    def upsert_events(cls, events_data: List[Dict], batch_size: int = 200) -> List[int]:
+        """
+        Insert or update a batch of events with a native ON CONFLICT upsert
+        
+        New events, and existing ones whose scraped values changed or that
+        were inactive, get the next change sequence number; rows that are
+        only seen again keep theirs, so the change feed stays small.
+        
+        Args:
+            events_data: Scraped event dictionaries
+            batch_size: Rows per INSERT statement
+            
+        Returns:
+            Ids of the inserted or updated events
+        """
+        from src.models.storage import dialect_name
+        from src.models.change_sequence import ChangeSequence
+        from src.scrapers.image_cache import IMAGE_ROUTE
+        
+        dialect = dialect_name()
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        elif dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            # No native upsert available, fall back to one lookup per event
+            events = [cls.upsert_event(data) for data in events_data]
+            db.session.flush()
+            return [event.id for event in events]
+        
+        # Deduplicate on the unique key, a statement may not touch a row twice
+        rows = {}
+        now = datetime.utcnow()
+        change_seq = ChangeSequence.next_value()
+        for data in events_data:
+            row = cls._scraped_values(data)
+            row.update(created_at=now, updated_at=now, is_active=True, change_seq=change_seq)
+            rows[(row['title'], row['date'], row['source'])] = row
+        rows = list(rows.values())
+        
+        updated_fields = [
+            column for column in cls.SCRAPED_FIELDS + cls.GEO_FIELDS
+            if column not in ('title', 'date', 'source')
+        ]
+        event_ids = []
+        for start in range(0, len(rows), batch_size):
+            stmt = insert(cls).values(rows[start:start + batch_size])
+            update_columns = {column: stmt.excluded[column] for column in updated_fields}
+            # Keep a cached image when the scrape fell back to its remote URL (see is_image_fallback)
+            image_fallback = db.and_(
+                cls.image.startswith(IMAGE_ROUTE),
+                db.or_(stmt.excluded.image.startswith('http://'), stmt.excluded.image.startswith('https://'))
+            )
+            update_columns['image'] = db.case((image_fallback, cls.image), else_=stmt.excluded.image)
+            # Keep the stored coordinates when geocoding failed or was skipped this run
+            for column in cls.GEO_FIELDS:
+                update_columns[column] = db.func.coalesce(stmt.excluded[column], getattr(cls, column))
+            changed = db.or_(
+                cls.is_active == False,
+                *[getattr(cls, column).is_distinct_from(update_columns[column]) for column in updated_fields]
+            )
+            update_columns.update(
+                updated_at=now,
+                is_active=True,
+                change_seq=db.case((changed, stmt.excluded.change_seq), else_=cls.change_seq)
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['title', 'date', 'source'],
+                set_=update_columns
+            ).returning(cls.id)
+            event_ids.extend(row[0] for row in db.session.execute(stmt))
+        
+        return event_ids
+    
+    @classmethod
+    def bulk_insert(cls, events_data: List[Dict]) -> int:
+        """
+        Insert a batch of new events in one executemany, for bulk loads
+        
+        Unlike upsert_events this neither updates existing rows nor returns
+        ids. Events whose unique key already exists are skipped where the
+        database has ON CONFLICT DO NOTHING (and raise elsewhere).
+        
+        Returns:
+            Number of inserted events
+        """
+        from src.models.storage import dialect_name
+        from src.models.change_sequence import ChangeSequence
+        
+        dialect = dialect_name()
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+            stmt = insert(cls.__table__).on_conflict_do_nothing(index_elements=['title', 'date', 'source'])
+        elif dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+            stmt = insert(cls.__table__).on_conflict_do_nothing(index_elements=['title', 'date', 'source'])
+        else:
+            stmt = cls.__table__.insert()
+        
+        if not events_data:
+            return 0
+        now = datetime.utcnow()
+        change_seq = ChangeSequence.next_value()
+        rows = []
+        for data in events_data:
+            row = cls._scraped_values(data)
+            row.update(created_at=now, updated_at=now, is_active=True, change_seq=change_seq)
+            rows.append(row)
+        
+        result = db.session.execute(stmt, rows)
+        # Some drivers do not report a row count for executemany
+        return result.rowcount if result.rowcount >= 0 else len(rows)
+    
+    @classmethod
+    def deactivate_old_events(cls, source: str, current_event_ids: List[int]) -> int:
         """Deactivate events from a source that are no longer found"""
-        cls.query.filter(
-            cls.source == source,
-            cls.is_active == True,
-            ~cls.id.in_(current_event_ids)
-        ).update({'is_active': False}, synchronize_session=False)
+        from src.models.retention import deactivate_missing_events
+        
+        return deactivate_missing_events(source, current_event_ids)
     
     @classmethod
-    def cleanup_old_events(cls, days_old: int = 30):
-        """Remove events older than specified days"""
-        cutoff_date = datetime.utcnow() - timedelta(days=days_old)
-        cls.query.filter(cls.created_at < cutoff_date).delete()
-        db.session.commit()
+    def cleanup_old_events(cls, days_old: int = 30, archive_dir: Optional[str] = None) -> int:
+        """Remove events whose event date is more than days_old days in the past"""
+        from src.models.retention import ARCHIVE_DIR, delete_past_events
+        
+        return delete_past_events(days_old=days_old, archive_dir=archive_dir or ARCHIVE_DIR)
 
@@ -0,0 +1,302 @@
+import os
+import re
+import time
+import logging
+import threading
+from bisect import bisect_left, bisect_right
+from typing import Callable, Dict, List, Optional, Tuple
+from src.instrumentation import metrics
+from src.models.event import Event, db
+from src.models.geo_index import cell_ranges, haversine_km
+
+logger = logging.getLogger(__name__)
+
+# Serve /api/events from memory; 0 always queries the database
+EVENT_INDEX_ENABLED = os.environ.get('EVENT_INDEX_ENABLED', '1').lower() not in ('0', 'false', 'no')
+# Seconds before a process checks whether the database changed since its index was built
+EVENT_INDEX_MAX_AGE = float(os.environ.get('EVENT_INDEX_MAX_AGE', 30))
+# Above this many active events the index is not built and queries go to the database;
+# each search trigram holds a bitmap over all events, so memory grows with events x trigrams
+EVENT_INDEX_MAX_EVENTS = int(os.environ.get('EVENT_INDEX_MAX_EVENTS', 20000))
+
+event_index_generation = metrics.gauge('event_index_generation', 'Generation of the in-memory event index')
+event_index_events = metrics.gauge('event_index_events', 'Active events held by the in-memory event index')
+event_index_queries_total = metrics.counter(
+    'event_index_queries_total', 'Event list queries by where they were answered (index, database)', ('served_by',))
+
+_ASCII_LOWER = str.maketrans('ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')
+
+
+def _ascii_lower(text: str) -> str:
+    """SQLite's lower(), which only folds ASCII letters"""
+    return text.translate(_ASCII_LOWER)
+
+
+def _bitmap(positions: List[int], size: int) -> int:
+    """Integer with the bits at positions set"""
+    bits = bytearray((size + 7) // 8)
+    for position in positions:
+        bits[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(bits, 'little')
+
+
+def _positions(bitmap: int) -> List[int]:
+    """Positions of the set bits of a bitmap, ascending"""
+    return [position for position, bit in enumerate(reversed(bin(bitmap)[2:])) if bit == '1']
+
+
+def _trigrams(text: str) -> set:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def like_matcher(term: str, escape: Optional[str] = None) -> Callable[[str], bool]:
+    """
+    Predicate for `value LIKE '%term%'` on already case-folded values
+
+    % and _ in the term are wildcards as in SQL; escape is the dialect's
+    default escape character (backslash on PostgreSQL, none on SQLite).
+    """
+    if '%' not in term and '_' not in term and not (escape and escape in term):
+        return lambda value: term in value
+
+    pattern = []
+    characters = iter(term)
+    for character in characters:
+        if escape and character == escape:
+            pattern.append(re.escape(next(characters, escape)))
+        elif character == '%':
+            pattern.append('.*')
+        elif character == '_':
+            pattern.append('.')
+        else:
+            pattern.append(re.escape(character))
+    regex = re.compile(''.join(pattern), re.DOTALL)
+    return lambda value: regex.search(value) is not None
+
+
+class EventIndex:
+    """
+    Immutable read-side copy of the active events for answering list queries
+
+    Events are kept in the order Event.get_active_events returns them
+    (date, time, id) as columns: serialized to_dict() output, case-folded
+    search fields, coordinates and geo cells. Filters are bitmaps over
+    those positions (Python integers): one per category and per date, with
+    the dates sorted so a date bucket is a bisect range, and one per
+    trigram of the search fields. A search ANDs the bitmaps of its
+    trigrams and confirms each candidate with the same LIKE semantics as
+    the SQL path, so results match get_active_events exactly.
+    """
+
+    def __init__(self, events: List[Event], generation: int, dialect: str = 'sqlite',
+                 fingerprint: Optional[Tuple] = None):
+        self.generation = generation
+        self.fingerprint = fingerprint
+        self.checked_at = time.monotonic()
+        self.escape = '\\' if dialect == 'postgresql' else None
+        fold = str.lower if dialect == 'postgresql' else _ascii_lower
+        # NULLs sort first on SQLite and last on PostgreSQL
+        null_key = dialect != 'postgresql'
+
+        self.events = sorted(events, key=lambda event: (
+            (event.date is None) != null_key, event.date or '',
+            (event.time is None) != null_key, event.time or '',
+            event.id
+        ))
+        self.size = len(self.events)
+        self.all = (1 << self.size) - 1
+        self.data = [event.to_dict() for event in self.events]
+        for data in self.data:
+            data.pop('distance_km', None)
+        self.search_fields = [
+            tuple(fold(value) if value is not None else None for value in (event.title, event.description, event.location))
+            for event in self.events
+        ]
+        self.coordinates = [(event.latitude, event.longitude) for event in self.events]
+        self.geo_cells = [event.geo_cell for event in self.events]
+
+        categories: Dict[str, List[int]] = {}
+        dates: Dict[str, List[int]] = {}
+        trigrams: Dict[str, List[int]] = {}
+        for position, event in enumerate(self.events):
+            categories.setdefault(event.category, []).append(position)
+            if event.date is not None:
+                dates.setdefault(event.date, []).append(position)
+            for trigram in set().union(*(_trigrams(value) for value in self.search_fields[position] if value)):
+                trigrams.setdefault(trigram, []).append(position)
+
+        self.category_bitmaps = {category: _bitmap(positions, self.size) for category, positions in categories.items()}
+        self.dates = sorted(dates)
+        self.date_bitmaps = [_bitmap(dates[value], self.size) for value in self.dates]
+        self.trigram_bitmaps = {trigram: _bitmap(positions, self.size) for trigram, positions in trigrams.items()}
+
+    def __len__(self):
+        return self.size
+
+    def _date_range(self, first: str, last: str) -> int:
+        bitmap = 0
+        for position in range(bisect_left(self.dates, first), bisect_right(self.dates, last)):
+            bitmap |= self.date_bitmaps[position]
+        return bitmap
+
+    def _search(self, search: str, candidates: int) -> List[int]:
+        term = search.lower()
+        if '%' not in term and '_' not in term and not (self.escape and self.escape in term):
+            for trigram in _trigrams(term):
+                candidates &= self.trigram_bitmaps.get(trigram, 0)
+                if not candidates:
+                    return []
+        matches = like_matcher(term, self.escape)
+        return [
+            position for position in _positions(candidates)
+            if any(value is not None and matches(value) for value in self.search_fields[position])
+        ]
+
+    def get_active_events(self,
+                          search: Optional[str] = None,
+                          category: Optional[str] = None,
+                          date_filter: Optional[str] = None,
+                          near: Optional[Tuple[float, float]] = None,
+                          radius_km: float = 2.0) -> List[Dict]:
+        """Same filters and order as Event.get_active_events, as to_dict() dictionaries"""
+        candidates = self.all
+
+        if category and category != 'All':
+            candidates &= self.category_bitmaps.get(category, 0)
+
+        date_range = Event.date_bucket_range(date_filter) if date_filter else None
+        if date_range:
+            candidates &= self._date_range(*date_range)
+
+        positions = self._search(search, candidates) if search else _positions(candidates)
+
+        if not near:
+            return [self.data[position] for position in positions]
+
+        ranges = cell_ranges(near[0], near[1], radius_km)
+        events = []
+        for position in positions:
+            cell = self.geo_cells[position]
+            if cell is None or not any(first <= cell <= last for first, last in ranges):
+                continue
+            latitude, longitude = self.coordinates[position]
+            distance_km = haversine_km(near[0], near[1], latitude, longitude)
+            if distance_km <= radius_km:
+                events.append(dict(self.data[position], distance_km=round(distance_km, 2)))
+        return events
+
+
+_index: Optional[EventIndex] = None
+_generation = 0
+# When the last build was attempted, so a too large database is not rechecked on every request
+_attempted_at = float('-inf')
+_lock = threading.Lock()
+
+
+def _fingerprint() -> Tuple:
+    """Active count, latest update and highest id; changes whenever the active events do"""
+    from src.models.storage import read_session
+
+    return tuple(read_session().query(
+        db.func.count(db.case((Event.is_active == True, 1))),
+        db.func.max(Event.updated_at),
+        db.func.max(Event.id)
+    ).one())
+
+
+def _rebuild() -> Optional[EventIndex]:
+    global _index, _generation, _attempted_at
+    from src.models.storage import dialect_name, read_session
+
+    start = time.perf_counter()
+    _attempted_at = time.monotonic()
+    fingerprint = _fingerprint()
+    if fingerprint[0] > EVENT_INDEX_MAX_EVENTS:
+        logger.info(f"{fingerprint[0]} active events exceed EVENT_INDEX_MAX_EVENTS, serving events from the database")
+        _index = None
+        return None
+
+    session = read_session()
+    events = session.query(Event).filter(Event.is_active == True).all()
+    _generation += 1
+    index = EventIndex(events, _generation, dialect_name(session), fingerprint)
+    _index = index
+
+    event_index_generation.set(index.generation)
+    event_index_events.set(len(index))
+    logger.info(f"Built event index generation {index.generation} with {len(index)} events "
+                f"in {time.perf_counter() - start:.3f}s")
+    return index
+
+
+def rebuild_event_index() -> Optional[EventIndex]:
+    """
+    Build a new index from the database and swap it in (requires app context)
+
+    Readers keep using the previous index until the swap, which replaces a
+    single reference. Returns None (and drops the index) when there are more
+    than EVENT_INDEX_MAX_EVENTS active events or the index is disabled.
+    """
+    if not EVENT_INDEX_ENABLED:
+        return None
+    with _lock:
+        return _rebuild()
+
+
+def get_event_index(max_age: float = EVENT_INDEX_MAX_AGE) -> Optional[EventIndex]:
+    """
+    Current index, rebuilt when the database changed (requires app context)
+
+    The scheduler rebuilds it after every update; other processes (and
+    changes made elsewhere) are picked up once the index is older than
+    max_age seconds and the database fingerprint differs. Only one request
+    checks and rebuilds at a time; the others keep answering from the
+    current index meanwhile (or from the database before the first build).
+    """
+    if not EVENT_INDEX_ENABLED:
+        return None
+
+    index = _index
+    if index is not None and time.monotonic() - index.checked_at <= max_age:
+        return index
+    if index is None and time.monotonic() - _attempted_at <= max_age:
+        return None
+
+    if not _lock.acquire(blocking=False):
+        return index
+    try:
+        # Another thread rebuilt or checked it since this one looked
+        if _index is not index:
+            return _index
+        if index is None and time.monotonic() - _attempted_at <= max_age:
+            return None
+        if index is not None and time.monotonic() - index.checked_at <= max_age:
+            return index
+        if index is not None and _fingerprint() == index.fingerprint:
+            index.checked_at = time.monotonic()
+            return index
+        return _rebuild()
+    finally:
+        _lock.release()
+
+
+def query_active_events(**filters) -> Tuple[List[Dict], Optional[int]]:
+    """
+    Serialized active events for get_active_events filters
+
+    Returns:
+        Event dictionaries and the index generation that answered, or
+        None for the generation when they came from the database
+    """
+    try:
+        index = get_event_index()
+    except Exception as e:
+        logger.error(f"Error building event index, querying the database: {str(e)}")
+        index = None
+
+    if index is not None:
+        event_index_queries_total.inc(served_by='index')
+        return index.get_active_events(**filters), index.generation
+
+    event_index_queries_total.inc(served_by='database')
+    return [event.to_dict() for event in Event.get_active_events(**filters)], None
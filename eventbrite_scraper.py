@@ -3,21 +3,51 @@ from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
 import re
 import logging
-from typing import List, Dict, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
 import json
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from src.instrumentation import instrument_session, stage_timer
+from src.scrapers.circuit_breaker import CircuitOpenError
+from src.scrapers.extraction_rules import rules_for
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
 logger = logging.getLogger(__name__)
 
+# Structured data embedded in listing pages, matched on the raw bytes
+JSON_LD_RE = re.compile(rb'<script[^>]*type=["\']application/ld\+json["\'][^>]*>(.*?)</script>', re.S | re.I)
+SERVER_DATA_RE = re.compile(
+    rb'(?:__SERVER_DATA__\s*=|<script[^>]*id=["\']__NEXT_DATA__["\'][^>]*>)\s*(.*?)</script>', re.S | re.I)
+# Selectors and date patterns, compiled once (see src/scrapers/extraction_rules.py)
+RULES = rules_for('Eventbrite')
+
 class EventbriteScraper:
     """Scraper for Eventbrite free events in Amsterdam"""
     
-    def __init__(self):
+    def __init__(self, structured_first: bool = True):
+        """
+        Args:
+            structured_first: Take events from JSON-LD and embedded page data
+                first, scrape the DOM only for events missing there, and skip
+                detail fetches for events that are already complete
+        """
+        self.structured_first = structured_first
         self.base_url = "https://www.eventbrite.com"
         self.search_url = "https://www.eventbrite.com/d/netherlands--amsterdam/free--events/"
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
+        instrument_session(self.session, 'Eventbrite')
+        # Optional CancellationToken bounding request timeouts
+        self.cancel_token = None
+        # Parses fetched event pages; parse_event_details unless set (e.g. to a parse pool call)
+        self.detail_parser: Optional[Callable[[bytes], Dict]] = None
     
     def scrape_events(self, max_events: int = 50) -> List[Dict]:
         """
@@ -32,55 +62,184 @@ class EventbriteScraper:
         events = []
         
         try:
-            # Get the search results page
-            response = self.session.get(self.search_url, timeout=30)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Look for event cards - Eventbrite typically uses specific class names
-            event_containers = soup.find_all(['div', 'article'], class_=re.compile(r'event-card|search-event-card|event-item', re.I))
-            
-            # Also try generic containers that might contain events
-            if not event_containers:
-                event_containers = soup.find_all(['div'], attrs={'data-testid': re.compile(r'event', re.I)})
-            
-            # Fallback to any container with event-related attributes
-            if not event_containers:
-                event_containers = soup.find_all(['div', 'article'], attrs={'href': re.compile(r'/e/', re.I)})
-            
-            logger.info(f"Found {len(event_containers)} potential event containers on Eventbrite")
-            
-            for container in event_containers[:max_events]:
-                event = self._extract_event_data(container)
-                if event:
-                    events.append(event)
-            
-            # Try to extract from JSON-LD structured data if available
-            json_events = self._extract_from_json_ld(soup)
-            events.extend(json_events[:max_events - len(events)])
+            events.extend(self.iter_events(max_events))
             
         except Exception as e:
             logger.error(f"Error scraping Eventbrite events: {str(e)}")
         
         return events[:max_events]
     
-    def _extract_event_data(self, container) -> Optional[Dict]:
+    def iter_events(self, max_events: int = 50, max_workers: int = 1) -> Iterator[Dict]:
+        """
+        Yield events as soon as they are extracted and enriched
+        
+        Args:
+            max_events: Maximum number of events to yield
+            max_workers: Number of event pages fetched concurrently
+        """
+        events = self.iter_listing(self.fetch_listing(), max_events, fetch_details=False)
+        return self.iter_with_details(events, max_workers=max_workers)
+    
+    def _timeout(self, default: float) -> float:
+        """Request timeout, shortened to the remaining time of the cancel token"""
+        if self.cancel_token is not None:
+            return self.cancel_token.timeout(default)
+        return default
+    
+    def fetch_listing(self) -> bytes:
+        """Fetch the raw search results page"""
+        with stage_timer('Eventbrite', 'fetch'):
+            response = self.session.get(self.search_url, timeout=self._timeout(30))
+            response.raise_for_status()
+        return response.content
+    
+    def parse_listing(self, content: bytes, max_events: int = 50, fetch_details: bool = True) -> List[Dict]:
+        """
+        Extract events from a raw search results page
+        
+        Args:
+            content: Page HTML
+            max_events: Maximum number of events to extract
+            fetch_details: Fetch each event page for details while extracting
+            
+        Returns:
+            List of event dictionaries
+        """
+        return list(self.iter_listing(content, max_events, fetch_details))
+    
+    def iter_listing(self, content: bytes, max_events: int = 50, fetch_details: bool = True) -> Iterator[Dict]:
+        """
+        Yield events from a raw search results page one container at a time
+        
+        Args:
+            content: Page HTML
+            max_events: Maximum number of events to yield
+            fetch_details: Fetch each event page for details while extracting;
+                when False, pass the events through iter_with_details
+        """
+        seen_urls = set()
+        seen_keys = set()
+        count = 0
+        
+        if self.structured_first:
+            with stage_timer('Eventbrite', 'extract'):
+                structured_events = self._extract_structured_events(content)
+            for event in structured_events:
+                if count >= max_events:
+                    return
+                if self._remember(event, seen_urls, seen_keys):
+                    count += 1
+                    yield event
+            logger.info(f"Found {count} events in Eventbrite structured data")
+            if count >= max_events:
+                return
+        
+        with stage_timer('Eventbrite', 'parse'):
+            soup = BeautifulSoup(content, 'html.parser')
+        
+        # Event cards by class name, then data-testid, then any container linking to an event
+        event_containers = RULES.containers.find_all(soup)
+        
+        logger.info(f"Found {len(event_containers)} potential event containers on Eventbrite")
+        
+        for container in event_containers:
+            if count >= max_events:
+                return
+            # Cards already covered by structured data are skipped before extraction
+            link_elem = RULES.link.find(container)
+            if link_elem and self._absolute_url(link_elem.get('href')) in seen_urls:
+                continue
+            with stage_timer('Eventbrite', 'extract'):
+                event = self._extract_event_data(container, fetch_details=fetch_details)
+            if event and self._remember(event, seen_urls, seen_keys):
+                count += 1
+                yield event
+        
+        # Try to extract from JSON-LD structured data if available
+        if not self.structured_first and count < max_events:
+            with stage_timer('Eventbrite', 'extract'):
+                json_events = self._extract_from_json_ld(content)
+            for event in json_events:
+                if count >= max_events:
+                    return
+                if self._remember(event, seen_urls, seen_keys):
+                    count += 1
+                    yield event
+    
+    def _remember(self, event: Dict, seen_urls: set, seen_keys: set) -> bool:
+        """Record an event's URL and title/date; False if it was already seen"""
+        key = (event.get('title', '').strip().lower(), event.get('date'))
+        url = event.get('source_url')
+        if key in seen_keys or (url and url in seen_urls):
+            return False
+        seen_keys.add(key)
+        if url:
+            seen_urls.add(url)
+        return True
+    
+    def _absolute_url(self, url: Optional[str]) -> Optional[str]:
+        if url and url.startswith('//'):
+            return 'https:' + url
+        if url and not url.startswith('http'):
+            return self.base_url + url
+        return url
+    
+    def iter_with_details(self, events: Iterable[Dict], max_workers: int = 1) -> Iterator[Dict]:
+        """
+        Merge event page details into events, yielding each as soon as it is ready
+        
+        Keeps at most max_workers event pages in flight and preserves order.
+        
+        Args:
+            events: Events extracted with fetch_details=False
+            max_workers: Number of event pages fetched concurrently
+        """
+        max_workers = max(1, max_workers)
+        in_flight = deque()
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for event in events:
+                in_flight.append(executor.submit(self._add_details, event))
+                if len(in_flight) >= max_workers:
+                    yield in_flight.popleft().result()
+            
+            while in_flight:
+                yield in_flight.popleft().result()
+    
+    def _add_details(self, event: Dict) -> Dict:
+        """Merge details from the event's page into the event"""
+        if self.structured_first and self._has_details(event):
+            return event
+        if self.cancel_token is not None and self.cancel_token.cancelled:
+            return event
+        
+        if event.get('source_url'):
+            with stage_timer('Eventbrite', 'detail_fetch'):
+                additional_data = self._scrape_event_details(event['source_url'])
+            if additional_data:
+                event.update(additional_data)
+        return event
+    
+    def _has_details(self, event: Dict) -> bool:
+        """Whether an event already has what a detail page would add"""
+        description = event.get('description', '')
+        return bool(
+            event.get('date') and
+            event.get('location') and event.get('location') != 'Amsterdam' and
+            description and not description.startswith('Join this free event in Amsterdam')
+        )
+    
+    def _extract_event_data(self, container, fetch_details: bool = True) -> Optional[Dict]:
         """Extract event data from a container element"""
         try:
             event = {
                 'source': 'Eventbrite',
                 'cost': 'Free',
-                'category': 'Community',  # Default category
-                'image': 'https://via.placeholder.com/400x250'
+                'category': 'Community'  # Default category
             }
             
             # Extract title - try multiple selectors
-            title_elem = (
-                container.find(['h1', 'h2', 'h3', 'h4'], class_=re.compile(r'title|name|heading', re.I)) or
-                container.find(['a'], class_=re.compile(r'event-title|title', re.I)) or
-                container.find(['a'], href=re.compile(r'/e/', re.I))
-            )
+            title_elem = RULES.title.find(container)
             
             if title_elem:
                 event['title'] = title_elem.get_text(strip=True)
@@ -88,18 +247,17 @@ class EventbriteScraper:
                 return None
             
             # Extract event URL for more details
-            link_elem = container.find('a', href=re.compile(r'/e/', re.I))
+            link_elem = RULES.link.find(container)
             event_url = None
             if link_elem:
                 event_url = link_elem.get('href')
                 if event_url and not event_url.startswith('http'):
                     event_url = self.base_url + event_url
+                if event_url:
+                    event['source_url'] = event_url
             
             # Extract date and time
-            date_elem = (
-                container.find(['time']) or
-                container.find(['div', 'span'], class_=re.compile(r'date|time', re.I))
-            )
+            date_elem = RULES.date.find(container)
             
             if date_elem:
                 # Try to get datetime attribute first
@@ -118,7 +276,7 @@ class EventbriteScraper:
                         event['time'] = parsed_date['time']
             
             # Extract location
-            location_elem = container.find(['div', 'span'], class_=re.compile(r'location|venue|address', re.I))
+            location_elem = RULES.location.find(container)
             if location_elem:
                 location_text = location_elem.get_text(strip=True)
                 event['location'] = location_text
@@ -131,14 +289,14 @@ class EventbriteScraper:
                 event['address'] = 'Amsterdam, Netherlands'
             
             # Extract description
-            desc_elem = container.find(['p', 'div'], class_=re.compile(r'description|summary|excerpt', re.I))
+            desc_elem = RULES.description.find(container)
             if desc_elem:
                 event['description'] = desc_elem.get_text(strip=True)[:300] + '...'
             else:
                 event['description'] = f"Join this free event in Amsterdam. Check {event['title']} for more details."
             
             # Extract image
-            img_elem = container.find('img')
+            img_elem = RULES.image.find(container)
             if img_elem:
                 img_src = img_elem.get('src') or img_elem.get('data-src')
                 if img_src:
@@ -149,18 +307,20 @@ class EventbriteScraper:
                     event['image'] = img_src
             
             # Extract organizer
-            organizer_elem = container.find(['div', 'span'], class_=re.compile(r'organizer|host|by', re.I))
+            organizer_elem = RULES.organizer.find(container)
             if organizer_elem:
                 event['organizer'] = organizer_elem.get_text(strip=True)
             else:
                 event['organizer'] = 'Eventbrite Organizer'
             
             # Determine category
-            event['category'] = self._determine_category(event.get('title', ''), event.get('description', ''))
+            with stage_timer('Eventbrite', 'categorize'):
+                event['category'] = self._determine_category(event.get('title', ''), event.get('description', ''))
             
             # If we have an event URL, try to get more details
-            if event_url:
-                additional_data = self._scrape_event_details(event_url)
+            if event_url and fetch_details:
+                with stage_timer('Eventbrite', 'detail_fetch'):
+                    additional_data = self._scrape_event_details(event_url)
                 if additional_data:
                     event.update(additional_data)
             
@@ -185,18 +345,8 @@ class EventbriteScraper:
     def _parse_date_text(self, date_text: str) -> Optional[Dict]:
         """Parse date from text content"""
         try:
-            # Common patterns for Eventbrite
-            patterns = [
-                r'(\w+),\s+(\w+)\s+(\d{1,2}),?\s+(\d{4})',  # Monday, July 15, 2025
-                r'(\w+)\s+(\d{1,2}),?\s+(\d{4})',  # July 15, 2025
-                r'(\d{1,2})\s+(\w+)\s+(\d{4})',  # 15 July 2025
-            ]
-            
-            # Time patterns
-            time_pattern = r'(\d{1,2}):(\d{2})\s*(AM|PM)?'
-            
             time_str = "All day"
-            time_match = re.search(time_pattern, date_text, re.I)
+            time_match = RULES.time_pattern.search(date_text)
             if time_match:
                 hour, minute, ampm = time_match.groups()
                 if ampm:
@@ -205,24 +355,12 @@ class EventbriteScraper:
                     time_str = f"{hour}:{minute}"
             
             # Try to extract date
-            for pattern in patterns:
-                match = re.search(pattern, date_text)
-                if match:
-                    try:
-                        if len(match.groups()) == 4:  # Has day name
-                            day_name, month_name, day, year = match.groups()
-                        else:  # No day name
-                            month_name, day, year = match.groups()
-                        
-                        month_num = self._month_name_to_number(month_name)
-                        date_obj = datetime(int(year), month_num, int(day))
-                        
-                        return {
-                            'date': date_obj.strftime('%Y-%m-%d'),
-                            'time': time_str
-                        }
-                    except ValueError:
-                        continue
+            date_obj = RULES.date_patterns.parse(date_text)
+            if date_obj:
+                return {
+                    'date': date_obj.strftime('%Y-%m-%d'),
+                    'time': time_str
+                }
             
             # Default to near future if parsing fails
             future_date = datetime.now() + timedelta(days=3)
@@ -235,24 +373,6 @@ class EventbriteScraper:
             logger.error(f"Error parsing date text: {str(e)}")
             return None
     
-    def _month_name_to_number(self, month_name: str) -> int:
-        """Convert month name to number"""
-        months = {
-            'january': 1, 'jan': 1,
-            'february': 2, 'feb': 2,
-            'march': 3, 'mar': 3,
-            'april': 4, 'apr': 4,
-            'may': 5,
-            'june': 6, 'jun': 6,
-            'july': 7, 'jul': 7,
-            'august': 8, 'aug': 8,
-            'september': 9, 'sep': 9,
-            'october': 10, 'oct': 10,
-            'november': 11, 'nov': 11,
-            'december': 12, 'dec': 12
-        }
-        return months.get(month_name.lower(), 1)
-    
     def _determine_category(self, title: str, description: str) -> str:
         """Determine event category based on title and description"""
         text = (title + ' ' + description).lower()
@@ -273,37 +393,157 @@ class EventbriteScraper:
         
         return 'Community'  # Default category for Eventbrite
     
-    def _extract_from_json_ld(self, soup) -> List[Dict]:
+    def _extract_structured_events(self, content: bytes) -> List[Dict]:
+        """Events from JSON-LD and embedded page data (__SERVER_DATA__, __NEXT_DATA__)"""
+        return self._extract_from_json_ld(content) + self._extract_from_server_data(content)
+    
+    def _extract_from_json_ld(self, content: bytes) -> List[Dict]:
         """Extract events from JSON-LD structured data"""
         events = []
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        
+        for match in JSON_LD_RE.finditer(content):
+            try:
+                data = _json_loads(match.group(1))
+            except ValueError:
+                continue
+            
+            for item in self._json_ld_items(data):
+                item_type = item.get('@type')
+                if isinstance(item_type, list):
+                    item_type = next((t for t in item_type if str(t).endswith('Event')), '')
+                if str(item_type).endswith('Event'):
+                    event = self._parse_json_ld_event(item)
+                    if event:
+                        events.append(event)
+        
+        return events
+    
+    def _json_ld_items(self, data) -> Iterator[Dict]:
+        """Flatten JSON-LD arrays, @graph and ItemList wrappers"""
+        if isinstance(data, list):
+            for item in data:
+                yield from self._json_ld_items(item)
+        elif isinstance(data, dict):
+            if '@graph' in data:
+                yield from self._json_ld_items(data['@graph'])
+            elif 'itemListElement' in data:
+                for element in data['itemListElement'] or []:
+                    if isinstance(element, dict) and isinstance(element.get('item'), dict):
+                        yield element['item']
+                    elif isinstance(element, dict):
+                        yield element
+            else:
+                yield data
+    
+    def _extract_from_server_data(self, content: bytes) -> List[Dict]:
+        """Extract events from JSON state embedded in the page by the frontend"""
+        events = []
+        if isinstance(content, str):
+            content = content.encode('utf-8')
         
+        for match in SERVER_DATA_RE.finditer(content):
+            blob = match.group(1).strip().rstrip(b';').strip()
+            try:
+                data = _json_loads(blob)
+            except ValueError:
+                continue
+            
+            for item in self._find_server_events(data):
+                event = self._parse_server_data_event(item)
+                if event:
+                    events.append(event)
+        
+        return events
+    
+    def _find_server_events(self, data, depth: int = 0) -> Iterator[Dict]:
+        """Walk embedded page data for objects that look like events"""
+        if depth > 12:
+            return
+        if isinstance(data, list):
+            for item in data:
+                yield from self._find_server_events(item, depth + 1)
+        elif isinstance(data, dict):
+            if data.get('name') and any(key in data for key in ('start_date', 'startDate', 'start')):
+                yield data
+                return
+            for value in data.values():
+                if isinstance(value, (dict, list)):
+                    yield from self._find_server_events(value, depth + 1)
+    
+    def _parse_server_data_event(self, data: Dict) -> Optional[Dict]:
+        """Parse an event object from embedded page data (Eventbrite API shapes)"""
         try:
-            # Look for JSON-LD script tags
-            json_scripts = soup.find_all('script', type='application/ld+json')
+            title = self._text_value(data.get('name'))
+            if not title:
+                return None
+            
+            event = {
+                'source': 'Eventbrite',
+                'cost': 'Free',
+                'title': title
+            }
+            
+            description = self._text_value(data.get('summary') or data.get('description'))
+            if description:
+                event['description'] = description[:300] + '...'
+            
+            start = data.get('start')
+            if isinstance(start, dict):
+                parsed_date = self._parse_datetime_attr(start.get('local') or start.get('utc') or '')
+            elif data.get('start_date'):
+                parsed_date = self._parse_datetime_attr(f"{data['start_date']}T{data.get('start_time') or '00:00'}")
+            else:
+                parsed_date = self._parse_datetime_attr(data.get('startDate') or '')
+            if parsed_date:
+                event['date'] = parsed_date['date']
+                event['time'] = parsed_date['time']
+            
+            venue = data.get('primary_venue') or data.get('venue')
+            if isinstance(venue, dict):
+                address = venue.get('address') or {}
+                address_text = ''
+                if isinstance(address, dict):
+                    address_text = (
+                        address.get('localized_address_display') or
+                        ', '.join(part for part in (address.get('address_1'), address.get('city')) if part)
+                    )
+                event['location'] = venue.get('name') or address_text or 'Amsterdam'
+                event['address'] = address_text or 'Amsterdam, Netherlands'
+                if 'amsterdam' not in event['address'].lower():
+                    event['address'] += ', Amsterdam'
+            
+            url = data.get('url') or data.get('tickets_url')
+            if url:
+                event['source_url'] = self._absolute_url(url)
+            
+            image = data.get('image') or data.get('logo')
+            if isinstance(image, dict):
+                image = image.get('url') or (image.get('original') or {}).get('url')
+            if image:
+                event['image'] = self._absolute_url(str(image))
+            
+            organizer = data.get('primary_organizer') or data.get('organizer')
+            if isinstance(organizer, dict) and organizer.get('name'):
+                event['organizer'] = organizer['name']
+            else:
+                event['organizer'] = 'Eventbrite Organizer'
+            
+            with stage_timer('Eventbrite', 'categorize'):
+                event['category'] = self._determine_category(title, event.get('description', ''))
+            
+            return event
             
-            for script in json_scripts:
-                try:
-                    data = json.loads(script.string)
-                    
-                    # Handle both single events and arrays
-                    if isinstance(data, list):
-                        items = data
-                    else:
-                        items = [data]
-                    
-                    for item in items:
-                        if item.get('@type') == 'Event':
-                            event = self._parse_json_ld_event(item)
-                            if event:
-                                events.append(event)
-                                
-                except json.JSONDecodeError:
-                    continue
-                    
         except Exception as e:
-            logger.error(f"Error extracting JSON-LD events: {str(e)}")
-        
-        return events
+            logger.error(f"Error parsing Eventbrite page data event: {str(e)}")
+            return None
+    
+    def _text_value(self, value) -> str:
+        """Plain text from a string or an API {'text': ...} object"""
+        if isinstance(value, dict):
+            value = value.get('text') or value.get('html') or ''
+        return str(value).strip() if value else ''
     
     def _parse_json_ld_event(self, data: Dict) -> Optional[Dict]:
         """Parse event from JSON-LD data"""
@@ -316,7 +556,11 @@ class EventbriteScraper:
             
             # Extract basic info
             event['title'] = data.get('name', '')
-            event['description'] = data.get('description', '')[:300] + '...'
+            description = data.get('description', '')
+            if description:
+                event['description'] = description[:300] + '...'
+            if data.get('url'):
+                event['source_url'] = self._absolute_url(data['url'])
             
             # Extract date/time
             start_date = data.get('startDate')
@@ -353,12 +597,13 @@ class EventbriteScraper:
                 if isinstance(image, list):
                     image = image[0]
                 if isinstance(image, dict):
-                    event['image'] = image.get('url', 'https://via.placeholder.com/400x250')
-                else:
+                    image = image.get('url')
+                if image:
                     event['image'] = str(image)
             
             # Determine category
-            event['category'] = self._determine_category(event.get('title', ''), event.get('description', ''))
+            with stage_timer('Eventbrite', 'categorize'):
+                event['category'] = self._determine_category(event.get('title', ''), event.get('description', ''))
             
             return event
             
@@ -369,22 +614,32 @@ class EventbriteScraper:
     def _scrape_event_details(self, event_url: str) -> Optional[Dict]:
         """Scrape additional details from individual event page"""
         try:
-            response = self.session.get(event_url, timeout=15)
+            response = self.session.get(event_url, timeout=self._timeout(15))
             response.raise_for_status()
+            return (self.detail_parser or self.parse_event_details)(response.content)
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+        except CircuitOpenError:
+            return None
+        except Exception as e:
+            logger.error(f"Error scraping event details from {event_url}: {str(e)}")
+            return None
+    
+    def parse_event_details(self, content: bytes) -> Dict:
+        """Better description and location from an event page (CPU-only)"""
+        with stage_timer('Eventbrite', 'detail_parse'):
+            soup = BeautifulSoup(content, 'html.parser')
             
             additional_data = {}
             
             # Try to get better description
-            desc_elem = soup.find(['div'], class_=re.compile(r'description|about|summary', re.I))
+            desc_elem = RULES.detail_description.find(soup)
             if desc_elem:
                 desc_text = desc_elem.get_text(strip=True)
                 if len(desc_text) > 50:  # Only use if substantial
                     additional_data['description'] = desc_text[:300] + '...'
             
             # Try to get better location info
-            location_elem = soup.find(['div', 'span'], class_=re.compile(r'venue|location|address', re.I))
+            location_elem = RULES.detail_location.find(soup)
             if location_elem:
                 location_text = location_elem.get_text(strip=True)
                 if location_text and len(location_text) > 5:
@@ -395,8 +650,4 @@ class EventbriteScraper:
                         additional_data['address'] = location_text
             
             return additional_data
-            
-        except Exception as e:
-            logger.error(f"Error scraping event details from {event_url}: {str(e)}")
-            return None
 
@@ -1,30 +1,80 @@
-from flask import Blueprint, jsonify, request
-from src.models.event import Event, db
+from typing import Dict, Optional, Tuple
+from flask import Blueprint, Response, current_app, jsonify, request, send_file, stream_with_context
+from src.broadcast import broadcaster, update_notifier
+from src.models.event import Event
+from src.models.event_index import query_active_events, rebuild_event_index
+from src.models.export import FORMATS, available_formats, export_file_path, iter_export, read_manifest
 from src.scheduler import event_scheduler
+from src.instrumentation import PROMETHEUS_CONTENT_TYPE, get_last_profile, metrics
+from src.routes.request_metrics import get_slow_requests, instrument_blueprint
+from src.scrapers.extraction_rules import rule_report
+from src.scrapers.image_cache import CONTENT_TYPES, get_image_cache
 import logging
 
 logger = logging.getLogger(__name__)
 
 events_bp = Blueprint('events', __name__)
+instrument_blueprint(events_bp)
+
+# Radius of /events?near=lat,lon queries in kilometres
+DEFAULT_RADIUS_KM = 2.0
+MAX_RADIUS_KM = 25.0
+
+# Largest synthetic data set POST /seed?count=N loads in one request; larger
+# loads belong in the CLI (python -m src.scrapers.synthetic), not a web worker
+MAX_SEED_COUNT = 50000
+
+# Events per change feed page
+DEFAULT_CHANGES_LIMIT = 500
+MAX_CHANGES_LIMIT = 5000
+
+# Headers of event streams; X-Accel-Buffering stops nginx from holding back messages
+STREAM_HEADERS = {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+
+def event_filters(args) -> Dict:
+    """
+    Keyword arguments for Event.get_active_events from query parameters
+    
+    Shared by the Flask routes and the ASGI read path (src.asgi).
+    
+    Raises:
+        ValueError: For malformed near/radius parameters
+    """
+    search = args.get('search', '').lower()
+    category = args.get('category', '')
+    date_filter = args.get('date', '')
+    
+    near = None
+    radius_km = DEFAULT_RADIUS_KM
+    if args.get('near'):
+        try:
+            latitude, longitude = (float(value) for value in args['near'].split(','))
+            radius_km = float(args.get('radius', DEFAULT_RADIUS_KM))
+        except ValueError:
+            raise ValueError('near must be "lat,lon" and radius a number of kilometres')
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180) or not 0 < radius_km <= MAX_RADIUS_KM:
+            raise ValueError(f'near must be a valid coordinate and radius between 0 and {MAX_RADIUS_KM} km')
+        near = (latitude, longitude)
+    
+    return {
+        'search': search if search else None,
+        'category': category if category and category != 'All' else None,
+        'date_filter': date_filter if date_filter else None,
+        'near': near,
+        'radius_km': radius_km
+    }
 
 @events_bp.route('/events', methods=['GET'])
 def get_events():
     """Get all events with optional filtering"""
     try:
-        # Get query parameters
-        search = request.args.get('search', '').lower()
-        category = request.args.get('category', '')
-        date_filter = request.args.get('date', '')
+        try:
+            filters = event_filters(request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
-        # Get filtered events from database
-        events = Event.get_active_events(
-            search=search if search else None,
-            category=category if category and category != 'All' else None,
-            date_filter=date_filter if date_filter else None
-        )
-        
-        # Convert to dictionaries
-        events_data = [event.to_dict() for event in events]
+        # Served from the in-memory event index, or the database without one
+        events_data, _ = query_active_events(**filters)
         
         return jsonify({
             'events': events_data,
@@ -35,11 +85,86 @@ def get_events():
         logger.error(f"Error getting events: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+def parse_change_token(token: str) -> Optional[Tuple[int, int]]:
+    """
+    Change feed position from a since token ("<change_seq>-<id>"); None for an empty token
+    
+    Raises:
+        ValueError: For malformed tokens
+    """
+    if not token:
+        return None
+    try:
+        change_seq, event_id = (int(part) for part in token.split('-'))
+    except ValueError:
+        raise ValueError('since must be a token returned by /api/events/changes')
+    if change_seq < 0 or event_id < 0:
+        raise ValueError('since must be a token returned by /api/events/changes')
+    return change_seq, event_id
+
+@events_bp.route('/events/changes', methods=['GET'])
+def get_event_changes():
+    """
+    Events created, updated or deactivated since a change token
+    
+    Without since the active events are returned as a full sync. Pass the
+    returned token as since to get only later changes; has_more means the
+    next page is ready right away. Deactivated events only carry their id.
+    Events removed by cleanup (dated in the past) are not reported.
+    """
+    try:
+        try:
+            since = parse_change_token(request.args.get('since', ''))
+            limit = int(request.args.get('limit', DEFAULT_CHANGES_LIMIT))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        limit = max(1, min(limit, MAX_CHANGES_LIMIT))
+        
+        events = Event.get_changes(since, limit + 1)
+        has_more = len(events) > limit
+        events = events[:limit]
+        
+        changes = [
+            dict(event.to_dict(), is_active=True) if event.is_active else {'id': event.id, 'is_active': False}
+            for event in events
+        ]
+        if events:
+            token = f"{events[-1].change_seq}-{events[-1].id}"
+        else:
+            token = request.args.get('since') or '0-0'
+        
+        return jsonify({
+            'changes': changes,
+            'token': token,
+            'has_more': has_more
+        })
+    
+    except Exception as e:
+        logger.error(f"Error getting event changes: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@events_bp.route('/events/stream', methods=['GET'])
+def stream_event_updates():
+    """
+    Server-Sent Events stream with a summary of every finished update
+    
+    Each `update` message lists the new, changed and removed events of a
+    run and a change feed token; reconnecting clients send Last-Event-ID
+    to receive the summaries they missed.
+    """
+    try:
+        update_notifier.start_watcher(current_app._get_current_object())
+        subscriber = broadcaster.subscribe(request.headers.get('Last-Event-ID'))
+        return Response(broadcaster.iter_sse(subscriber), mimetype='text/event-stream', headers=STREAM_HEADERS)
+    except Exception as e:
+        logger.error(f"Error opening event stream: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
 @events_bp.route('/events/<int:event_id>', methods=['GET'])
 def get_event(event_id):
     """Get a specific event by ID"""
     try:
-        event = Event.query.filter(Event.id == event_id, Event.is_active == True).first()
+        event = Event.get_active_event(event_id)
         if event:
             return jsonify(event.to_dict())
         else:
@@ -48,6 +173,21 @@ def get_event(event_id):
         logger.error(f"Error getting event {event_id}: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+@events_bp.route('/facets', methods=['GET'])
+def get_facets():
+    """Get event counts per category, date bucket and source for the current filters"""
+    try:
+        search = request.args.get('search', '').lower()
+        facets = Event.get_facets(
+            search=search if search else None,
+            category=request.args.get('category', '') or None,
+            date_filter=request.args.get('date', '') or None
+        )
+        return jsonify(facets)
+    except Exception as e:
+        logger.error(f"Error getting facets: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
 @events_bp.route('/categories', methods=['GET'])
 def get_categories():
     """Get all available event categories"""
@@ -58,12 +198,63 @@ def get_categories():
         logger.error(f"Error getting categories: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+@events_bp.route('/images/<name>', methods=['GET'])
+def get_image(name):
+    """Serve a cached event image thumbnail"""
+    path = get_image_cache().path_for(name)
+    if path is None:
+        return jsonify({'error': 'Image not found'}), 404
+    # File names are content hashes, so a name never points to different bytes
+    response = send_file(path, mimetype=CONTENT_TYPES[name.rsplit('.', 1)[1]], conditional=True)
+    response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response
+
+@events_bp.route('/export', methods=['GET'])
+def export_events():
+    """
+    Stream all active events as NDJSON, CSV, Parquet or Arrow (?format=, ?category=)
+    
+    For bulk consumers: rows are read in chunks of only the exported
+    columns and written out as they come, instead of building the full
+    /events response. The nightly files under /export/files are cheaper still.
+    """
+    file_format = request.args.get('format', 'ndjson')
+    try:
+        body = iter_export(file_format, category=request.args.get('category'))
+    except ValueError as e:
+        return jsonify({'error': str(e), 'formats': available_formats()}), 400
+    
+    extension = FORMATS[file_format][1].split('.')[1]
+    return Response(
+        stream_with_context(body),
+        mimetype=FORMATS[file_format][0],
+        headers={'Content-Disposition': f'attachment; filename="events.{extension}"'}
+    )
+
+@events_bp.route('/export/files', methods=['GET'])
+def get_export_files():
+    """Manifest of the nightly export files"""
+    manifest = read_manifest()
+    if manifest is None:
+        return jsonify({'error': 'No export has been written yet'}), 404
+    return jsonify(manifest)
+
+@events_bp.route('/export/files/<name>', methods=['GET'])
+def get_export_file(name):
+    """Download a nightly export file"""
+    path = export_file_path(name)
+    if path is None:
+        return jsonify({'error': 'Export file not found'}), 404
+    content_type = next(content_type for content_type, file_name in FORMATS.values() if file_name == name)
+    return send_file(path, mimetype=content_type, as_attachment=True, download_name=name, conditional=True)
+
 @events_bp.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
     try:
-        # Check database connection
-        event_count = Event.query.filter(Event.is_active == True).count()
+        # Served from the cached status snapshot, so polling costs no queries
+        cached_before = event_scheduler.status_snapshot
+        snapshot = event_scheduler.get_status_snapshot()
         
         # Check scheduler status
         scheduler_status = event_scheduler.get_job_status()
@@ -71,9 +262,11 @@ def health_check():
         return jsonify({
             'status': 'healthy', 
             'message': 'Amsterdam Events API is running',
-            'active_events': event_count,
-            'scheduler': scheduler_status
-        })
+            'active_events': snapshot['total_active_events'],
+            'data_generated_at': snapshot['generated_at'],
+            'scheduler': scheduler_status,
+            'sources': event_scheduler.data_manager.get_breaker_status() if event_scheduler.data_manager else {}
+        }), 200, {'X-Cache': 'HIT' if snapshot is cached_before else 'MISS'}
     except Exception as e:
         logger.error(f"Health check failed: {str(e)}")
         return jsonify({
@@ -83,15 +276,18 @@ def health_check():
 
 @events_bp.route('/scrape', methods=['POST'])
 def trigger_scrape():
-    """Manually trigger event scraping"""
+    """Manually trigger event scraping (pass profile=1 to profile the run)"""
     try:
+        profile = request.args.get('profile', '') in ('1', 'true')
+        
         # Trigger manual update through scheduler
-        success = event_scheduler.trigger_manual_update()
+        success = event_scheduler.trigger_manual_update(profile=profile)
         
         if success:
             return jsonify({
                 'status': 'success',
-                'message': 'Manual scraping triggered'
+                'message': 'Manual scraping triggered',
+                'profile': profile
             })
         else:
             return jsonify({
@@ -103,21 +299,50 @@ def trigger_scrape():
         logger.error(f"Error during manual scrape trigger: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+@events_bp.route('/scrape/cancel', methods=['POST'])
+def cancel_scrape():
+    """Cancel the running update at its next checkpoint"""
+    if event_scheduler.cancel_current_update():
+        return jsonify({'status': 'success', 'message': 'Running update is being cancelled'})
+    return jsonify({'status': 'error', 'message': 'No update is running'}), 409
+
+@events_bp.route('/scrape/profile', methods=['GET'])
+def get_scrape_profile():
+    """Get the report of the most recent profiled scrape"""
+    profile = get_last_profile()
+    if not profile:
+        return jsonify({'error': 'No profiled run available, trigger one with POST /api/scrape?profile=1'}), 404
+    return jsonify(profile)
+
+@events_bp.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Export metrics in Prometheus text format"""
+    return Response(metrics.render_prometheus(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+@events_bp.route('/metrics/slow-requests', methods=['GET'])
+def get_slow_request_log():
+    """Get recent requests slower than SLOW_REQUEST_THRESHOLD_MS with their filters"""
+    return jsonify({'slow_requests': get_slow_requests()})
+
+@events_bp.route('/metrics/extraction-rules', methods=['GET'])
+def get_extraction_rule_report():
+    """Lookups, hit rate and mean time of every scraper extraction rule in this process"""
+    return jsonify({'rules': rule_report()})
+
 @events_bp.route('/scheduler/status', methods=['GET'])
 def get_scheduler_status():
     """Get scheduler status and job information"""
     try:
         status = event_scheduler.get_job_status()
         
-        # Add data manager status
-        from src.scrapers.data_manager import DataManager
-        data_manager = DataManager()
-        update_status = data_manager.get_update_status()
+        # Add cached data status
+        cached_before = event_scheduler.status_snapshot
+        update_status = event_scheduler.get_status_snapshot()
         
         return jsonify({
             'scheduler': status,
             'data': update_status
-        })
+        }), 200, {'X-Cache': 'HIT' if update_status is cached_before else 'MISS'}
     
     except Exception as e:
         logger.error(f"Error getting scheduler status: {str(e)}")
@@ -125,16 +350,24 @@ def get_scheduler_status():
 
 @events_bp.route('/seed', methods=['POST'])
 def seed_sample_data():
-    """Seed database with sample data (for testing)"""
+    """Seed database with sample data (for testing); ?count=N bulk loads N synthetic events"""
     try:
-        from src.scrapers.data_manager import DataManager
+        count = request.args.get('count', 0, type=int)
+        seed = request.args.get('seed', 0, type=int)
+        if not 0 <= count <= MAX_SEED_COUNT:
+            return jsonify({
+                'error': f'count must be between 0 and {MAX_SEED_COUNT}; '
+                         f'load larger data sets with python -m src.scrapers.synthetic --count N'
+            }), 400
         
-        data_manager = DataManager()
-        data_manager.seed_sample_data()
+        seeded = event_scheduler.get_data_manager().seed_sample_data(count=count, seed=seed)
+        event_scheduler.refresh_status_snapshot()
+        rebuild_event_index()
         
         return jsonify({
             'status': 'success',
-            'message': 'Sample data seeded successfully'
+            'message': 'Sample data seeded successfully',
+            'events_seeded': seeded
         })
     
     except Exception as e:
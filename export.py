@@ -0,0 +1,294 @@
+import io
+import os
+import csv
+import json
+import gzip
+import time
+import hashlib
+import logging
+import tempfile
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from src.instrumentation import metrics
+from src.models.event import Event
+
+logger = logging.getLogger(__name__)
+
+# Directory of the nightly export files
+EXPORT_DIR = os.environ.get(
+    'EXPORT_DIR',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'database', 'exports')
+)
+# Rows read from the database per query while exporting
+EXPORT_CHUNK_SIZE = int(os.environ.get('EXPORT_CHUNK_SIZE', 5000))
+# Hour (Europe/Amsterdam) of the nightly export; -1 disables it
+EXPORT_HOUR = int(os.environ.get('EXPORT_HOUR', 4))
+
+# Exported columns, the fields of Event.to_dict()
+EXPORT_FIELDS = (
+    'id', 'title', 'description', 'date', 'time', 'location', 'address', 'category', 'cost',
+    'organizer', 'source', 'image', 'source_url', 'latitude', 'longitude'
+)
+FLOAT_FIELDS = ('latitude', 'longitude')
+
+# Format name: (content type, file name of the nightly export)
+FORMATS = {
+    'ndjson': ('application/x-ndjson', 'events.ndjson.gz'),
+    'csv': ('text/csv; charset=utf-8', 'events.csv.gz'),
+    'parquet': ('application/vnd.apache.parquet', 'events.parquet'),
+    'arrow': ('application/vnd.apache.arrow.stream', 'events.arrows'),
+}
+# Formats written by pyarrow
+ARROW_FORMATS = ('parquet', 'arrow')
+
+export_rows_total = metrics.counter(
+    'export_rows_total', 'Events exported by format and kind (stream, file)', ('format', 'kind'))
+export_seconds = metrics.histogram(
+    'export_seconds', 'Duration of exports by format and kind (stream, file)', ('format', 'kind'),
+    buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0))
+
+
+def pyarrow_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def available_formats() -> List[str]:
+    """Export formats supported in this process (Parquet and Arrow need pyarrow)"""
+    if pyarrow_available():
+        return list(FORMATS)
+    return [name for name in FORMATS if name not in ARROW_FORMATS]
+
+
+def iter_event_chunks(chunk_size: int = EXPORT_CHUNK_SIZE,
+                      category: Optional[str] = None) -> Iterator[List[Tuple]]:
+    """
+    Active events as lists of EXPORT_FIELDS tuples, ordered by id (requires app context)
+
+    Only the exported columns are selected, no ORM objects are built, and
+    every chunk is its own keyset query (id > last id), so no query holds
+    more than chunk_size rows or a long-running cursor on the replica.
+    """
+    from src.models.storage import read_session
+
+    columns = [getattr(Event, field) for field in EXPORT_FIELDS]
+    last_id = 0
+    while True:
+        query = read_session().query(*columns).filter(Event.is_active == True, Event.id > last_id)
+        if category and category != 'All':
+            query = query.filter(Event.category == category)
+        rows = [tuple(row) for row in query.order_by(Event.id.asc()).limit(chunk_size)]
+        if not rows:
+            return
+        yield rows
+        if len(rows) < chunk_size:
+            return
+        last_id = rows[-1][0]
+
+
+def _ndjson(chunks: Iterator[List[Tuple]]) -> Iterator[bytes]:
+    dumps = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+    for rows in chunks:
+        yield ''.join(dumps(dict(zip(EXPORT_FIELDS, row))) + '\n' for row in rows).encode('utf-8')
+
+
+def _csv(chunks: Iterator[List[Tuple]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(EXPORT_FIELDS)
+    for rows in chunks:
+        writer.writerows(rows)
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+class _Drain(io.RawIOBase):
+    """Write-only file collecting what pyarrow writes until it is drained into the response"""
+
+    def __init__(self):
+        super().__init__()
+        self.parts: List[bytes] = []
+        self.position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self.parts.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def drain(self) -> bytes:
+        data = b''.join(self.parts)
+        self.parts = []
+        return data
+
+
+def _arrow_schema():
+    import pyarrow as pa
+
+    return pa.schema([
+        (field, pa.int64() if field == 'id' else pa.float64() if field in FLOAT_FIELDS else pa.string())
+        for field in EXPORT_FIELDS
+    ])
+
+
+def _arrow(chunks: Iterator[List[Tuple]], file_format: str) -> Iterator[bytes]:
+    """Parquet (one row group per chunk) or Arrow IPC stream (one record batch per chunk)"""
+    import pyarrow as pa
+
+    schema = _arrow_schema()
+    sink = _Drain()
+    if file_format == 'parquet':
+        import pyarrow.parquet as pq
+
+        writer = pq.ParquetWriter(pa.PythonFile(sink, mode='w'), schema, compression='zstd')
+    else:
+        writer = pa.ipc.new_stream(pa.PythonFile(sink, mode='w'), schema)
+
+    for rows in chunks:
+        columns = list(zip(*rows))
+        batch = pa.record_batch([pa.array(column, type=schema.field(i).type) for i, column in enumerate(columns)],
+                                schema=schema)
+        if file_format == 'parquet':
+            writer.write_table(pa.Table.from_batches([batch]))
+        else:
+            writer.write_batch(batch)
+        data = sink.drain()
+        if data:
+            yield data
+    writer.close()
+    yield sink.drain()
+
+
+def iter_export(file_format: str, chunk_size: int = EXPORT_CHUNK_SIZE, category: Optional[str] = None,
+                kind: str = 'stream', stats: Optional[Dict] = None) -> Iterator[bytes]:
+    """
+    Active events encoded in an export format, produced chunk by chunk (requires app context)
+
+    Memory stays bounded by chunk_size rows whatever the number of events,
+    so the result can be streamed as a response body or written to a file.
+    The number of exported events is stored in stats['events'] at the end.
+
+    Raises:
+        ValueError: For unknown formats, or Parquet/Arrow without pyarrow
+    """
+    if file_format not in FORMATS:
+        raise ValueError(f"format must be one of {', '.join(available_formats())}")
+    if file_format in ARROW_FORMATS and not pyarrow_available():
+        raise ValueError(f"{file_format} export requires pyarrow")
+
+    start = time.perf_counter()
+    exported = 0
+
+    def counted(chunks):
+        nonlocal exported
+        for rows in chunks:
+            exported += len(rows)
+            yield rows
+
+    chunks = counted(iter_event_chunks(chunk_size, category))
+    if file_format == 'ndjson':
+        body = _ndjson(chunks)
+    elif file_format == 'csv':
+        body = _csv(chunks)
+    else:
+        body = _arrow(chunks, file_format)
+
+    def generate():
+        yield from body
+        if stats is not None:
+            stats['events'] = exported
+        export_rows_total.inc(exported, format=file_format, kind=kind)
+        export_seconds.observe(time.perf_counter() - start, format=file_format, kind=kind)
+
+    return generate()
+
+
+def _write_file(path: str, parts: Iterator[bytes], compress: bool) -> Tuple[int, str]:
+    """Write parts to path atomically; returns size and SHA-256 of the file"""
+    directory = os.path.dirname(path)
+    digest = hashlib.sha256()
+    handle, temp_path = tempfile.mkstemp(dir=directory, prefix='.export-')
+    try:
+        with os.fdopen(handle, 'wb') as raw:
+            output = gzip.GzipFile(fileobj=raw, mode='wb', mtime=0) if compress else raw
+            for part in parts:
+                output.write(part)
+            if compress:
+                output.close()
+        with open(temp_path, 'rb') as written:
+            for block in iter(lambda: written.read(1024 * 1024), b''):
+                digest.update(block)
+        os.replace(temp_path, path)
+    except Exception:
+        os.unlink(temp_path)
+        raise
+    return os.path.getsize(path), digest.hexdigest()
+
+
+def write_export_files(directory: str = EXPORT_DIR, formats: Optional[Sequence[str]] = None) -> Dict:
+    """
+    Write the nightly export of the active events (requires app context)
+
+    Each format goes to its FORMATS file name (NDJSON and CSV gzipped),
+    replacing the previous file only once it is complete, so downloads
+    never see a partial export. A manifest.json lists the files with their
+    size, SHA-256 and event count.
+
+    Returns:
+        The manifest
+    """
+    os.makedirs(directory, exist_ok=True)
+    formats = formats or available_formats()
+    files = {}
+    for file_format in formats:
+        start = time.perf_counter()
+        name = FORMATS[file_format][1]
+        stats = {}
+        size, sha256 = _write_file(
+            os.path.join(directory, name),
+            iter_export(file_format, kind='file', stats=stats),
+            compress=name.endswith('.gz')
+        )
+        files[file_format] = {
+            'name': name,
+            'content_type': FORMATS[file_format][0],
+            'bytes': size,
+            'sha256': sha256,
+            'events': stats['events']
+        }
+        logger.info(f"Exported {files[file_format]['events']} events to {name} ({size} bytes) "
+                    f"in {time.perf_counter() - start:.1f}s")
+
+    manifest = {'generated_at': datetime.utcnow().isoformat(), 'files': files}
+    _write_file(os.path.join(directory, 'manifest.json'),
+                iter([json.dumps(manifest, indent=2).encode('utf-8')]), compress=False)
+    return manifest
+
+
+def read_manifest(directory: str = EXPORT_DIR) -> Optional[Dict]:
+    """Manifest of the last nightly export, None before the first one"""
+    try:
+        with open(os.path.join(directory, 'manifest.json'), encoding='utf-8') as manifest:
+            return json.load(manifest)
+    except FileNotFoundError:
+        return None
+
+
+def export_file_path(name: str, directory: str = EXPORT_DIR) -> Optional[str]:
+    """Path of a nightly export file by name; None for unknown names or missing files"""
+    if name not in {file_name for _, file_name in FORMATS.values()}:
+        return None
+    path = os.path.join(directory, name)
+    return path if os.path.isfile(path) else None
@@ -0,0 +1,370 @@
+"""
+Declarative extraction rules for the HTML scrapers
+
+Each source maps fields to an ordered list of rules: the first rule that
+finds something wins, later ones are fallbacks. A rule is plain data,
+
+    {'name': 'heading', 'tags': ['h2', 'h3'], 'class': 'title|name', 'attrs': {'href': '/e/'}}
+
+where `class` and the `attrs` values are case-insensitive regexes matched
+the way BeautifulSoup matches them. Date patterns are regexes whose groups
+are named in `groups` (day, month, month_name, year; others are ignored).
+
+Everything is compiled once at import. When sites change, rules can be
+tuned without code edits: EXTRACTION_RULES_FILE points to a JSON file with
+the same shape, whose fields replace the built-in ones per source.
+
+Every lookup is counted per rule, with its time, so rule_report() shows
+which fallbacks actually match (and which never do).
+"""
+import os
+import re
+import json
+import time
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# JSON file with rules replacing the built-in ones per source and field
+EXTRACTION_RULES_FILE = os.environ.get('EXTRACTION_RULES_FILE')
+
+# Guards the lookup counts of all rules
+_stats_lock = threading.Lock()
+
+MONTHS = {
+    'january': 1, 'jan': 1,
+    'february': 2, 'feb': 2,
+    'march': 3, 'mar': 3,
+    'april': 4, 'apr': 4,
+    'may': 5,
+    'june': 6, 'jun': 6,
+    'july': 7, 'jul': 7,
+    'august': 8, 'aug': 8,
+    'september': 9, 'sep': 9,
+    'october': 10, 'oct': 10,
+    'november': 11, 'nov': 11,
+    'december': 12, 'dec': 12
+}
+
+DEFAULT_RULES = {
+    'Eventbrite': {
+        'containers': [
+            {'name': 'card-class', 'tags': ['div', 'article'], 'class': 'event-card|search-event-card|event-item'},
+            {'name': 'data-testid', 'tags': ['div'], 'attrs': {'data-testid': 'event'}},
+            {'name': 'event-href', 'tags': ['div', 'article'], 'attrs': {'href': '/e/'}},
+        ],
+        'title': [
+            {'name': 'heading', 'tags': ['h1', 'h2', 'h3', 'h4'], 'class': 'title|name|heading'},
+            {'name': 'title-link', 'tags': ['a'], 'class': 'event-title|title'},
+            {'name': 'event-link', 'tags': ['a'], 'attrs': {'href': '/e/'}},
+        ],
+        'link': [
+            {'name': 'event-link', 'tags': ['a'], 'attrs': {'href': '/e/'}},
+        ],
+        'date': [
+            {'name': 'time-tag', 'tags': ['time']},
+            {'name': 'date-class', 'tags': ['div', 'span'], 'class': 'date|time'},
+        ],
+        'location': [
+            {'name': 'venue-class', 'tags': ['div', 'span'], 'class': 'location|venue|address'},
+        ],
+        'description': [
+            {'name': 'summary-class', 'tags': ['p', 'div'], 'class': 'description|summary|excerpt'},
+        ],
+        'image': [
+            {'name': 'img', 'tags': ['img']},
+        ],
+        'organizer': [
+            {'name': 'organizer-class', 'tags': ['div', 'span'], 'class': 'organizer|host|by'},
+        ],
+        'detail_description': [
+            {'name': 'about-class', 'tags': ['div'], 'class': 'description|about|summary'},
+        ],
+        'detail_location': [
+            {'name': 'venue-class', 'tags': ['div', 'span'], 'class': 'venue|location|address'},
+        ],
+        'date_patterns': [
+            {'name': 'weekday-month-day-year', 'pattern': r'(\w+),\s+(\w+)\s+(\d{1,2}),?\s+(\d{4})',
+             'groups': ['weekday', 'month_name', 'day', 'year']},  # Monday, July 15, 2025
+            {'name': 'month-day-year', 'pattern': r'(\w+)\s+(\d{1,2}),?\s+(\d{4})',
+             'groups': ['month_name', 'day', 'year']},  # July 15, 2025
+            {'name': 'day-month-year', 'pattern': r'(\d{1,2})\s+(\w+)\s+(\d{4})',
+             'groups': ['day', 'month_name', 'year']},  # 15 July 2025
+        ],
+        # Groups: hour, minute, AM/PM
+        'time_pattern': {'pattern': r'(\d{1,2}):(\d{2})\s*(AM|PM)?', 'ignore_case': True},
+    },
+    'I amsterdam': {
+        # Event containers on the calendar page - these selectors may need adjustment based on actual
+        # site structure. The streaming tokenizer only supports the first rule's tags and class.
+        'containers': [
+            {'name': 'card-class', 'tags': ['div', 'article'], 'class': 'event|card|item'},
+        ],
+        'title': [
+            {'name': 'heading', 'tags': ['h1', 'h2', 'h3', 'h4'], 'class': 'title|heading|name'},
+            {'name': 'event-link', 'tags': ['a'], 'attrs': {'href': '/event|/whats-on'}},
+        ],
+        'date': [
+            {'name': 'date-class', 'tags': ['time', 'div', 'span'], 'class': 'date|time'},
+        ],
+        'location': [
+            {'name': 'venue-class', 'tags': ['div', 'span', 'p'], 'class': 'location|venue|address'},
+        ],
+        'description': [
+            {'name': 'summary-class', 'tags': ['p', 'div'], 'class': 'description|summary|excerpt'},
+        ],
+        'image': [
+            {'name': 'img', 'tags': ['img']},
+        ],
+        'organizer': [
+            {'name': 'organizer-class', 'tags': ['div', 'span'], 'class': 'organizer|venue|host'},
+        ],
+        'date_patterns': [
+            {'name': 'day-month-year', 'pattern': r'(\d{1,2})\s+(\w+)\s+(\d{4})',
+             'groups': ['day', 'month_name', 'year']},  # 15 July 2025
+            {'name': 'month-day-year', 'pattern': r'(\w+)\s+(\d{1,2}),?\s+(\d{4})',
+             'groups': ['month_name', 'day', 'year']},  # July 15, 2025
+            {'name': 'day/month/year', 'pattern': r'(\d{1,2})/(\d{1,2})/(\d{4})',
+             'groups': ['day', 'month', 'year']},  # 15/07/2025
+            {'name': 'iso', 'pattern': r'(\d{4})-(\d{1,2})-(\d{1,2})',
+             'groups': ['year', 'month', 'day']},  # 2025-07-15
+        ],
+        # Groups: start hour, start minute, end hour, end minute
+        'time_pattern': {'pattern': r'(\d{1,2}):(\d{2})\s*(?:-\s*(\d{1,2}):(\d{2}))?'},
+    },
+}
+
+
+class RuleStats:
+    """
+    Lookups, hits and time of one rule in this process
+
+    Plain counters rather than labelled metrics: rules run several times
+    per event container, where a metric update per lookup would be a
+    noticeable share of the extraction time.
+    """
+
+    __slots__ = ('attempts', 'hits', 'seconds')
+
+    def __init__(self):
+        self.attempts = 0
+        self.hits = 0
+        self.seconds = 0.0
+
+    def record(self, hit: bool, seconds: float):
+        with _stats_lock:
+            self.attempts += 1
+            self.hits += hit
+            self.seconds += seconds
+
+    def merge(self, attempts: int, hits: int, seconds: float):
+        with _stats_lock:
+            self.attempts += attempts
+            self.hits += hits
+            self.seconds += seconds
+
+    def to_dict(self) -> Dict:
+        return {
+            'attempts': self.attempts,
+            'hits': self.hits,
+            'hit_rate': round(self.hits / self.attempts, 4) if self.attempts else None,
+            'mean_ms': round(self.seconds / self.attempts * 1000, 4) if self.attempts else None
+        }
+
+
+class Selector:
+    """One compiled element rule: tag names, class regex and attribute regexes"""
+
+    def __init__(self, name: str, tags: Optional[Sequence[str]] = None, class_: Optional[str] = None,
+                 attrs: Optional[Dict[str, str]] = None):
+        self.name = name
+        self.tag_names = list(tags or [])
+        # BeautifulSoup matches a single tag name as a string much faster than a one-element list
+        self.tags = (tags[0] if len(tags) == 1 else list(tags)) if tags else None
+        self.class_re = re.compile(class_, re.I) if class_ else None
+        self.attrs = {key: re.compile(value, re.I) for key, value in (attrs or {}).items()}
+        self.stats = RuleStats()
+
+    @classmethod
+    def from_rule(cls, rule: Dict) -> 'Selector':
+        return cls(rule['name'], rule.get('tags'), rule.get('class'), rule.get('attrs'))
+
+    def _kwargs(self) -> Dict:
+        kwargs = {}
+        if self.attrs:
+            kwargs['attrs'] = dict(self.attrs)
+        if self.class_re is not None:
+            kwargs['class_'] = self.class_re
+        return kwargs
+
+    def find(self, node):
+        return node.find(self.tags, **self._kwargs())
+
+    def find_all(self, node) -> List:
+        return node.find_all(self.tags, **self._kwargs())
+
+
+class FieldRules:
+    """Ordered fallback selectors for one field of one source"""
+
+    def __init__(self, source: str, field: str, selectors: List[Selector]):
+        self.source = source
+        self.field = field
+        self.selectors = selectors
+
+    def find(self, node):
+        """First element found by any rule, trying them in order; None if none matches"""
+        for selector in self.selectors:
+            start = time.perf_counter()
+            element = selector.find(node)
+            selector.stats.record(element is not None, time.perf_counter() - start)
+            if element is not None:
+                return element
+        return None
+
+    def find_all(self, node) -> List:
+        """Elements found by the first rule that finds any"""
+        for selector in self.selectors:
+            start = time.perf_counter()
+            elements = selector.find_all(node)
+            selector.stats.record(bool(elements), time.perf_counter() - start)
+            if elements:
+                return elements
+        return []
+
+
+class DatePatterns:
+    """Ordered date regexes of one source, tried until one yields a valid date"""
+
+    def __init__(self, source: str, rules: List[Dict]):
+        self.source = source
+        self.patterns = [(rule['name'], re.compile(rule['pattern'], re.I if rule.get('ignore_case') else 0),
+                          rule['groups'], RuleStats()) for rule in rules]
+
+    def parse(self, text: str) -> Optional[datetime]:
+        """Date of the first pattern that matches text with a valid date; unknown month names are January"""
+        for _, pattern, groups, stats in self.patterns:
+            start = time.perf_counter()
+            match = pattern.search(text)
+            date_obj = None
+            if match:
+                values = dict(zip(groups, match.groups()))
+                try:
+                    month = values.get('month') or MONTHS.get(values.get('month_name', '').lower(), 1)
+                    date_obj = datetime(int(values['year']), int(month), int(values['day']))
+                except ValueError:
+                    pass
+            stats.record(date_obj is not None, time.perf_counter() - start)
+            if date_obj is not None:
+                return date_obj
+        return None
+
+
+class SourceRules:
+    """Compiled rules of one source; fields are attributes (rules.title.find(container))"""
+
+    def __init__(self, source: str, rules: Dict):
+        self.source = source
+        self.fields: Dict[str, FieldRules] = {}
+        self.date_patterns = DatePatterns(source, [])
+        self.time_pattern = None
+        for field, value in rules.items():
+            if field == 'date_patterns':
+                self.date_patterns = DatePatterns(source, value)
+            elif field == 'time_pattern':
+                self.time_pattern = re.compile(value['pattern'], re.I if value.get('ignore_case') else 0)
+            else:
+                self.fields[field] = FieldRules(source, field, [Selector.from_rule(rule) for rule in value])
+
+    def __getattr__(self, field: str) -> FieldRules:
+        try:
+            return self.__dict__['fields'][field]
+        except KeyError:
+            raise AttributeError(f"No extraction rules for {field!r} of {self.__dict__.get('source')}")
+
+
+def _load_overrides(path: Optional[str]) -> Dict:
+    if not path:
+        return {}
+    try:
+        with open(path, encoding='utf-8') as rules_file:
+            overrides = json.load(rules_file)
+        logger.info(f"Loaded extraction rules for {', '.join(overrides)} from {path}")
+        return overrides
+    except (OSError, ValueError) as e:
+        logger.error(f"Error loading extraction rules from {path}, using the built-in rules: {str(e)}")
+        return {}
+
+
+def compile_rules(overrides: Optional[Dict] = None) -> Dict[str, SourceRules]:
+    """Compile the built-in rules with fields replaced by overrides ({source: {field: rules}})"""
+    overrides = overrides or {}
+    compiled = {}
+    for source in set(DEFAULT_RULES) | set(overrides):
+        rules = dict(DEFAULT_RULES.get(source, {}), **overrides.get(source, {}))
+        compiled[source] = SourceRules(source, rules)
+    return compiled
+
+
+try:
+    RULES = compile_rules(_load_overrides(EXTRACTION_RULES_FILE))
+except (KeyError, TypeError, re.error) as e:
+    logger.error(f"Invalid extraction rules in {EXTRACTION_RULES_FILE}, using the built-in rules: {str(e)}")
+    RULES = compile_rules()
+
+
+def rules_for(source: str) -> SourceRules:
+    """Compiled rules of a source (e.g. 'Eventbrite', 'I amsterdam')"""
+    return RULES[source]
+
+
+def rule_report() -> Dict:
+    """
+    Per source, field and rule: lookups, hit rate and mean time in ms (this process)
+
+    Rules are listed in fallback order; a fallback with no lookups was
+    never needed, one with lookups but no hits never matches.
+    """
+    report = {}
+    for source, source_rules in sorted(RULES.items()):
+        report[source] = {
+            field: [dict(rule=selector.name, **selector.stats.to_dict()) for selector in field_rules.selectors]
+            for field, field_rules in source_rules.fields.items()
+        }
+        report[source]['date_pattern'] = [
+            dict(rule=name, **stats.to_dict()) for name, _, _, stats in source_rules.date_patterns.patterns
+        ]
+    return report
+
+
+def _all_stats():
+    """(key, RuleStats) of every rule; keys match across processes with the same rules"""
+    for source, source_rules in RULES.items():
+        for field, field_rules in source_rules.fields.items():
+            for index, selector in enumerate(field_rules.selectors):
+                yield (source, field, index), selector.stats
+        for index, (_, _, _, stats) in enumerate(source_rules.date_patterns.patterns):
+            yield (source, 'date_pattern', index), stats
+
+
+def reset_rule_stats():
+    """Zero the lookup counts of all rules"""
+    with _stats_lock:
+        for _, stats in _all_stats():
+            stats.__init__()
+
+
+def rule_stats_snapshot() -> Dict:
+    """Lookup counts of the rules used so far, to be merged into another process"""
+    with _stats_lock:
+        return {key: (stats.attempts, stats.hits, stats.seconds) for key, stats in _all_stats() if stats.attempts}
+
+
+def merge_rule_stats(snapshot: Dict):
+    """Add lookup counts from rule_stats_snapshot() of another process (e.g. a parse worker)"""
+    for key, stats in _all_stats():
+        if key in snapshot:
+            stats.merge(*snapshot[key])
@@ -0,0 +1,49 @@
+import math
+from typing import List, Optional, Tuple
+
+# Grid cells of 0.01 x 0.01 degrees (about 1.1 x 0.7 km in Amsterdam). A cell
+# id encodes its row (latitude) and column (longitude) so that the cells of
+# one row are consecutive integers and a bounding box becomes one BETWEEN
+# range per row on the indexed geo_cell column.
+CELL_DEGREES = 0.01
+_ROW_WIDTH = 100000
+_LAT_OFFSET = 9000
+_LON_OFFSET = 18000
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE_LAT = 111.32
+
+
+def _row(lat: float) -> int:
+    return math.floor(lat / CELL_DEGREES) + _LAT_OFFSET
+
+
+def _column(lon: float) -> int:
+    return math.floor(lon / CELL_DEGREES) + _LON_OFFSET
+
+
+def cell_for(lat: Optional[float], lon: Optional[float]) -> Optional[int]:
+    """Grid cell id of a coordinate; None without coordinates"""
+    if lat is None or lon is None:
+        return None
+    return _row(lat) * _ROW_WIDTH + _column(lon)
+
+
+def cell_ranges(lat: float, lon: float, radius_km: float) -> List[Tuple[int, int]]:
+    """Inclusive geo_cell ranges (one per grid row) covering a circle's bounding box"""
+    delta_lat = radius_km / KM_PER_DEGREE_LAT
+    delta_lon = radius_km / (KM_PER_DEGREE_LAT * max(math.cos(math.radians(lat)), 0.01))
+    first_column = _column(lon - delta_lon)
+    last_column = _column(lon + delta_lon)
+    return [
+        (row * _ROW_WIDTH + first_column, row * _ROW_WIDTH + last_column)
+        for row in range(_row(lat - delta_lat), _row(lat + delta_lat) + 1)
+    ]
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two coordinates in kilometres"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
@@ -0,0 +1,62 @@
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional, Tuple
+from src.models.event import db
+
+
+class GeocodeCache(db.Model):
+    """Resolved coordinates per normalized address, so each address is geocoded once"""
+
+    __tablename__ = 'geocode_cache'
+
+    id = db.Column(db.Integer, primary_key=True)
+    address_key = db.Column(db.String(500), nullable=False, unique=True)
+    latitude = db.Column(db.Float)  # NULL when the address could not be resolved
+    longitude = db.Column(db.Float)
+    provider = db.Column(db.String(20))  # 'gazetteer', 'http' or 'none'
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    # Unresolved addresses are retried after this many days
+    MISS_TTL_DAYS = 7
+
+    def __repr__(self):
+        return f'<GeocodeCache {self.address_key}>'
+
+    @classmethod
+    def lookup(cls, address_keys: Iterable[str]) -> Dict[str, Optional[Tuple[float, float]]]:
+        """
+        Cached results for normalized addresses, in one query
+
+        Returns:
+            Coordinates (or None for known misses) per cached address;
+            addresses that are not cached or whose miss expired are left out
+        """
+        address_keys = list(set(address_keys))
+        if not address_keys:
+            return {}
+
+        miss_expiry = datetime.utcnow() - timedelta(days=cls.MISS_TTL_DAYS)
+        results = {}
+        for address_key, latitude, longitude, created_at in db.session.query(
+                cls.address_key, cls.latitude, cls.longitude, cls.created_at).filter(cls.address_key.in_(address_keys)):
+            if latitude is not None and longitude is not None:
+                results[address_key] = (latitude, longitude)
+            elif created_at and created_at > miss_expiry:
+                results[address_key] = None
+        return results
+
+    @classmethod
+    def store(cls, results: Dict[str, Tuple[Optional[Tuple[float, float]], str]]):
+        """Insert or replace results given as {address_key: (coordinates or None, provider)}"""
+        if not results:
+            return
+        existing = {
+            row.address_key: row
+            for row in db.session.query(cls).filter(cls.address_key.in_(list(results)))
+        }
+        now = datetime.utcnow()
+        for address_key, (coordinates, provider) in results.items():
+            row = existing.get(address_key) or cls(address_key=address_key)
+            row.latitude, row.longitude = coordinates if coordinates else (None, None)
+            row.provider = provider
+            row.created_at = now
+            db.session.add(row)
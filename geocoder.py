@@ -0,0 +1,222 @@
+import os
+import re
+import logging
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Optional Nominatim-compatible search endpoint (e.g. a local stand-in) used
+# for addresses the gazetteer does not know; unset keeps geocoding offline
+GEOCODER_URL = os.environ.get('GEOCODER_URL')
+# GEOCODER_URL requests per written batch; further addresses are left for the next run
+GEOCODER_MAX_REQUESTS = int(os.environ.get('GEOCODER_MAX_REQUESTS', 5))
+# Seconds a GEOCODER_URL request may take
+GEOCODER_TIMEOUT = 5
+
+# Offline gazetteer of Amsterdam venues and districts (approximate centroids)
+GAZETTEER: Dict[str, Tuple[float, float]] = {
+    # Venues
+    'afas live': (52.3124, 4.9446),
+    'amsterdam rai': (52.3406, 4.8886),
+    'amsterdamse bos': (52.3170, 4.8430),
+    'anne frank house': (52.3752, 4.8840),
+    'artis': (52.3660, 4.9166),
+    'bimhuis': (52.3786, 4.9126),
+    'carre': (52.3622, 4.9043),
+    'centraal station': (52.3791, 4.9003),
+    'concertgebouw': (52.3563, 4.8791),
+    'dam square': (52.3731, 4.8926),
+    'de balie': (52.3633, 4.8834),
+    'de hallen': (52.3667, 4.8694),
+    'eye filmmuseum': (52.3844, 4.9008),
+    'felix meritis': (52.3720, 4.8842),
+    'foodhallen': (52.3667, 4.8694),
+    'hortus botanicus': (52.3667, 4.9083),
+    'johan cruijff arena': (52.3144, 4.9419),
+    'leidseplein': (52.3641, 4.8828),
+    'melkweg': (52.3647, 4.8811),
+    'muziekgebouw': (52.3786, 4.9130),
+    'museumplein': (52.3573, 4.8820),
+    'ndsm': (52.4010, 4.8918),
+    'nemo': (52.3741, 4.9124),
+    'nieuwe kerk': (52.3742, 4.8913),
+    'nieuwmarkt': (52.3725, 4.9006),
+    'oba oosterdok': (52.3756, 4.9082),
+    'oosterpark': (52.3600, 4.9197),
+    'oude kerk': (52.3744, 4.8980),
+    'pakhuis de zwijger': (52.3766, 4.9213),
+    'paradiso': (52.3622, 4.8838),
+    'pllek': (52.4010, 4.8932),
+    'rembrandthuis': (52.3694, 4.9012),
+    'rembrandtplein': (52.3662, 4.8966),
+    'rijksmuseum': (52.3600, 4.8852),
+    'royal palace': (52.3731, 4.8913),
+    'sarphatipark': (52.3546, 4.8960),
+    'scheepvaartmuseum': (52.3717, 4.9150),
+    'stadsschouwburg': (52.3640, 4.8825),
+    'stedelijk museum': (52.3580, 4.8799),
+    'tolhuistuin': (52.3844, 4.9025),
+    'van gogh museum': (52.3584, 4.8811),
+    'vondelpark': (52.3580, 4.8686),
+    'vrije universiteit': (52.3340, 4.8660),
+    'waterlooplein': (52.3677, 4.9020),
+    'westergas': (52.3858, 4.8754),
+    'westerkerk': (52.3745, 4.8836),
+    'westerpark': (52.3863, 4.8780),
+    'ziggo dome': (52.3138, 4.9375),
+    'zoku amsterdam': (52.3630, 4.9065),
+    # Districts and neighbourhoods
+    'amsterdam centrum': (52.3728, 4.8936),
+    'amsterdam noord': (52.3906, 4.9200),
+    'amsterdam oost': (52.3590, 4.9300),
+    'amsterdam west': (52.3700, 4.8500),
+    'amsterdam zuid': (52.3470, 4.8640),
+    'amsterdam zuidoost': (52.3080, 4.9720),
+    'amsterdam nieuw-west': (52.3600, 4.8030),
+    'bijlmer': (52.3180, 4.9560),
+    'de pijp': (52.3533, 4.8935),
+    'jordaan': (52.3745, 4.8810),
+    'zuidas': (52.3388, 4.8730),
+}
+
+MAX_KEY_LENGTH = 500
+
+
+def normalize_address(text: str) -> str:
+    """Lowercase, accent-free, whitespace-collapsed form used as cache key and for matching"""
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    text = re.sub(r'\s+', ' ', text.lower()).strip(' ,')
+    return text[:MAX_KEY_LENGTH]
+
+
+def event_address(event: Dict) -> str:
+    """Normalized venue and address of a scraped event"""
+    parts = [event.get('location') or '', event.get('address') or '']
+    return normalize_address(', '.join(part for part in parts if part))
+
+
+class Geocoder:
+    """
+    Resolves event addresses to coordinates, each address once
+
+    Lookups go to the persistent GeocodeCache first. Unknown addresses are
+    matched against the offline gazetteer (leftmost known venue or district
+    name), then against GEOCODER_URL when configured. Misses are cached too
+    and retried after GeocodeCache.MISS_TTL_DAYS; addresses whose request
+    was skipped or failed are not cached and are tried again next run.
+    """
+
+    def __init__(self, gazetteer: Dict[str, Tuple[float, float]] = GAZETTEER, url: Optional[str] = GEOCODER_URL,
+                 max_requests: int = GEOCODER_MAX_REQUESTS):
+        self.gazetteer = {normalize_address(name): coordinates for name, coordinates in gazetteer.items()}
+        names = sorted(self.gazetteer, key=len, reverse=True)
+        self._pattern = re.compile(r'\b(' + '|'.join(re.escape(name) for name in names) + r')\b')
+        self.url = url
+        self.max_requests = max_requests
+        self._session = None
+
+    def resolve(self, address_key: str, timeout: float = GEOCODER_TIMEOUT) -> Tuple[Optional[Tuple[float, float]], str]:
+        """
+        Coordinates and provider for a normalized address, without the cache
+
+        Raises:
+            requests.RequestException: When the GEOCODER_URL request fails
+        """
+        coordinates = self._resolve_offline(address_key)
+        if coordinates:
+            return coordinates, 'gazetteer'
+        if self.url:
+            coordinates = self._resolve_http(address_key, timeout)
+            if coordinates:
+                return coordinates, 'http'
+        return None, 'none'
+
+    def _resolve_offline(self, address_key: str) -> Optional[Tuple[float, float]]:
+        match = self._pattern.search(address_key)
+        return self.gazetteer[match.group(1)] if match else None
+
+    def _resolve_http(self, address_key: str, timeout: float) -> Optional[Tuple[float, float]]:
+        import requests
+
+        if self._session is None:
+            self._session = requests.Session()
+            self._session.headers.update({'User-Agent': 'AmsterdamEvents/1.0'})
+        response = self._session.get(self.url, params={'q': address_key, 'format': 'json', 'limit': 1}, timeout=timeout)
+        response.raise_for_status()
+        results = response.json()
+        if results:
+            return float(results[0]['lat']), float(results[0]['lon'])
+        return None
+
+    def geocode_events(self, events: Iterable[Dict], cancel_token=None) -> int:
+        """
+        Set latitude/longitude on events that have none, with one cache query per call
+
+        Must run inside an app context; new results are added to the session
+        and committed with the events. At most max_requests addresses go to
+        GEOCODER_URL per call, none once cancel_token is cancelled, and each
+        request is bounded by its remaining time, so a slow geocoder cannot
+        stall the writer. Skipped addresses stay without coordinates until
+        a later run.
+
+        Returns:
+            Number of events that received coordinates
+        """
+        from src.models.geocode_cache import GeocodeCache
+
+        pending: List[Tuple[Dict, str]] = [
+            (event, event_address(event)) for event in events
+            if event.get('latitude') is None or event.get('longitude') is None
+        ]
+        pending = [(event, key) for event, key in pending if key]
+        if not pending:
+            return 0
+
+        known = GeocodeCache.lookup(key for _, key in pending)
+        resolved = {}
+        skipped = set()
+        requests_made = 0
+        for _, key in pending:
+            if key in known or key in resolved or key in skipped:
+                continue
+            coordinates = self._resolve_offline(key)
+            if coordinates or not self.url:
+                resolved[key] = (coordinates, 'gazetteer' if coordinates else 'none')
+                continue
+            if requests_made >= self.max_requests or (cancel_token is not None and cancel_token.cancelled):
+                skipped.add(key)
+                continue
+            requests_made += 1
+            timeout = cancel_token.timeout(GEOCODER_TIMEOUT) if cancel_token is not None else GEOCODER_TIMEOUT
+            try:
+                coordinates = self._resolve_http(key, timeout)
+            except Exception as e:
+                skipped.add(key)
+                logger.warning(f"Geocoding '{key}' failed: {str(e)}")
+                continue
+            resolved[key] = (coordinates, 'http' if coordinates else 'none')
+        if skipped:
+            logger.info(f"Left {len(skipped)} addresses to geocode in a later run")
+        GeocodeCache.store(resolved)
+        known.update({key: coordinates for key, (coordinates, _) in resolved.items()})
+
+        located = 0
+        for event, key in pending:
+            coordinates = known.get(key)
+            if coordinates:
+                event['latitude'], event['longitude'] = coordinates
+                located += 1
+        return located
+
+
+_geocoder: Optional[Geocoder] = None
+
+
+def get_geocoder() -> Geocoder:
+    """Process-wide geocoder configured from GEOCODER_URL"""
+    global _geocoder
+    if _geocoder is None:
+        _geocoder = Geocoder()
+    return _geocoder
@@ -0,0 +1,154 @@
+import codecs
+import logging
+from html.parser import HTMLParser
+from typing import Dict, Iterable, Iterator, List, Optional, Pattern, Sequence, Union
+
+logger = logging.getLogger(__name__)
+
+# Containers larger than this (in characters) are page wrappers, not events, and are dropped;
+# the document tree path of a scraper must skip them too (see is_oversized)
+MAX_CONTAINER_CHARS = 256 * 1024
+# Slices fed to the tokenizer when the whole page is already in memory
+FEED_CHUNK_BYTES = 64 * 1024
+
+
+class ContainerTokenizer(HTMLParser):
+    """
+    Incremental tokenizer that cuts matching elements out of an HTML stream
+
+    Every element whose tag is in `tags` and whose class attribute matches
+    `class_pattern` is captured as its own HTML snippet, from its start tag
+    to the matching end tag, including nested matches (which are captured
+    separately as well). Snippets are released in document order of their
+    start tags, the order BeautifulSoup's find_all returns them in. Only
+    the open captures are kept in memory, each bounded by max_chars.
+    """
+
+    def __init__(self, tags: Sequence[str], class_pattern: Pattern, max_chars: int = MAX_CONTAINER_CHARS):
+        super().__init__(convert_charrefs=False)
+        self.tags = set(tags)
+        self.class_pattern = class_pattern
+        self.max_chars = max_chars
+        self.dropped = 0
+        # Open captures, outermost first
+        self._open: List[Dict] = []
+        # Finished snippets by sequence number; None for dropped captures
+        self._finished: Dict[int, Optional[str]] = {}
+        self._next_sequence = 0
+        self._release_sequence = 0
+
+    def _append(self, text: str):
+        for capture in list(self._open):
+            capture['parts'].append(text)
+            capture['size'] += len(text)
+            if capture['size'] > self.max_chars:
+                self._open.remove(capture)
+                self._finished[capture['sequence']] = None
+                self.dropped += 1
+
+    def handle_starttag(self, tag, attrs):
+        self._append(self.get_starttag_text())
+        for capture in self._open:
+            if capture['tag'] == tag:
+                capture['depth'] += 1
+        if tag in self.tags and self.class_pattern.search(dict(attrs).get('class') or ''):
+            text = self.get_starttag_text()
+            self._open.append({'sequence': self._next_sequence, 'tag': tag, 'depth': 1,
+                               'parts': [text], 'size': len(text)})
+            self._next_sequence += 1
+
+    def handle_startendtag(self, tag, attrs):
+        # <div class="item"/> is an empty element, as in BeautifulSoup; its text is the start tag alone
+        self.handle_starttag(tag, attrs)
+        self._close(tag)
+
+    def handle_endtag(self, tag):
+        self._append(f'</{tag}>')
+        self._close(tag)
+
+    def _close(self, tag: str):
+        for capture in list(self._open):
+            if capture['tag'] == tag:
+                capture['depth'] -= 1
+                if capture['depth'] == 0:
+                    self._finish(capture)
+
+    def handle_data(self, data):
+        if self._open:
+            self._append(data)
+
+    def handle_entityref(self, name):
+        if self._open:
+            self._append(f'&{name};')
+
+    def handle_charref(self, name):
+        if self._open:
+            self._append(f'&#{name};')
+
+    def _finish(self, capture: Dict):
+        self._open.remove(capture)
+        self._finished[capture['sequence']] = ''.join(capture['parts'])
+
+    def close(self):
+        super().close()
+        # Unclosed elements end with the document
+        for capture in list(self._open):
+            self._finish(capture)
+
+    def released(self) -> Iterator[Optional[str]]:
+        """Finished snippets whose predecessors have all been released; None for dropped ones"""
+        while self._release_sequence in self._finished:
+            snippet = self._finished.pop(self._release_sequence)
+            self._release_sequence += 1
+            yield snippet
+
+
+def is_oversized(container, max_chars: int = MAX_CONTAINER_CHARS) -> bool:
+    """Whether a parsed container element exceeds the limit the tokenizer drops containers at"""
+    return len(str(container)) > max_chars
+
+
+def _chunks(content: Union[bytes, Iterable[bytes]]) -> Iterator[bytes]:
+    if isinstance(content, (bytes, bytearray)):
+        view = memoryview(content)
+        for start in range(0, len(view), FEED_CHUNK_BYTES):
+            yield bytes(view[start:start + FEED_CHUNK_BYTES])
+    else:
+        yield from content
+
+
+def iter_containers(content: Union[bytes, Iterable[bytes]],
+                    tags: Sequence[str],
+                    class_pattern: Pattern,
+                    max_chars: int = MAX_CONTAINER_CHARS,
+                    encoding: str = 'utf-8') -> Iterator[Optional[str]]:
+    """
+    Yield the HTML of each matching container as the page is read
+
+    Args:
+        content: Page bytes, or an iterable of byte chunks (e.g. a streamed
+            response); it is closed when the caller stops early
+        tags: Tag names of containers
+        class_pattern: Regex searched in the class attribute
+        max_chars: Drop containers larger than this
+        encoding: Page encoding
+
+    Yields:
+        HTML snippets, one per container, in document order; None in place
+        of a dropped container, so callers can still count it
+    """
+    tokenizer = ContainerTokenizer(tags, class_pattern, max_chars)
+    decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+    try:
+        for chunk in _chunks(content):
+            tokenizer.feed(decoder.decode(chunk))
+            yield from tokenizer.released()
+        tokenizer.feed(decoder.decode(b'', final=True))
+        tokenizer.close()
+        yield from tokenizer.released()
+    finally:
+        close = getattr(content, 'close', None)
+        if close is not None:
+            close()
+        if tokenizer.dropped:
+            logger.info(f"Dropped {tokenizer.dropped} containers larger than {max_chars} characters")
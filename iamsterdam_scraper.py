@@ -1,22 +1,37 @@
 import requests
 from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
-import re
 import logging
-from typing import List, Dict, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+from src.instrumentation import instrument_session, iter_response_chunks, stage_timer
+from src.scrapers.extraction_rules import rules_for
+from src.scrapers.html_stream import iter_containers, is_oversized
 
 logger = logging.getLogger(__name__)
 
+# Selectors and date patterns, compiled once (see src/scrapers/extraction_rules.py)
+RULES = rules_for('I amsterdam')
+# Event containers on the calendar page, as cut out by the streaming tokenizer
+CONTAINER_TAGS = RULES.containers.selectors[0].tag_names
+CONTAINER_CLASS_RE = RULES.containers.selectors[0].class_re
+# Bytes read per chunk when streaming the calendar page
+STREAM_CHUNK_SIZE = 64 * 1024
+
 class IAmsterdamScraper:
     """Scraper for I amsterdam events website"""
     
-    def __init__(self):
+    def __init__(self, stream_listing: bool = True):
         self.base_url = "https://www.iamsterdam.com"
         self.events_url = "https://www.iamsterdam.com/en/whats-on/calendar"
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
+        instrument_session(self.session, 'I amsterdam')
+        # Optional CancellationToken bounding request timeouts
+        self.cancel_token = None
+        # Parse the calendar one container at a time instead of as one document tree
+        self.stream_listing = stream_listing
     
     def scrape_events(self, max_events: int = 50) -> List[Dict]:
         """
@@ -31,44 +46,157 @@ class IAmsterdamScraper:
         events = []
         
         try:
-            # Get the main events page
-            response = self.session.get(self.events_url, timeout=30)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Look for event containers - these selectors may need adjustment based on actual site structure
-            event_containers = soup.find_all(['div', 'article'], class_=re.compile(r'event|card|item', re.I))
-            
-            logger.info(f"Found {len(event_containers)} potential event containers")
-            
-            for container in event_containers[:max_events]:
-                event = self._extract_event_data(container)
-                if event and self._is_free_or_low_cost(event):
-                    events.append(event)
-            
-            # Try to get more events from pagination or AJAX if available
-            events.extend(self._scrape_additional_pages(max_events - len(events)))
+            events.extend(self.iter_events(max_events))
             
         except Exception as e:
             logger.error(f"Error scraping I amsterdam events: {str(e)}")
         
         return events[:max_events]
     
+    def iter_events(self, max_events: int = 50) -> Iterator[Dict]:
+        """
+        Yield events as soon as they are extracted
+        
+        Args:
+            max_events: Maximum number of events to yield
+        """
+        listing = self.fetch_listing_stream() if self.stream_listing else self.fetch_listing()
+        count = 0
+        for event in self.iter_listing(listing, max_events):
+            count += 1
+            yield event
+        
+        # Try to get more events from pagination or AJAX if available
+        yield from self._scrape_additional_pages(max_events - count)
+    
+    def _timeout(self, default: float) -> float:
+        """Request timeout, shortened to the remaining time of the cancel token"""
+        if self.cancel_token is not None:
+            return self.cancel_token.timeout(default)
+        return default
+    
+    def fetch_listing(self) -> bytes:
+        """Fetch the raw calendar page"""
+        with stage_timer('I amsterdam', 'fetch'):
+            response = self.session.get(self.events_url, timeout=self._timeout(30))
+            response.raise_for_status()
+        return response.content
+    
+    def fetch_listing_stream(self) -> Iterator[bytes]:
+        """Fetch the raw calendar page as chunks, without holding the whole body"""
+        with stage_timer('I amsterdam', 'fetch'):
+            response = self.session.get(self.events_url, timeout=self._timeout(30), stream=True)
+            response.raise_for_status()
+        try:
+            yield from iter_response_chunks(response, 'I amsterdam', STREAM_CHUNK_SIZE)
+        finally:
+            response.close()
+    
+    def parse_listing(self, content: bytes, max_events: int = 50) -> List[Dict]:
+        """
+        Extract events from a raw calendar page
+        
+        Args:
+            content: Page HTML
+            max_events: Maximum number of containers to extract
+            
+        Returns:
+            List of event dictionaries
+        """
+        return list(self.iter_listing(content, max_events))
+    
+    def iter_listing(self, content: Union[bytes, Iterable[bytes]], max_events: int = 50) -> Iterator[Dict]:
+        """
+        Yield events from a raw calendar page one container at a time
+        
+        Args:
+            content: Page HTML, or its chunks as they are downloaded
+            max_events: Maximum number of containers to extract
+        """
+        if self.stream_listing:
+            yield from self._iter_streamed_listing(content, max_events)
+            return
+        
+        if not isinstance(content, bytes):
+            content = b''.join(content)
+        with stage_timer('I amsterdam', 'parse'):
+            soup = BeautifulSoup(content, 'html.parser')
+        
+        event_containers = RULES.containers.find_all(soup)
+        
+        logger.info(f"Found {len(event_containers)} potential event containers")
+        
+        dropped = 0
+        for container in event_containers[:max_events]:
+            # Page wrappers are skipped but still count, as in the streamed path
+            if is_oversized(container):
+                dropped += 1
+                continue
+            with stage_timer('I amsterdam', 'extract'):
+                event = self._extract_event_data(container)
+            if event and self._is_free_or_low_cost(event):
+                yield event
+        if dropped:
+            logger.info(f"Dropped {dropped} oversized containers")
+    
+    def _iter_streamed_listing(self, content: Union[bytes, Iterable[bytes]], max_events: int) -> Iterator[Dict]:
+        """
+        Same containers and events as the document tree, built per container
+        
+        Only the current container is parsed into a tree, so memory stays
+        flat however large the page is.
+        """
+        for snippet in self.iter_listing_containers(content, max_events):
+            event = self.parse_container(snippet)
+            if event:
+                yield event
+    
+    def iter_listing_containers(self, content: Union[bytes, Iterable[bytes]], max_events: int = 50) -> Iterator[str]:
+        """
+        Yield the HTML of up to max_events event containers as the page is read
+        
+        A streamed page is read as the containers are consumed, so 'parse'
+        includes reading its body. Each snippet is parsed on its own by
+        parse_container, in this process or in a parse worker. Oversized
+        containers are not yielded but count toward max_events, as they do
+        when the page is parsed as a whole.
+        """
+        containers = iter_containers(content, CONTAINER_TAGS, CONTAINER_CLASS_RE)
+        count = 0
+        try:
+            while count < max_events:
+                with stage_timer('I amsterdam', 'parse'):
+                    snippet = next(containers, StopIteration)
+                if snippet is StopIteration:
+                    break
+                count += 1
+                if snippet is not None:
+                    yield snippet
+        finally:
+            containers.close()
+            logger.info(f"Parsed {count} potential event containers")
+    
+    def parse_container(self, snippet: str) -> Optional[Dict]:
+        """Event of one container snippet; None when it has none or it is not free or low cost"""
+        with stage_timer('I amsterdam', 'parse'):
+            container = BeautifulSoup(snippet, 'html.parser').find(CONTAINER_TAGS)
+        with stage_timer('I amsterdam', 'extract'):
+            event = self._extract_event_data(container)
+        if event and self._is_free_or_low_cost(event):
+            return event
+        return None
+    
     def _extract_event_data(self, container) -> Optional[Dict]:
         """Extract event data from a container element"""
         try:
             event = {
                 'source': 'I amsterdam',
                 'cost': 'Free',  # We're focusing on free events
-                'category': 'Art & Culture',  # Default category
-                'image': 'https://via.placeholder.com/400x250'
+                'category': 'Art & Culture'  # Default category
             }
             
             # Extract title
-            title_elem = container.find(['h1', 'h2', 'h3', 'h4'], class_=re.compile(r'title|heading|name', re.I))
-            if not title_elem:
-                title_elem = container.find(['a'], href=re.compile(r'/event|/whats-on', re.I))
+            title_elem = RULES.title.find(container)
             
             if title_elem:
                 event['title'] = title_elem.get_text(strip=True)
@@ -76,7 +204,7 @@ class IAmsterdamScraper:
                 return None
             
             # Extract date and time
-            date_elem = container.find(['time', 'div', 'span'], class_=re.compile(r'date|time', re.I))
+            date_elem = RULES.date.find(container)
             if date_elem:
                 date_text = date_elem.get_text(strip=True)
                 parsed_date = self._parse_date(date_text)
@@ -85,18 +213,18 @@ class IAmsterdamScraper:
                     event['time'] = parsed_date['time']
             
             # Extract location
-            location_elem = container.find(['div', 'span', 'p'], class_=re.compile(r'location|venue|address', re.I))
+            location_elem = RULES.location.find(container)
             if location_elem:
                 event['location'] = location_elem.get_text(strip=True)
                 event['address'] = event['location'] + ', Amsterdam'
             
             # Extract description
-            desc_elem = container.find(['p', 'div'], class_=re.compile(r'description|summary|excerpt', re.I))
+            desc_elem = RULES.description.find(container)
             if desc_elem:
                 event['description'] = desc_elem.get_text(strip=True)[:300] + '...'
             
             # Extract image
-            img_elem = container.find('img')
+            img_elem = RULES.image.find(container)
             if img_elem and img_elem.get('src'):
                 img_src = img_elem.get('src')
                 if img_src.startswith('/'):
@@ -104,14 +232,15 @@ class IAmsterdamScraper:
                 event['image'] = img_src
             
             # Extract organizer (try to find from various elements)
-            organizer_elem = container.find(['div', 'span'], class_=re.compile(r'organizer|venue|host', re.I))
+            organizer_elem = RULES.organizer.find(container)
             if organizer_elem:
                 event['organizer'] = organizer_elem.get_text(strip=True)
             else:
                 event['organizer'] = 'I amsterdam'
             
             # Determine category based on title and description
-            event['category'] = self._determine_category(event.get('title', ''), event.get('description', ''))
+            with stage_timer('I amsterdam', 'categorize'):
+                event['category'] = self._determine_category(event.get('title', ''), event.get('description', ''))
             
             return event
             
@@ -122,19 +251,8 @@ class IAmsterdamScraper:
     def _parse_date(self, date_text: str) -> Optional[Dict]:
         """Parse date text into structured format"""
         try:
-            # Common date patterns
-            patterns = [
-                r'(\d{1,2})\s+(\w+)\s+(\d{4})',  # 15 July 2025
-                r'(\w+)\s+(\d{1,2}),?\s+(\d{4})',  # July 15, 2025
-                r'(\d{1,2})/(\d{1,2})/(\d{4})',  # 15/07/2025
-                r'(\d{4})-(\d{1,2})-(\d{1,2})',  # 2025-07-15
-            ]
-            
-            # Time patterns
-            time_pattern = r'(\d{1,2}):(\d{2})\s*(?:-\s*(\d{1,2}):(\d{2}))?'
-            
             # Try to extract time
-            time_match = re.search(time_pattern, date_text)
+            time_match = RULES.time_pattern.search(date_text)
             time_str = "All day"
             if time_match:
                 start_hour, start_min = time_match.groups()[:2]
@@ -145,33 +263,12 @@ class IAmsterdamScraper:
                     time_str = f"{start_hour}:{start_min}"
             
             # Try to extract date
-            for pattern in patterns:
-                match = re.search(pattern, date_text)
-                if match:
-                    # Convert to standard format
-                    today = datetime.now()
-                    try:
-                        if pattern == patterns[0]:  # 15 July 2025
-                            day, month_name, year = match.groups()
-                            month_num = self._month_name_to_number(month_name)
-                            date_obj = datetime(int(year), month_num, int(day))
-                        elif pattern == patterns[1]:  # July 15, 2025
-                            month_name, day, year = match.groups()
-                            month_num = self._month_name_to_number(month_name)
-                            date_obj = datetime(int(year), month_num, int(day))
-                        elif pattern == patterns[2]:  # 15/07/2025
-                            day, month, year = match.groups()
-                            date_obj = datetime(int(year), int(month), int(day))
-                        elif pattern == patterns[3]:  # 2025-07-15
-                            year, month, day = match.groups()
-                            date_obj = datetime(int(year), int(month), int(day))
-                        
-                        return {
-                            'date': date_obj.strftime('%Y-%m-%d'),
-                            'time': time_str
-                        }
-                    except ValueError:
-                        continue
+            date_obj = RULES.date_patterns.parse(date_text)
+            if date_obj:
+                return {
+                    'date': date_obj.strftime('%Y-%m-%d'),
+                    'time': time_str
+                }
             
             # If no specific date found, assume it's upcoming
             future_date = datetime.now() + timedelta(days=7)
@@ -184,24 +281,6 @@ class IAmsterdamScraper:
             logger.error(f"Error parsing date: {str(e)}")
             return None
     
-    def _month_name_to_number(self, month_name: str) -> int:
-        """Convert month name to number"""
-        months = {
-            'january': 1, 'jan': 1,
-            'february': 2, 'feb': 2,
-            'march': 3, 'mar': 3,
-            'april': 4, 'apr': 4,
-            'may': 5,
-            'june': 6, 'jun': 6,
-            'july': 7, 'jul': 7,
-            'august': 8, 'aug': 8,
-            'september': 9, 'sep': 9,
-            'october': 10, 'oct': 10,
-            'november': 11, 'nov': 11,
-            'december': 12, 'dec': 12
-        }
-        return months.get(month_name.lower(), 1)
-    
     def _is_free_or_low_cost(self, event: Dict) -> bool:
         """Check if event is free or low cost"""
         title = event.get('title', '').lower()
@@ -0,0 +1,322 @@
+import os
+import re
+import io
+import hashlib
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, Optional
+from urllib.parse import urlsplit
+from src.instrumentation import metrics
+
+logger = logging.getLogger(__name__)
+
+# Cache directory and size budget; thumbnails are evicted least recently used first
+IMAGE_CACHE_DIR = os.environ.get(
+    'IMAGE_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'database', 'images')
+)
+IMAGE_CACHE_MAX_BYTES = int(os.environ.get('IMAGE_CACHE_MAX_BYTES', 200 * 1024 * 1024))
+# Twice the 400x250 event card images of the frontend
+THUMBNAIL_SIZE = (800, 500)
+MAX_SOURCE_BYTES = 10 * 1024 * 1024
+# Seconds a URL that could not be cached is not tried again
+IMAGE_CACHE_FAILURE_TTL = int(os.environ.get('IMAGE_CACHE_FAILURE_TTL', 24 * 3600))
+# Placeholder image services; their images are never worth a download
+PLACEHOLDER_HOSTS = ('via.placeholder.com', 'placeholder.com', 'placehold.co', 'placehold.it', 'dummyimage.com')
+# URL index entry of a URL whose last download failed
+FAILED_MARKER = 'failed'
+# URL prefix of the route serving cached images
+IMAGE_ROUTE = '/api/images/'
+
+IMAGE_NAME_RE = re.compile(r'^[0-9a-f]{64}\.(webp|jpg|png|gif)$')
+CONTENT_TYPES = {'webp': 'image/webp', 'jpg': 'image/jpeg', 'png': 'image/png', 'gif': 'image/gif'}
+EXTENSIONS = {'image/webp': 'webp', 'image/jpeg': 'jpg', 'image/png': 'png', 'image/gif': 'gif'}
+
+image_cache_lookups_total = metrics.counter(
+    'image_cache_lookups_total',
+    'Event image lookups during scrapes by result (hit, miss, error, skipped)', ('result',))
+image_cache_bytes = metrics.gauge('image_cache_bytes', 'Bytes stored in the image cache')
+image_cache_evictions_total = metrics.counter('image_cache_evictions_total', 'Images evicted from the cache')
+
+
+class ImageCache:
+    """
+    Content-addressed on-disk cache of event image thumbnails
+
+    Each remote image is fetched once, resized to a WebP thumbnail (when
+    Pillow is installed, otherwise stored as is) and saved under the
+    SHA-256 of the stored bytes, so identical images share one file. A
+    small URL index maps remote URLs to their file, so later scrapes skip
+    the download; it also remembers failed downloads for failure_ttl
+    seconds, and placeholder hosts are never fetched. Once the cache grows past max_bytes, evict() removes the
+    least recently used files that no active event points at; it runs
+    after each update (see trim_image_cache), never during a scrape, so
+    images of events that are not written yet are safe too.
+    """
+
+    def __init__(self, directory: str = IMAGE_CACHE_DIR, max_bytes: int = IMAGE_CACHE_MAX_BYTES,
+                 size=THUMBNAIL_SIZE, failure_ttl: int = IMAGE_CACHE_FAILURE_TTL):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.size = size
+        self.failure_ttl = failure_ttl
+        self._session = None
+        self._total_bytes: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def path_for(self, name: str) -> Optional[str]:
+        """Path of a cached image by its file name; None for invalid or missing names"""
+        if not IMAGE_NAME_RE.match(name):
+            return None
+        path = os.path.join(self.directory, name[:2], name)
+        return path if os.path.exists(path) else None
+
+    def _url_index_path(self, url: str) -> str:
+        digest = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, 'urls', digest[:2], digest)
+
+    def _read_index(self, url: str) -> Optional[str]:
+        try:
+            with open(self._url_index_path(url)) as index:
+                return index.read().strip()
+        except OSError:
+            return None
+
+    def lookup(self, url: str) -> Optional[str]:
+        """File name of an already cached remote URL"""
+        name = self._read_index(url)
+        if name is None:
+            return None
+        path = self.path_for(name)
+        if path is None:
+            return None
+        # Mark as recently used for eviction
+        os.utime(path)
+        return name
+
+    def recently_failed(self, url: str) -> bool:
+        """Whether the last download of a URL failed less than failure_ttl seconds ago"""
+        if self._read_index(url) != FAILED_MARKER:
+            return False
+        try:
+            return time.time() - os.path.getmtime(self._url_index_path(url)) < self.failure_ttl
+        except OSError:
+            return False
+
+    def cache_url(self, url: str, timeout: float = 10) -> Optional[str]:
+        """
+        Fetch, resize and store a remote image
+
+        Placeholder hosts and URLs that failed within failure_ttl are skipped
+        without a request.
+
+        Returns:
+            File name of the cached image, or None if it could not be cached
+        """
+        name = self.lookup(url)
+        if name:
+            image_cache_lookups_total.inc(result='hit')
+            return name
+
+        if (urlsplit(url).hostname or '') in PLACEHOLDER_HOSTS or self.recently_failed(url):
+            image_cache_lookups_total.inc(result='skipped')
+            return None
+
+        try:
+            data, content_type = self._download(url, timeout)
+            data, extension = self._thumbnail(data, content_type)
+        except Exception as e:
+            image_cache_lookups_total.inc(result='error')
+            logger.debug(f"Could not cache image {url}: {str(e)}")
+            try:
+                self._write(self._url_index_path(url), FAILED_MARKER.encode('ascii'))
+            except OSError:
+                pass
+            return None
+
+        name = f"{hashlib.sha256(data).hexdigest()}.{extension}"
+        path = os.path.join(self.directory, name[:2], name)
+        if not os.path.exists(path):
+            self._write(path, data)
+            self._add_bytes(len(data))
+        self._write(self._url_index_path(url), name.encode('ascii'))
+        image_cache_lookups_total.inc(result='miss')
+        return name
+
+    @property
+    def session(self):
+        """HTTP session, created on first download so the image route does not load requests"""
+        if self._session is None:
+            import requests
+
+            self._session = requests.Session()
+            self._session.headers.update({'User-Agent': 'Mozilla/5.0 (compatible; AmsterdamEvents/1.0)'})
+        return self._session
+
+    def _download(self, url: str, timeout: float):
+        response = self.session.get(url, timeout=timeout, stream=True)
+        try:
+            response.raise_for_status()
+            content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+            chunks = []
+            received = 0
+            for chunk in response.iter_content(64 * 1024):
+                received += len(chunk)
+                if received > MAX_SOURCE_BYTES:
+                    raise ValueError(f"image larger than {MAX_SOURCE_BYTES} bytes")
+                chunks.append(chunk)
+        finally:
+            response.close()
+        return b''.join(chunks), content_type
+
+    def _thumbnail(self, data: bytes, content_type: str):
+        """Resize to a WebP thumbnail; keep the original bytes without Pillow"""
+        try:
+            from PIL import Image
+        except ImportError:
+            Image = None
+
+        if Image is None:
+            if content_type not in EXTENSIONS:
+                raise ValueError(f"unsupported image type {content_type!r}")
+            return data, EXTENSIONS[content_type]
+
+        with Image.open(io.BytesIO(data)) as image:
+            image.thumbnail(self.size)
+            if image.mode not in ('RGB', 'RGBA'):
+                image = image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+            output = io.BytesIO()
+            image.save(output, format='WEBP', quality=80, method=4)
+        return output.getvalue(), 'webp'
+
+    def _write(self, path: str, data: bytes):
+        """Write atomically, so readers never see partial files"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'wb') as output:
+            output.write(data)
+        os.replace(temp_path, path)
+
+    def _scan(self):
+        """Cached image files as (mtime, size, path)"""
+        for prefix in os.listdir(self.directory) if os.path.isdir(self.directory) else []:
+            folder = os.path.join(self.directory, prefix)
+            if prefix == 'urls' or not os.path.isdir(folder):
+                continue
+            for name in os.listdir(folder):
+                if IMAGE_NAME_RE.match(name):
+                    stat = os.stat(os.path.join(folder, name))
+                    yield stat.st_mtime, stat.st_size, os.path.join(folder, name)
+
+    def _add_bytes(self, added: int):
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = sum(size for _, size, _ in self._scan())
+            else:
+                self._total_bytes += added
+            image_cache_bytes.set(self._total_bytes)
+
+    def over_budget(self) -> bool:
+        """Whether the cache holds more than max_bytes"""
+        self._add_bytes(0)
+        return self._total_bytes > self.max_bytes
+
+    def evict(self, keep: Iterable[str] = ()) -> int:
+        """
+        Remove least recently used images until the cache is at 90% of its budget
+
+        Files named in keep are never removed, so the cache stays over budget
+        when they alone exceed it.
+
+        Returns:
+            Number of removed files
+        """
+        keep = set(keep)
+        target = int(self.max_bytes * 0.9)
+        removed = 0
+        with self._lock:
+            files = sorted(self._scan())
+            total = sum(size for _, size, _ in files)
+            for _, size, path in files:
+                if total <= target:
+                    break
+                if os.path.basename(path) in keep:
+                    continue
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                removed += 1
+                image_cache_evictions_total.inc()
+            # URL index entries of evicted files are left behind; lookup() treats them as misses
+            self._total_bytes = total
+            image_cache_bytes.set(total)
+        if total > self.max_bytes:
+            logger.warning(f"Image cache holds {total} bytes of images still in use, over its {self.max_bytes} byte budget")
+        return removed
+
+    def localize(self, event: Dict, timeout: float = 10) -> Dict:
+        """Point an event's image at the local image route once it is cached"""
+        url = event.get('image') or ''
+        if url.startswith(('http://', 'https://')):
+            name = self.cache_url(url, timeout=timeout)
+            if name:
+                event['image'] = IMAGE_ROUTE + name
+        return event
+
+    def iter_localized(self, events: Iterable[Dict], max_workers: int = 4,
+                       cancel_token=None) -> Iterator[Dict]:
+        """
+        Localize event images with up to max_workers downloads in flight, preserving order
+
+        Once cancel_token is cancelled events pass through with their remote image.
+        """
+        def localize(event: Dict) -> Dict:
+            if cancel_token is not None and cancel_token.cancelled:
+                return event
+            timeout = cancel_token.timeout(10) if cancel_token is not None else 10
+            return self.localize(event, timeout=timeout)
+
+        in_flight = deque()
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            for event in events:
+                in_flight.append(executor.submit(localize, event))
+                if len(in_flight) >= max_workers:
+                    yield in_flight.popleft().result()
+
+            while in_flight:
+                yield in_flight.popleft().result()
+
+
+_image_cache: Optional[ImageCache] = None
+
+
+def get_image_cache() -> ImageCache:
+    """Process-wide image cache configured from IMAGE_CACHE_DIR and IMAGE_CACHE_MAX_BYTES"""
+    global _image_cache
+    if _image_cache is None:
+        _image_cache = ImageCache()
+    return _image_cache
+
+
+def trim_image_cache() -> int:
+    """
+    Evict cached images once the cache is over budget, keeping every image an active event points at
+
+    Returns:
+        Number of removed files (requires app context)
+    """
+    cache = get_image_cache()
+    if not cache.over_budget():
+        return 0
+
+    from src.models.event import Event, db
+
+    rows = db.session.query(Event.image).filter(Event.is_active == True, Event.image.startswith(IMAGE_ROUTE))
+    removed = cache.evict(keep={image[len(IMAGE_ROUTE):] for image, in rows})
+    logger.info(f"Evicted {removed} images from the image cache")
+    return removed
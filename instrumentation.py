@@ -0,0 +1,349 @@
+import io
+import time
+import logging
+import threading
+import weakref
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class _Metric:
+    """Base class for labelled metrics"""
+
+    metric_type = 'untyped'
+
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict) -> Tuple:
+        return tuple(str(labels.get(label, '')) for label in self.label_names)
+
+    def _format_labels(self, key: Tuple, extra: Optional[Dict] = None) -> str:
+        pairs = list(zip(self.label_names, key))
+        if extra:
+            pairs.extend(extra.items())
+        if not pairs:
+            return ''
+        escaped = [
+            '{}="{}"'.format(name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+            for name, value in pairs
+        ]
+        return '{' + ','.join(escaped) + '}'
+
+    def render(self) -> List[str]:
+        return [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} {self.metric_type}']
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter"""
+
+    metric_type = 'counter'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return dict(self._values)
+
+    def merge(self, snapshot: Dict):
+        with self._lock:
+            for key, amount in snapshot.items():
+                self._values[key] = self._values.get(key, 0) + amount
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f'{self.name}{self._format_labels(key)} {value}')
+        return lines
+
+
+class Gauge(Counter):
+    """Value that can go up and down"""
+
+    metric_type = 'gauge'
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    """Cumulative bucket histogram"""
+
+    metric_type = 'histogram'
+
+    def __init__(self, *args, buckets: Tuple[float, ...] = DEFAULT_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+        self._values: Dict[Tuple, Dict] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                series = {'buckets': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+                self._values[key] = series
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series['buckets'][index] += 1
+            series['sum'] += value
+            series['count'] += 1
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {key: {'buckets': list(series['buckets']), 'sum': series['sum'], 'count': series['count']}
+                    for key, series in self._values.items()}
+
+    def merge(self, snapshot: Dict):
+        with self._lock:
+            for key, other in snapshot.items():
+                series = self._values.get(key)
+                if series is None:
+                    series = {'buckets': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+                    self._values[key] = series
+                series['buckets'] = [count + added for count, added in zip(series['buckets'], other['buckets'])]
+                series['sum'] += other['sum']
+                series['count'] += other['count']
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            for key, series in sorted(self._values.items()):
+                for bound, count in zip(self.buckets, series['buckets']):
+                    lines.append(f'{self.name}_bucket{self._format_labels(key, {"le": bound})} {count}')
+                lines.append(f'{self.name}_bucket{self._format_labels(key, {"le": "+Inf"})} {series["count"]}')
+                lines.append(f'{self.name}_sum{self._format_labels(key)} {series["sum"]}')
+                lines.append(f'{self.name}_count{self._format_labels(key)} {series["count"]}')
+        return lines
+
+
+class MetricsRegistry:
+    """Process-wide collection of metrics rendered in Prometheus text format"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric_class, name: str, help_text: str, labels: Tuple[str, ...], **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = metric_class(name, help_text, tuple(labels), **kwargs)
+                self._metrics[name] = metric
+            return metric
+
+    def counter(self, name: str, help_text: str, labels: Tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter, name, help_text, labels)
+
+    def gauge(self, name: str, help_text: str, labels: Tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge, name, help_text, labels)
+
+    def histogram(self, name: str, help_text: str, labels: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram, name, help_text, labels, buckets=buckets)
+
+    def _cumulative(self) -> List[_Metric]:
+        with self._lock:
+            return [metric for metric in self._metrics.values() if isinstance(metric, (Counter, Histogram))]
+
+    def reset(self):
+        """Clear counters and histograms, e.g. in a worker process before its next task"""
+        for metric in self._cumulative():
+            metric.reset()
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Counter and histogram values by metric name, to be merged into another process's registry"""
+        return {metric.name: metric.snapshot() for metric in self._cumulative()}
+
+    def merge(self, snapshot: Dict[str, Dict]):
+        """Add a snapshot from another process; gauges are process state and are not merged"""
+        for name, values in snapshot.items():
+            metric = self._metrics.get(name)
+            if isinstance(metric, (Counter, Histogram)):
+                metric.merge(values)
+
+    def render_prometheus(self) -> str:
+        lines = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+# Global metrics registry
+metrics = MetricsRegistry()
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+scrape_stage_seconds = metrics.histogram(
+    'scrape_stage_duration_seconds', 'Time spent per scrape pipeline stage', ('source', 'stage'))
+http_requests_total = metrics.counter(
+    'scraper_http_requests_total', 'HTTP requests made by scrapers', ('source', 'status'))
+http_response_bytes_total = metrics.counter(
+    'scraper_http_response_bytes_total', 'Bytes received by scrapers', ('source',))
+http_request_seconds = metrics.histogram(
+    'scraper_http_request_duration_seconds', 'Scraper HTTP request latency', ('source',))
+db_statements_total = metrics.counter(
+    'db_statements_total', 'SQL statements executed', ('operation',))
+db_statement_seconds = metrics.histogram(
+    'db_statement_duration_seconds', 'SQL statement execution time', ('operation',))
+
+
+@contextmanager
+def stage_timer(source: str, stage: str):
+    """Time a pipeline stage (fetch, parse, extract, detail_fetch, detail_parse, categorize, upsert)"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        scrape_stage_seconds.observe(time.perf_counter() - start, source=source, stage=stage)
+
+
+def instrument_session(session, source: str):
+    """Record request counts, bytes and latency for a scraper's requests session"""
+
+    def record_response(response, *args, **kwargs):
+        http_requests_total.inc(source=source, status=response.status_code)
+        # Reading .content would load a streamed body; iter_response_chunks counts those instead
+        if not kwargs.get('stream'):
+            http_response_bytes_total.inc(len(response.content or b''), source=source)
+        http_request_seconds.observe(response.elapsed.total_seconds(), source=source)
+
+    session.hooks.setdefault('response', []).append(record_response)
+    return session
+
+
+def iter_response_chunks(response, source: str, chunk_size: int = 64 * 1024):
+    """Read a streamed (stream=True) response body in chunks, counting its bytes"""
+    for chunk in response.iter_content(chunk_size):
+        http_response_bytes_total.inc(len(chunk), source=source)
+        yield chunk
+
+
+# Per-statement callbacks, receiving (operation, seconds)
+_statement_listeners: List[Callable[[str, float], None]] = []
+# Engines already carrying the statement listeners (Engine has no .info to mark them)
+_instrumented_engines = weakref.WeakSet()
+
+
+def add_statement_listener(listener: Callable[[str, float], None]):
+    """Register a callback invoked after each SQL statement"""
+    _statement_listeners.append(listener)
+
+
+def instrument_engine(engine):
+    """Count and time SQL statements executed on an engine"""
+    from sqlalchemy import event
+
+    if engine in _instrumented_engines:
+        return
+    _instrumented_engines.add(engine)
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_start_time', []).append(time.perf_counter())
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info['query_start_time'].pop()
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else 'UNKNOWN'
+        db_statements_total.inc(operation=operation)
+        db_statement_seconds.observe(elapsed, operation=operation)
+        for listener in _statement_listeners:
+            listener(operation, elapsed)
+
+
+def init_instrumentation(app):
+    """Instrument all database engines of the app (needs app context)"""
+    from src.models.event import db
+
+    for engine in db.engines.values():
+        instrument_engine(engine)
+
+
+# Report of the most recent profiled run
+_last_profile: Dict = {}
+
+
+def profile_call(func: Callable, *args, **kwargs):
+    """
+    Run a callable under a profiler and keep the report
+
+    Uses pyinstrument when installed, cProfile otherwise.
+    """
+    started_at = datetime.utcnow().isoformat()
+    try:
+        from pyinstrument import Profiler
+    except ImportError:
+        Profiler = None
+
+    if Profiler is not None:
+        profiler = Profiler()
+        profiler.start()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profiler.stop()
+            _store_profile('pyinstrument', started_at, profiler.output_text(unicode=True))
+
+    import cProfile
+    import pstats
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        profiler.disable()
+        stream = io.StringIO()
+        pstats.Stats(profiler, stream=stream).sort_stats('cumulative').print_stats(50)
+        _store_profile('cProfile', started_at, stream.getvalue())
+
+
+def _store_profile(profiler: str, started_at: str, report: str):
+    _last_profile.clear()
+    _last_profile.update({
+        'profiler': profiler,
+        'started_at': started_at,
+        'finished_at': datetime.utcnow().isoformat(),
+        'report': report
+    })
+    logger.info(f"Profiled update run captured with {profiler}")
+
+
+def get_last_profile() -> Optional[Dict]:
+    """Report of the most recent profiled run, if any"""
+    return dict(_last_profile) if _last_profile else None
@@ -7,10 +7,15 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 from flask import Flask, send_from_directory
 from flask_cors import CORS
 from src.models.user import db
-from src.models.event import Event  # Import Event model
+# Imported only to register the models' tables for db.create_all()
+from src.models.event import Event  # noqa: F401
+from src.models.scrape_run import ScrapeRun  # noqa: F401
+from src.models.geocode_cache import GeocodeCache  # noqa: F401
+from src.models.change_sequence import ChangeSequence  # noqa: F401
+from src.models.storage import configure_database, init_storage
+from src.instrumentation import init_instrumentation
 from src.routes.user import user_bp
 from src.routes.events import events_bp
-from src.scheduler import init_scheduler
 
 # Configure logging
 logging.basicConfig(
@@ -18,44 +23,76 @@ logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 
-app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
-app.config['SECRET_KEY'] = 'asdf#FGSgvasgf$5$WGT'
-
-# Enable CORS for all routes
-CORS(app)
-
-# Database configuration
-app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(os.path.dirname(__file__), 'database', 'app.db')}"
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-db.init_app(app)
-
-# Register blueprints
-app.register_blueprint(user_bp, url_prefix='/api')
-app.register_blueprint(events_bp, url_prefix='/api')
-
-with app.app_context():
-    # Create all database tables
-    db.create_all()
-    
-    # Initialize scheduler with 20-minute intervals
-    init_scheduler(app, start_immediately=True, interval_minutes=20)
-
-@app.route('/', defaults={'path': ''})
-@app.route('/<path:path>')
-def serve(path):
-    static_folder_path = app.static_folder
-    if static_folder_path is None:
-            return "Static folder not configured", 404
-
-    if path != "" and os.path.exists(os.path.join(static_folder_path, path)):
-        return send_from_directory(static_folder_path, path)
-    else:
-        index_path = os.path.join(static_folder_path, 'index.html')
-        if os.path.exists(index_path):
-            return send_from_directory(static_folder_path, 'index.html')
+
+def create_app(start_scheduler=None):
+    """
+    Create and configure the Flask app
+
+    Args:
+        start_scheduler: Run the background scraping scheduler in this
+            process; defaults to the SCHEDULER_ENABLED environment variable
+            (on unless set to 0). Web workers that leave it off never import
+            the scraping stack.
+    """
+    if start_scheduler is None:
+        start_scheduler = os.environ.get('SCHEDULER_ENABLED', '1').lower() not in ('0', 'false', 'no')
+
+    app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
+    app.config['SECRET_KEY'] = 'asdf#FGSgvasgf$5$WGT'
+
+    # Enable CORS for all routes
+    CORS(app)
+
+    # Database configuration (DATABASE_URL / DATABASE_REPLICA_URL override the SQLite default)
+    configure_database(app, default_uri=f"sqlite:///{os.path.join(os.path.dirname(__file__), 'database', 'app.db')}")
+    db.init_app(app)
+
+    # Requests slower than this are logged with their filter parameters
+    app.config['SLOW_REQUEST_THRESHOLD_MS'] = float(os.environ.get('SLOW_REQUEST_THRESHOLD_MS', 500))
+
+    # Register blueprints
+    app.register_blueprint(user_bp, url_prefix='/api')
+    app.register_blueprint(events_bp, url_prefix='/api')
+
+    with app.app_context():
+        # Create all database tables
+        db.create_all()
+        init_storage(app)
+        init_instrumentation(app)
+
+        if start_scheduler:
+            from src.scheduler import init_scheduler
+
+            # Initialize scheduler with 20-minute intervals
+            init_scheduler(app, start_immediately=True, interval_minutes=20)
+
+    @app.route('/', defaults={'path': ''})
+    @app.route('/<path:path>')
+    def serve(path):
+        static_folder_path = app.static_folder
+        if static_folder_path is None:
+                return "Static folder not configured", 404
+
+        if path != "" and os.path.exists(os.path.join(static_folder_path, path)):
+            return send_from_directory(static_folder_path, path)
         else:
-            return "index.html not found", 404
+            index_path = os.path.join(static_folder_path, 'index.html')
+            if os.path.exists(index_path):
+                return send_from_directory(static_folder_path, 'index.html')
+            else:
+                return "index.html not found", 404
+
+    return app
+
+
+def __getattr__(name):
+    """Create the module-level app on first access (e.g. gunicorn 'src.main:app'), not on import"""
+    if name == 'app':
+        global app
+        app = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    create_app().run(host='0.0.0.0', port=5000, debug=True)
@@ -0,0 +1,177 @@
+import os
+import logging
+import multiprocessing
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pickle import PicklingError
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from src.instrumentation import metrics
+from src.scrapers.extraction_rules import merge_rule_stats, reset_rule_stats, rule_stats_snapshot
+from src.scrapers.sources import EventSource, get_registered_sources
+
+logger = logging.getLogger(__name__)
+
+# Worker processes for parsing; 0 parses in the scraping thread
+PARSE_WORKERS = int(os.environ.get('PARSE_WORKERS', 0))
+# multiprocessing start method; forking a threaded scraping process can deadlock
+# workers on locks held by other threads, so the default is forkserver (spawn on Windows)
+PARSE_POOL_START_METHOD = os.environ.get('PARSE_POOL_START_METHOD') or (
+    'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+)
+
+# Units (containers, event pages) sent to a worker per task, so small units are not dominated by IPC
+PARSE_BATCH_SIZE = int(os.environ.get('PARSE_BATCH_SIZE', 16))
+
+parse_pool_units_total = metrics.counter(
+    'parse_pool_units_total', 'Units parsed in parse worker processes by source and method', ('source', 'method'))
+
+# Source instances used for parsing inside a worker process
+_worker_sources: Dict[Tuple[str, Tuple], EventSource] = {}
+
+
+def _apply(source: EventSource, method: str, units: List) -> List:
+    """Results of a source parse method ('parse' or 'parse_detail') for each unit"""
+    if method == 'parse':
+        return [list(source.parse(unit)) for unit in units]
+    return [getattr(source, method)(unit) for unit in units]
+
+
+def parse_in_worker(source_key: str, options: Dict, method: str, units: List) -> Tuple[List, Dict]:
+    """
+    Parse a batch of units in a worker process
+
+    Runs only a CPU-bound parse method of the source on units the parent
+    already fetched and cut out (listing containers, event pages) and
+    returns plain results; all I/O stays in the parent process. The
+    metrics and rule lookup counts recorded while parsing come back with
+    the results, so the parent can merge them into its own.
+    """
+    cache_key = (source_key, tuple(sorted(options.items())))
+    source = _worker_sources.get(cache_key)
+    if source is None:
+        source_class = get_registered_sources()[source_key]
+        source = source_class(adaptive=None, circuit_breaker=None, **options)
+        _worker_sources[cache_key] = source
+
+    metrics.reset()
+    reset_rule_stats()
+    results = _apply(source, method, units)
+    return results, {'metrics': metrics.snapshot(), 'rules': rule_stats_snapshot()}
+
+
+class ParsePool:
+    """
+    Optional process pool for parsing
+
+    A source splits each fetched document into independent units (see
+    EventSource.split), e.g. the event containers of a listing page as it
+    downloads. Units go to the worker processes in batches and come back
+    as event dictionaries in order, with the workers' parse metrics and
+    rule stats merged into this process. Sources can also hand single
+    units to the pool from their own threads with call(), e.g. fetched
+    event pages. When the pool is disabled or breaks, units are parsed
+    in-process.
+    """
+
+    def __init__(self, workers: int = PARSE_WORKERS, start_method: Optional[str] = PARSE_POOL_START_METHOD,
+                 batch_size: int = PARSE_BATCH_SIZE):
+        self.workers = workers
+        self.start_method = start_method
+        self.batch_size = max(1, batch_size)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.workers > 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                context = multiprocessing.get_context(self.start_method) if self.start_method else None
+                if context is not None and self.start_method == 'forkserver':
+                    # Workers fork from a server that already imported the scrapers
+                    context.set_forkserver_preload([__name__])
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+                logger.info(f"Started parse pool with {self.workers} worker processes")
+            return self._executor
+
+    def parse_pages(self, source: EventSource, pages: Iterable) -> Iterator[Iterable[Dict]]:
+        """
+        Yield the parsed events of each unit of the pages, in order
+
+        With the pool enabled up to two batches per worker are parsed in
+        parallel while later units are still being fetched and cut out.
+        """
+        units = (unit for raw in pages for unit in source.split(raw))
+        if not self.enabled:
+            for unit in units:
+                yield source.parse(unit)
+            return
+
+        in_flight = deque()
+        batch = []
+        for unit in units:
+            batch.append(unit)
+            if len(batch) < self.batch_size:
+                continue
+            in_flight.append((self._submit(source, 'parse', batch), batch))
+            batch = []
+            if len(in_flight) >= self.workers * 2:
+                yield from self._results(source, 'parse', *in_flight.popleft())
+        if batch:
+            in_flight.append((self._submit(source, 'parse', batch), batch))
+
+        while in_flight:
+            yield from self._results(source, 'parse', *in_flight.popleft())
+
+    def call(self, source: EventSource, method: str, unit):
+        """Run a parse method of the source on one unit in a worker and wait for the result (thread-safe)"""
+        return self._results(source, method, self._submit(source, method, [unit]), [unit])[0]
+
+    def _submit(self, source: EventSource, method: str, units: List):
+        if not self.enabled:
+            return None
+        try:
+            return self._get_executor().submit(parse_in_worker, source.key, source.parse_options(), method, units)
+        except (BrokenProcessPool, RuntimeError, OSError) as e:
+            self._disable(e)
+            return None
+
+    def _results(self, source: EventSource, method: str, future, units: List) -> List:
+        if future is None:
+            return _apply(source, method, units)
+        try:
+            results, stats = future.result()
+        except (BrokenProcessPool, PicklingError, OSError) as e:
+            self._disable(e)
+            return _apply(source, method, units)
+        metrics.merge(stats['metrics'])
+        merge_rule_stats(stats['rules'])
+        parse_pool_units_total.inc(len(units), source=source.name, method=method)
+        return results
+
+    def _disable(self, error: Exception):
+        """Fall back to in-process parsing after the pool failed"""
+        logger.warning(f"Parse pool unavailable, parsing in-process: {str(error)}")
+        self.workers = 0
+        self.shutdown()
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+_parse_pool: Optional[ParsePool] = None
+
+
+def get_parse_pool() -> ParsePool:
+    """Process-wide parse pool configured from PARSE_WORKERS"""
+    global _parse_pool
+    if _parse_pool is None:
+        _parse_pool = ParsePool()
+    return _parse_pool
@@ -0,0 +1,243 @@
+import queue
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+from src.models.event import Event, db
+from src.instrumentation import metrics, stage_timer
+from src.scrapers.sources import EventSource
+from src.scrapers.geocoder import get_geocoder
+from src.scrapers.cancellation import CancellationToken, CancelledError
+
+logger = logging.getLogger(__name__)
+
+events_rejected_total = metrics.counter(
+    'events_rejected_total', 'Scraped events skipped because the database rejected them', ('source',))
+
+
+class BatchedEventWriter:
+    """Buffers scraped events per source and upserts them in batches"""
+
+    def __init__(self, batch_size: int = 100, cancel_token: Optional[CancellationToken] = None):
+        self.batch_size = batch_size
+        # Geocoding stops making HTTP requests once the run is cancelled
+        self.cancel_token = cancel_token
+        self._buffers: Dict[str, List[Dict]] = {}
+        self.event_ids: Dict[str, List[int]] = {}
+        self.changes: Dict[str, Dict[str, int]] = {}
+        self.rejected: Dict[str, int] = {}
+
+    def add(self, source_name: str, event: Dict):
+        """Queue an event, writing the source's batch once it is full"""
+        buffer = self._buffers.setdefault(source_name, [])
+        buffer.append(event)
+        if len(buffer) >= self.batch_size:
+            self.flush(source_name)
+
+    def flush(self, source_name: str):
+        """Upsert and commit the buffered events of a source"""
+        buffer = self._buffers.pop(source_name, [])
+        if not buffer:
+            return
+
+        with stage_timer(source_name, 'geocode'):
+            try:
+                get_geocoder().geocode_events(buffer, cancel_token=self.cancel_token)
+            except Exception as e:
+                # Events are still stored, just without coordinates
+                db.session.rollback()
+                logger.warning(f"Geocoding {source_name} events failed: {str(e)}")
+
+        with stage_timer(source_name, 'upsert'):
+            self._write(source_name, buffer)
+
+    def _write(self, source_name: str, events: List[Dict]):
+        """
+        Upsert and commit events, bisecting a rejected batch to skip only the offending rows
+
+        A row the database rejects (an overlong title, say) would otherwise
+        abort the whole batch and fail the source. The halves of a failed
+        batch are retried until the rows that still fail are found; those are
+        logged and counted as rejected, the rest are stored.
+        """
+        try:
+            changes = Event.count_changes(source_name, events)
+            event_ids = Event.upsert_events(events)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            if len(events) > 1:
+                middle = len(events) // 2
+                self._write(source_name, events[:middle])
+                self._write(source_name, events[middle:])
+                return
+            logger.error(f"Skipping {source_name} event {events[0].get('title')!r}: {str(e)}")
+            self.rejected[source_name] = self.rejected.get(source_name, 0) + 1
+            events_rejected_total.inc(source=source_name)
+            return
+
+        self.event_ids.setdefault(source_name, []).extend(event_ids)
+        totals = self.changes.setdefault(source_name, {'new': 0, 'changed': 0, 'unchanged': 0})
+        for kind, count in changes.items():
+            totals[kind] += count
+
+    def finish(self, source_name: str) -> Dict:
+        """Flush remaining events and deactivate events the source no longer lists"""
+        self.flush(source_name)
+        event_ids = self.event_ids.get(source_name, [])
+
+        with stage_timer(source_name, 'upsert'):
+            deactivated = Event.deactivate_old_events(source_name, event_ids)
+            db.session.commit()
+
+        changes = self.changes.get(source_name, {})
+        return {
+            'events_processed': len(event_ids),
+            'events_new': changes.get('new', 0),
+            'events_changed': changes.get('changed', 0),
+            'events_unchanged': changes.get('unchanged', 0),
+            'events_deactivated': deactivated,
+            'events_rejected': self.rejected.get(source_name, 0)
+        }
+
+    def discard(self, source_name: str):
+        """Drop buffered events of a failed source"""
+        self._buffers.pop(source_name, None)
+
+
+class ScrapePipeline:
+    """
+    Runs event sources in parallel and streams their events into one writer
+
+    Sources scrape in worker threads and push each event onto a bounded
+    queue as soon as it is extracted; the calling thread owns the database
+    session and writes batches while fetching continues, so it must run
+    inside an app context. The queue bound keeps memory flat and applies
+    backpressure to sources when writing falls behind.
+    """
+
+    def __init__(self, sources: List[EventSource], max_workers: Optional[int] = None,
+                 batch_size: int = 100, queue_size: int = 500):
+        self.sources = sources
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+
+    def run(self, force: bool = False, only: Optional[List[str]] = None,
+            cancel_token: Optional[CancellationToken] = None) -> Dict:
+        """
+        Scrape all due sources and store their events
+
+        Each source gets a child of cancel_token limited to its own
+        timeout_seconds. A source that is cancelled or times out keeps the
+        events written so far but is reported as failed, so its missing
+        events are not deactivated.
+
+        Args:
+            force: Ignore per-source schedules and scrape every source
+            only: Restrict the run to these source keys
+            cancel_token: Run-level cancellation and deadline
+
+        Returns:
+            Results with per-source stats, total events and errors
+        """
+        results = {
+            'timestamp': datetime.utcnow().isoformat(),
+            'sources': {},
+            'total_events': 0,
+            'errors': []
+        }
+
+        sources = [source for source in self.sources if not only or source.key in only]
+        due_sources = []
+        for source in sources:
+            if source.is_blocked():
+                # Skip cheaply until the breaker lets a probe request through
+                results['sources'][source.key] = {'status': 'circuit_open', **source.breaker.to_dict()}
+                logger.info(f"Skipping {source.name}: circuit breaker open")
+            elif force or source.is_due():
+                due_sources.append(source)
+            else:
+                results['sources'][source.key] = {'status': 'skipped', 'last_run': source.last_run.isoformat()}
+
+        if not due_sources:
+            return results
+
+        cancel_token = cancel_token or CancellationToken()
+        events_queue = queue.Queue(maxsize=self.queue_size)
+        writer = BatchedEventWriter(self.batch_size, cancel_token=cancel_token)
+        scraped = {source.key: 0 for source in due_sources}
+        failed = {}
+        started = {}
+
+        max_workers = self.max_workers or len(due_sources)
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='scrape') as executor:
+            for source in due_sources:
+                logger.info(f"Scraping events from {source.name}")
+                source_token = cancel_token.child(source.timeout_seconds)
+                started[source.key] = datetime.utcnow()
+                executor.submit(self._scrape_source, source, source_token, events_queue)
+
+            pending = len(due_sources)
+            while pending:
+                kind, source, payload = events_queue.get()
+
+                if kind == 'event':
+                    if source.key in failed:
+                        continue
+                    scraped[source.key] += 1
+                    try:
+                        writer.add(source.name, payload)
+                    except Exception as e:
+                        failed[source.key] = f"Error saving {source.name} events: {str(e)}"
+                        writer.discard(source.name)
+                    continue
+
+                pending -= 1
+                if isinstance(payload, CancelledError) and source.key not in failed:
+                    failed[source.key] = f"{source.name} scrape stopped: {str(payload)}"
+                elif payload is not None and source.key not in failed:
+                    failed[source.key] = f"Error updating {source.name} events: {str(payload)}"
+
+                if source.key in failed:
+                    # Keep existing events active when a source could not be scraped completely
+                    writer.discard(source.name)
+                    logger.error(failed[source.key])
+                    results['errors'].append(failed[source.key])
+                    results['sources'][source.key] = {'error': failed[source.key]}
+                    continue
+
+                try:
+                    source_result = writer.finish(source.name)
+                except Exception as e:
+                    db.session.rollback()
+                    error_msg = f"Error saving {source.name} events: {str(e)}"
+                    logger.error(error_msg)
+                    results['errors'].append(error_msg)
+                    results['sources'][source.key] = {'error': error_msg}
+                    continue
+
+                # Intervals count from the start of a scrape, so its duration does not push the next one a tick later
+                source.last_run = started[source.key]
+                source.record_run(source_result)
+                source_result['events_scraped'] = scraped[source.key]
+                source_result['last_updated'] = datetime.utcnow().isoformat()
+                source_result['next_interval_minutes'] = source.current_interval()
+                results['sources'][source.key] = source_result
+                results['total_events'] += source_result['events_processed']
+                logger.info(f"{source.name} update completed: {source_result}")
+
+        if cancel_token.cancelled:
+            results['cancelled'] = cancel_token.reason
+
+        return results
+
+    def _scrape_source(self, source: EventSource, cancel_token: CancellationToken, events_queue: queue.Queue):
+        """Worker: push a source's events onto the queue, then a completion marker"""
+        try:
+            with stage_timer(source.name, 'total'):
+                for event in source.scrape(cancel_token):
+                    events_queue.put(('event', source, event))
+            events_queue.put(('done', source, None))
+        except Exception as e:
+            events_queue.put(('done', source, e))
@@ -0,0 +1,106 @@
+import os
+import time
+import logging
+import threading
+from collections import deque
+from typing import Dict, List
+from flask import current_app, g, has_request_context, request
+from src.instrumentation import add_statement_listener, metrics
+
+logger = logging.getLogger(__name__)
+slow_request_logger = logging.getLogger('amsterdam_events.slow_requests')
+
+DEFAULT_SLOW_REQUEST_THRESHOLD_MS = float(os.environ.get('SLOW_REQUEST_THRESHOLD_MS', 500))
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+request_seconds = metrics.histogram(
+    'api_request_duration_seconds', 'API request latency', ('route', 'method', 'status'))
+request_sql_queries = metrics.histogram(
+    'api_request_sql_queries', 'SQL statements per API request', ('route',), buckets=QUERY_COUNT_BUCKETS)
+request_sql_seconds = metrics.histogram(
+    'api_request_sql_duration_seconds', 'SQL time per API request', ('route',))
+response_bytes = metrics.histogram(
+    'api_response_size_bytes', 'API response body size', ('route',), buckets=SIZE_BUCKETS)
+cache_results_total = metrics.counter(
+    'api_cache_results_total', 'API responses by cache status (X-Cache header)', ('route', 'cache'))
+slow_requests_total = metrics.counter(
+    'api_slow_requests_total', 'API requests over the slow request threshold', ('route',))
+
+# Most recent slow requests, newest last
+_slow_requests = deque(maxlen=100)
+_slow_requests_lock = threading.Lock()
+
+
+def _record_statement(operation: str, elapsed: float):
+    """Attribute SQL statements to the current request"""
+    if has_request_context() and 'sql_queries' in g:
+        g.sql_queries += 1
+        g.sql_seconds += elapsed
+
+
+add_statement_listener(_record_statement)
+
+
+def _before_request():
+    g.request_start = time.perf_counter()
+    g.sql_queries = 0
+    g.sql_seconds = 0.0
+
+
+def _after_request(response):
+    if 'request_start' not in g:
+        return response
+
+    elapsed = time.perf_counter() - g.request_start
+    route = request.url_rule.rule if request.url_rule else request.path
+    cache = response.headers.get('X-Cache', 'NONE').upper()
+
+    request_seconds.observe(elapsed, route=route, method=request.method, status=response.status_code)
+    request_sql_queries.observe(g.sql_queries, route=route)
+    request_sql_seconds.observe(g.sql_seconds, route=route)
+    cache_results_total.inc(route=route, cache=cache)
+    if response.content_length is not None:
+        response_bytes.observe(response.content_length, route=route)
+
+    response.headers['Server-Timing'] = (
+        f'app;dur={elapsed * 1000:.1f}, db;dur={g.sql_seconds * 1000:.1f};desc="{g.sql_queries} queries"'
+    )
+
+    threshold_ms = current_app.config.get('SLOW_REQUEST_THRESHOLD_MS', DEFAULT_SLOW_REQUEST_THRESHOLD_MS)
+    if elapsed * 1000 >= threshold_ms:
+        _log_slow_request(route, elapsed, cache)
+
+    return response
+
+
+def _log_slow_request(route: str, elapsed: float, cache: str):
+    """Record the filter parameters of a request over the slow threshold"""
+    entry = {
+        'route': route,
+        'path': request.path,
+        'method': request.method,
+        'params': request.args.to_dict(),
+        'duration_ms': round(elapsed * 1000, 1),
+        'sql_queries': g.sql_queries,
+        'sql_ms': round(g.sql_seconds * 1000, 1),
+        'cache': cache,
+        'timestamp': time.time()
+    }
+    slow_requests_total.inc(route=route)
+    with _slow_requests_lock:
+        _slow_requests.append(entry)
+    slow_request_logger.warning(f"Slow request: {entry}")
+
+
+def get_slow_requests() -> List[Dict]:
+    """Recently logged slow requests, newest first"""
+    with _slow_requests_lock:
+        return list(reversed(_slow_requests))
+
+
+def instrument_blueprint(blueprint):
+    """Record latency, SQL usage, response size and cache status for a blueprint's routes"""
+    blueprint.before_request(_before_request)
+    blueprint.after_request(_after_request)
+    return blueprint
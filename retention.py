@@ -0,0 +1,103 @@
+import os
+import gzip
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import List, Optional
+from sqlalchemy import text
+from src.models.event import Event, db
+from src.models.change_sequence import ChangeSequence
+
+logger = logging.getLogger(__name__)
+
+# Directory for archived events; unset disables archiving
+ARCHIVE_DIR = os.environ.get('EVENT_ARCHIVE_DIR')
+DEFAULT_BATCH_SIZE = 500
+
+
+def delete_past_events(days_old: int = 30, batch_size: int = DEFAULT_BATCH_SIZE,
+                       archive_dir: Optional[str] = ARCHIVE_DIR) -> int:
+    """
+    Delete events whose event date is more than days_old days in the past
+
+    Rows are removed in batches of batch_size ids, each in its own short
+    transaction, so SQLite is never locked for long. When archive_dir is
+    set the removed rows are appended to a gzipped NDJSON file per month.
+
+    Returns:
+        Number of deleted events
+    """
+    cutoff = (datetime.now().date() - timedelta(days=days_old)).strftime('%Y-%m-%d')
+    deleted = 0
+
+    while True:
+        query = Event.query.filter(Event.date < cutoff, Event.date != '')
+        if archive_dir:
+            events = query.order_by(Event.id).limit(batch_size).all()
+            event_ids = [event.id for event in events]
+        else:
+            event_ids = [row[0] for row in query.with_entities(Event.id).order_by(Event.id).limit(batch_size)]
+
+        if not event_ids:
+            break
+
+        try:
+            if archive_dir:
+                _archive_events(events, archive_dir)
+            Event.query.filter(Event.id.in_(event_ids)).delete(synchronize_session=False)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        deleted += len(event_ids)
+        if len(event_ids) < batch_size:
+            break
+
+    if deleted:
+        logger.info(f"Deleted {deleted} events dated before {cutoff}")
+    return deleted
+
+
+def _archive_events(events: List[Event], archive_dir: str):
+    """Append events to archive_dir/events-YYYY-MM.ndjson.gz"""
+    os.makedirs(archive_dir, exist_ok=True)
+    path = os.path.join(archive_dir, f"events-{datetime.utcnow().strftime('%Y-%m')}.ndjson.gz")
+    # Each append adds a gzip member; readers decompress them as one stream
+    with gzip.open(path, 'at', encoding='utf-8') as archive:
+        for event in events:
+            archive.write(json.dumps(event.to_dict(), ensure_ascii=False, separators=(',', ':')) + '\n')
+
+
+def deactivate_missing_events(source: str, seen_event_ids: List[int]) -> int:
+    """
+    Deactivate active events of a source that were not seen in the last scrape
+
+    Deactivated events get a new change sequence number, so change feed
+    clients learn about them.
+
+    The seen ids go into a temporary table and the UPDATE uses an anti-join
+    against it, instead of a NOT IN list with one bound parameter per id.
+
+    Returns:
+        Number of deactivated events
+    """
+    db.session.execute(text('CREATE TEMP TABLE IF NOT EXISTS seen_event_ids (id INTEGER PRIMARY KEY)'))
+    db.session.execute(text('DELETE FROM seen_event_ids'))
+    if seen_event_ids:
+        db.session.execute(
+            text('INSERT INTO seen_event_ids (id) VALUES (:id)'),
+            [{'id': event_id} for event_id in set(seen_event_ids)]
+        )
+
+    result = db.session.execute(
+        text(
+            'UPDATE events SET is_active = :inactive, updated_at = :now, change_seq = :change_seq '
+            'WHERE source = :source AND is_active = :active '
+            'AND NOT EXISTS (SELECT 1 FROM seen_event_ids WHERE seen_event_ids.id = events.id)'
+        ),
+        {'inactive': False, 'active': True, 'source': source, 'now': datetime.utcnow(),
+         'change_seq': ChangeSequence.next_value()}
+    )
+    db.session.execute(text('DELETE FROM seen_event_ids'))
+    return result.rowcount
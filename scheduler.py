@@ -1,12 +1,30 @@
 import logging
 import atexit
-from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.interval import IntervalTrigger
+import threading
+import time
+import itertools
 from datetime import datetime
-from src.scrapers.data_manager import DataManager
+from src.broadcast import update_notifier
+from src.instrumentation import profile_call
+from src.models.event import Event, db
+from src.models.event_index import rebuild_event_index
+from src.models.export import EXPORT_HOUR, write_export_files
+from src.models.scrape_run import ScrapeRun
+from src.scrapers.cancellation import CancellationToken
+
+# APScheduler and the scraping stack (DataManager, scrapers, requests, bs4)
+# are imported on first use, so web processes without a scheduler never load them
 
 logger = logging.getLogger(__name__)
 
+# Seconds a cached status snapshot is served before it is recomputed
+STATUS_SNAPSHOT_MAX_AGE = 60
+
+UPDATE_JOB_ID = 'event_update_job'
+EXPORT_JOB_ID = 'event_export_job'
+# Prefix of the one-off jobs running manual updates
+MANUAL_JOB_ID = 'event_manual_update_job'
+
 class EventScheduler:
     """Scheduler for automated event data updates"""
     
@@ -14,12 +32,23 @@ class EventScheduler:
         self.scheduler = None
         self.data_manager = None
         self.app = app
+        self.status_snapshot = None
+        self.status_snapshot_time = 0.0
+        self.run_timeout = None
+        self.current_run = None
+        self._manual_request = None
+        self._manual_jobs = itertools.count(1)
+        self._lock = threading.Lock()
+        self._snapshot_lock = threading.Lock()
         
         if app:
             self.init_app(app)
     
     def init_app(self, app):
         """Initialize scheduler with Flask app"""
+        from apscheduler.schedulers.background import BackgroundScheduler
+        from src.scrapers.data_manager import DataManager
+        
         self.app = app
         
         # Configure logging
@@ -38,36 +67,57 @@ class EventScheduler:
         # Register shutdown handler
         atexit.register(lambda: self.shutdown())
     
-    def start_scheduler(self, interval_minutes=20):
-        """Start the scheduler with specified interval"""
+    def start_scheduler(self, interval_minutes=20, run_timeout=None):
+        """
+        Start the scheduler with specified interval
+        
+        The job ticks at the shorter of interval_minutes and the smallest
+        interval any adaptive source may ask for; each tick only scrapes
+        the sources that are due.
+        
+        Args:
+            interval_minutes: Default minutes between updates
+            run_timeout: Seconds an update may run before it is cancelled,
+                defaults to 90% of the tick so runs never overlap
+        """
         if not self.scheduler:
             logger.error("Scheduler not initialized")
             return False
         
+        from apscheduler.triggers.interval import IntervalTrigger
+        
         try:
-            # Add job for periodic updates
+            tick_minutes = self.data_manager.get_poll_interval(default=interval_minutes)
+            self.run_timeout = run_timeout or tick_minutes * 60 * 0.9
+            
+            # Add job for periodic updates, running the initial update right away
             self.scheduler.add_job(
                 func=self.scheduled_update,
-                trigger=IntervalTrigger(minutes=interval_minutes),
-                id='event_update_job',
+                trigger=IntervalTrigger(minutes=tick_minutes),
+                next_run_time=datetime.now(self.scheduler.timezone),
+                id=UPDATE_JOB_ID,
                 name='Update Amsterdam Events',
                 replace_existing=True,
                 max_instances=1  # Prevent overlapping jobs
             )
             
+            # Nightly export files for bulk consumers
+            if EXPORT_HOUR >= 0:
+                from apscheduler.triggers.cron import CronTrigger
+                
+                self.scheduler.add_job(
+                    func=self.nightly_export,
+                    trigger=CronTrigger(hour=EXPORT_HOUR),
+                    id=EXPORT_JOB_ID,
+                    name='Export Amsterdam Events',
+                    replace_existing=True,
+                    max_instances=1
+                )
+            
             # Start the scheduler
             self.scheduler.start()
             
-            logger.info(f"Event scheduler started with {interval_minutes} minute intervals")
-            
-            # Run initial update
-            self.scheduler.add_job(
-                func=self.scheduled_update,
-                trigger='date',
-                run_date=datetime.now(),
-                id='initial_update',
-                name='Initial Event Update'
-            )
+            logger.info(f"Event scheduler started with {tick_minutes} minute intervals")
             
             return True
             
@@ -75,13 +125,60 @@ class EventScheduler:
             logger.error(f"Error starting scheduler: {str(e)}")
             return False
     
-    def scheduled_update(self):
-        """Perform scheduled event update"""
-        logger.info("Starting scheduled event update")
+    def scheduled_update(self, profile=False, force=False, manual_only=False):
+        """
+        Perform scheduled event update
         
-        try:
-            with self.app.app_context():
-                result = self.data_manager.update_all_events()
+        A pending manual request turns this run into a forced manual run.
+        The run is cancelled cooperatively once it exceeds run_timeout and
+        is recorded in the run history either way.
+        
+        Args:
+            profile: Run the update under a profiler
+            force: Scrape every source even if its own schedule is not due
+            manual_only: Only run for a pending manual request (one-off jobs
+                queued by _run_now, whose request a periodic run may have
+                taken over in the meantime)
+        """
+        with self._lock:
+            if self.current_run is not None:
+                logger.warning("Event update already running, skipping")
+                return None
+            
+            if manual_only and self._manual_request is None:
+                logger.info("Manual update already run by an earlier update, skipping")
+                return None
+            
+            trigger = 'scheduled'
+            if self._manual_request is not None:
+                profile = profile or self._manual_request['profile']
+                force = True
+                trigger = 'manual'
+                self._manual_request = None
+            
+            started_at = datetime.utcnow()
+            cancel_token = CancellationToken(self.run_timeout)
+            self.current_run = {'started_at': started_at, 'trigger': trigger, 'cancel_token': cancel_token}
+        
+        logger.info(f"Starting {trigger} event update")
+        
+        with self.app.app_context():
+            result = None
+            error = None
+            run = None
+            
+            # Update summaries cover the changes after this point
+            try:
+                update_notifier.prime()
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"Error priming update notifier: {str(e)}")
+            
+            try:
+                if profile:
+                    result = profile_call(self.data_manager.update_all_events, force=force, cancel_token=cancel_token)
+                else:
+                    result = self.data_manager.update_all_events(force=force, cancel_token=cancel_token)
                 
                 logger.info(f"Scheduled update completed successfully: {result['total_events']} events processed")
                 
@@ -90,9 +187,113 @@ class EventScheduler:
                 
                 return result
                 
-        except Exception as e:
-            logger.error(f"Error during scheduled update: {str(e)}")
-            raise
+            except Exception as e:
+                error = str(e)
+                logger.error(f"Error during scheduled update: {error}")
+                raise
+            
+            finally:
+                with self._lock:
+                    self.current_run = None
+                    rerun = self._manual_request is not None
+                
+                try:
+                    run = ScrapeRun.record(started_at, trigger, result, error)
+                    self.refresh_status_snapshot()
+                except Exception as e:
+                    db.session.rollback()
+                    logger.error(f"Error recording update run: {str(e)}")
+                
+                # Serve the new events from memory right away
+                try:
+                    rebuild_event_index()
+                except Exception as e:
+                    logger.error(f"Error rebuilding event index: {str(e)}")
+                
+                # Push what changed to connected clients
+                if run is not None:
+                    try:
+                        update_notifier.publish_run(run)
+                    except Exception as e:
+                        db.session.rollback()
+                        logger.error(f"Error publishing update summary: {str(e)}")
+                
+                # A manual trigger arrived while this run was busy
+                if rerun:
+                    self._run_now()
+    
+    def nightly_export(self):
+        """Write the export files served under /api/export/files"""
+        with self.app.app_context():
+            try:
+                manifest = write_export_files()
+                logger.info(f"Nightly export completed: {', '.join(manifest['files'])}")
+                return manifest
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"Error writing nightly export: {str(e)}")
+                return None
+    
+    def cancel_current_update(self, reason='cancelled by request'):
+        """Ask the running update to stop at its next checkpoint"""
+        with self._lock:
+            if self.current_run is None:
+                return False
+            self.current_run['cancel_token'].cancel(reason)
+        logger.info(f"Cancelling running event update: {reason}")
+        return True
+    
+    def _run_now(self):
+        """
+        Run an update now as a one-off job
+        
+        Each one-off job gets its own id: max_instances counts per job id, so
+        rescheduling the periodic job (or reusing an id) from inside a running
+        update would be skipped until the next tick. The job does nothing when
+        a periodic run took the manual request before it started.
+        """
+        self.scheduler.add_job(
+            func=self.scheduled_update,
+            kwargs={'manual_only': True},
+            trigger='date',
+            run_date=datetime.now(self.scheduler.timezone),
+            id=f'{MANUAL_JOB_ID}-{next(self._manual_jobs)}',
+            name='Manual Amsterdam Events Update',
+            misfire_grace_time=None
+        )
+    
+    def get_data_manager(self):
+        """Shared DataManager instance, created on first use"""
+        from src.scrapers.data_manager import DataManager
+        
+        if self.data_manager is None:
+            with self._lock:
+                if self.data_manager is None:
+                    self.data_manager = DataManager()
+        return self.data_manager
+    
+    def refresh_status_snapshot(self):
+        """Recompute the cached data status (requires app context)"""
+        snapshot = Event.get_update_status()
+        snapshot['runs'] = ScrapeRun.recent(10)
+        snapshot['generated_at'] = datetime.utcnow().isoformat()
+        self.status_snapshot = snapshot
+        self.status_snapshot_time = time.monotonic()
+        return snapshot
+    
+    def get_status_snapshot(self, max_age=STATUS_SNAPSHOT_MAX_AGE):
+        """
+        Cached data status, refreshed after each scheduled update
+        
+        Falls back to recomputing it when older than max_age seconds, so
+        processes without a running scheduler still see fresh numbers.
+        """
+        if self.status_snapshot is None or time.monotonic() - self.status_snapshot_time > max_age:
+            # Its own lock: the database queries must not block the update thread on self._lock
+            with self._snapshot_lock:
+                if self.status_snapshot is None or time.monotonic() - self.status_snapshot_time > max_age:
+                    self.refresh_status_snapshot()
+        return self.status_snapshot
     
     def stop_scheduler(self):
         """Stop the scheduler"""
@@ -118,28 +319,45 @@ class EventScheduler:
                 'trigger': str(job.trigger)
             })
         
+        current_run = self.current_run
+        
         return {
             'status': 'running' if self.scheduler.running else 'stopped',
-            'jobs': jobs
+            'jobs': jobs,
+            'current_run': {
+                'started_at': current_run['started_at'].isoformat(),
+                'trigger': current_run['trigger'],
+                'time_remaining': current_run['cancel_token'].remaining()
+            } if current_run else None,
+            'sources': self.data_manager.get_source_status() if self.data_manager else {}
         }
     
-    def trigger_manual_update(self):
-        """Trigger a manual update immediately"""
+    def trigger_manual_update(self, profile=False):
+        """
+        Trigger a manual update as soon as possible
+        
+        Repeated triggers coalesce into the one pending manual run; a trigger
+        during a running update queues a single rerun once it finishes.
+        """
         if not self.scheduler:
             logger.error("Scheduler not initialized")
             return False
         
         try:
-            # Add one-time job
-            self.scheduler.add_job(
-                func=self.scheduled_update,
-                trigger='date',
-                run_date=datetime.now(),
-                id=f'manual_update_{datetime.now().timestamp()}',
-                name='Manual Event Update'
-            )
+            with self._lock:
+                pending = self._manual_request is not None
+                self._manual_request = {
+                    'profile': profile or (pending and self._manual_request['profile'])
+                }
+                running = self.current_run is not None
             
-            logger.info("Manual update triggered")
+            if pending:
+                logger.info("Manual update already pending, request coalesced")
+            elif running:
+                logger.info("Manual update queued after the running update")
+            else:
+                self._run_now()
+                logger.info(f"Manual update triggered{' with profiling' if profile else ''}")
             return True
             
         except Exception as e:
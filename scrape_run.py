@@ -0,0 +1,87 @@
+import json
+from datetime import datetime
+from typing import Dict, List
+from src.models.event import db
+
+
+class ScrapeRun(db.Model):
+    """History of scheduler update runs"""
+
+    __tablename__ = 'scrape_runs'
+
+    id = db.Column(db.Integer, primary_key=True)
+    started_at = db.Column(db.DateTime, nullable=False, index=True)
+    finished_at = db.Column(db.DateTime)
+    duration_seconds = db.Column(db.Float)
+    trigger = db.Column(db.String(20))  # 'scheduled' or 'manual'
+    status = db.Column(db.String(20))  # 'success', 'partial', 'failed', 'cancelled'
+    events_processed = db.Column(db.Integer, default=0)
+    error_count = db.Column(db.Integer, default=0)
+    errors = db.Column(db.Text)  # JSON list of error messages
+    sources = db.Column(db.Text)  # JSON per-source results
+
+    # Number of runs kept in the table
+    MAX_HISTORY = 500
+
+    def __repr__(self):
+        return f'<ScrapeRun {self.started_at} {self.status}>'
+
+    def to_dict(self) -> Dict:
+        """Convert run to dictionary for API responses"""
+        return {
+            'id': self.id,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'duration_seconds': self.duration_seconds,
+            'trigger': self.trigger,
+            'status': self.status,
+            'events_processed': self.events_processed,
+            'error_count': self.error_count,
+            'errors': json.loads(self.errors) if self.errors else [],
+            'sources': json.loads(self.sources) if self.sources else {}
+        }
+
+    @classmethod
+    def record(cls, started_at: datetime, trigger: str, result: Dict = None, error: str = None) -> 'ScrapeRun':
+        """Store a finished run and prune history beyond MAX_HISTORY"""
+        result = result or {}
+        finished_at = datetime.utcnow()
+        errors = list(result.get('errors', []))
+        if error:
+            errors.append(error)
+
+        if error:
+            status = 'failed'
+        elif result.get('cancelled'):
+            status = 'cancelled'
+        elif errors:
+            status = 'partial'
+        else:
+            status = 'success'
+
+        run = cls(
+            started_at=started_at,
+            finished_at=finished_at,
+            duration_seconds=(finished_at - started_at).total_seconds(),
+            trigger=trigger,
+            status=status,
+            events_processed=result.get('total_events', 0),
+            error_count=len(errors),
+            errors=json.dumps(errors),
+            sources=json.dumps(result.get('sources', {}))
+        )
+        db.session.add(run)
+        db.session.flush()
+
+        # Keep the table bounded
+        cutoff = cls.query.order_by(cls.id.desc()).offset(cls.MAX_HISTORY).first()
+        if cutoff:
+            cls.query.filter(cls.id <= cutoff.id).delete(synchronize_session=False)
+
+        db.session.commit()
+        return run
+
+    @classmethod
+    def recent(cls, limit: int = 10) -> List[Dict]:
+        """Most recent runs, newest first"""
+        return [run.to_dict() for run in cls.query.order_by(cls.id.desc()).limit(limit)]
@@ -0,0 +1,306 @@
+import logging
+from datetime import datetime, timedelta
+from types import MappingProxyType
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Type
+from src.scrapers.iamsterdam_scraper import IAmsterdamScraper
+from src.scrapers.eventbrite_scraper import EventbriteScraper
+from src.scrapers.adaptive_schedule import AdaptiveSchedule
+from src.scrapers.cancellation import CancellationToken
+from src.scrapers.circuit_breaker import CircuitBreaker, mount_circuit_breaker
+
+logger = logging.getLogger(__name__)
+
+# Scheduler ticks firing this much before a source's interval is up still scrape it
+DUE_TOLERANCE = timedelta(seconds=30)
+
+
+class EventSource:
+    """
+    Base class for event source plugins
+
+    A source fetches raw documents, parses them into event dictionaries and
+    normalizes each event before it is written. Subclasses register
+    themselves with @register_source.
+    """
+
+    # Key used in update results, e.g. 'iamsterdam'
+    key: str = ''
+    # Value stored in Event.source
+    name: str = ''
+    # Minutes between scrapes; None scrapes on every scheduler run
+    interval_minutes: Optional[int] = None
+    # Maximum concurrent HTTP requests against this source
+    max_concurrency: int = 1
+    # Maximum number of events per scrape
+    max_events: int = 25
+    # AdaptiveSchedule options; None keeps the fixed interval_minutes
+    adaptive: Optional[Mapping] = MappingProxyType({})
+    # Seconds a single scrape of this source may take
+    timeout_seconds: Optional[float] = 300
+    # CircuitBreaker options; None disables the breaker
+    circuit_breaker: Optional[Mapping] = MappingProxyType({})
+    # Download event images into the local image cache and serve them from /api/images
+    cache_images: bool = True
+
+    def __init__(self, **options):
+        for option, value in options.items():
+            if not hasattr(self, option):
+                raise ValueError(f"Unknown option for source {self.key}: {option}")
+            setattr(self, option, value)
+        # Own copies, so changing one source's options never touches the class defaults or other sources
+        if self.adaptive is not None:
+            self.adaptive = dict(self.adaptive)
+        if self.circuit_breaker is not None:
+            self.circuit_breaker = dict(self.circuit_breaker)
+        self.last_run: Optional[datetime] = None
+        self.cancel_token: Optional[CancellationToken] = None
+        self.schedule: Optional[AdaptiveSchedule] = None
+        if self.adaptive is not None:
+            schedule_options = {'initial_minutes': self.interval_minutes or 20}
+            schedule_options.update(self.adaptive)
+            self.schedule = AdaptiveSchedule(**schedule_options)
+        self.breaker: Optional[CircuitBreaker] = None
+        if self.circuit_breaker is not None:
+            self.breaker = CircuitBreaker(self.name, **self.circuit_breaker)
+
+    def guard_session(self, session):
+        """Route a requests session of this source through its circuit breaker"""
+        if self.breaker:
+            mount_circuit_breaker(session, self.breaker)
+        return session
+
+    def fetch(self) -> Iterable:
+        """Fetch raw documents (pages, API responses) from the source"""
+        raise NotImplementedError
+
+    def split(self, raw) -> Iterable:
+        """
+        Cut a fetched document into units parsed independently (runs in-process)
+
+        The default keeps the document whole. Sources whose documents hold
+        many independent records (e.g. event containers of a listing page)
+        yield them one by one, so the parse pool can spread them over its
+        workers. Units must be picklable.
+        """
+        return (raw,)
+
+    def parse(self, raw) -> Iterable[Dict]:
+        """
+        Parse one unit from split() into event dictionaries, ideally lazily as a generator
+
+        Must be CPU-only (no network access) so it can run in a parse
+        worker process; put I/O such as detail page fetches in enrich.
+        """
+        raise NotImplementedError
+
+    def enrich(self, events: Iterable[Dict]) -> Iterable[Dict]:
+        """Add data that needs further I/O to parsed events (runs in-process)"""
+        return events
+
+    def parse_options(self) -> Dict:
+        """Options a parse worker needs to recreate this source for parse()"""
+        return {'max_events': self.max_events}
+
+    def normalize(self, event: Dict) -> Optional[Dict]:
+        """Validate and complete an event; return None to drop it"""
+        if not event.get('title') or not event.get('date'):
+            logger.warning(f"Skipping event with missing required fields: {event}")
+            return None
+        event['source'] = self.name
+        return event
+
+    def scrape(self, cancel_token: Optional[CancellationToken] = None) -> Iterator[Dict]:
+        """
+        Yield normalized events: fetch -> split -> parse -> enrich -> normalize -> cache images
+
+        Parsing runs in the parse process pool when PARSE_WORKERS is set.
+        Raises CancelledError between events once cancel_token is cancelled
+        or past its deadline; fetch and enrich can read self.cancel_token to
+        bound their own requests.
+        """
+        from src.scrapers.parsing import get_parse_pool
+        from src.scrapers.image_cache import get_image_cache
+
+        self.cancel_token = cancel_token or CancellationToken()
+        count = 0
+        for events in get_parse_pool().parse_pages(self, self.fetch()):
+            self.cancel_token.check()
+            events = self._normalized(self.enrich(events))
+            if self.cache_images:
+                events = get_image_cache().iter_localized(events, cancel_token=self.cancel_token)
+            for event in events:
+                self.cancel_token.check()
+                yield event
+                count += 1
+                if count >= self.max_events:
+                    return
+
+    def _normalized(self, events: Iterable[Dict]) -> Iterator[Dict]:
+        for event in events:
+            self.cancel_token.check()
+            event = self.normalize(event)
+            if event is not None:
+                yield event
+
+    def current_interval(self, now: Optional[datetime] = None) -> Optional[float]:
+        """Minutes between scrapes right now; None scrapes on every scheduler run"""
+        if self.schedule:
+            return self.schedule.current_interval(now)
+        return self.interval_minutes
+
+    def min_interval(self) -> Optional[float]:
+        """Shortest interval this source may ask for"""
+        if self.schedule:
+            return self.schedule.min_minutes
+        return self.interval_minutes
+
+    def is_blocked(self) -> bool:
+        """Whether the circuit breaker currently rejects requests to this source"""
+        return self.breaker is not None and self.breaker.is_open()
+
+    def is_due(self, now: Optional[datetime] = None) -> bool:
+        """Whether the source's own schedule wants it scraped now"""
+        interval = self.current_interval(now)
+        if interval is None or self.last_run is None:
+            return True
+        now = now or datetime.utcnow()
+        return now - self.last_run >= timedelta(minutes=interval) - DUE_TOLERANCE
+
+    def record_run(self, result: Dict):
+        """Feed a completed run's change counts into the adaptive schedule"""
+        if self.schedule:
+            self.schedule.record_run(
+                new=result.get('events_new', 0),
+                changed=result.get('events_changed', 0),
+                removed=result.get('events_deactivated', 0),
+                total=result.get('events_processed', 0)
+            )
+
+    def get_status(self, now: Optional[datetime] = None) -> Dict:
+        """Schedule state for status endpoints"""
+        now = now or datetime.utcnow()
+        interval = self.current_interval(now)
+        status = {
+            'name': self.name,
+            'interval_minutes': interval,
+            'last_run': self.last_run.isoformat() if self.last_run else None,
+            'next_due': (
+                (self.last_run + timedelta(minutes=interval)).isoformat()
+                if self.last_run and interval is not None else None
+            )
+        }
+        if self.schedule:
+            status.update(self.schedule.to_dict(now))
+        if self.breaker:
+            status['circuit_breaker'] = self.breaker.to_dict()
+        return status
+
+
+# Registered source classes by key
+_registry: Dict[str, Type[EventSource]] = {}
+
+
+def register_source(source_class: Type[EventSource]) -> Type[EventSource]:
+    """Class decorator adding a source plugin to the registry"""
+    if not source_class.key:
+        raise ValueError(f"{source_class.__name__} must define a key")
+    _registry[source_class.key] = source_class
+    return source_class
+
+
+def get_registered_sources() -> Dict[str, Type[EventSource]]:
+    """Registered source classes by key"""
+    return dict(_registry)
+
+
+def create_sources(config: Optional[Dict[str, Dict]] = None) -> List[EventSource]:
+    """
+    Instantiate all registered sources
+
+    Args:
+        config: Per-source options keyed by source key, e.g.
+            {'eventbrite': {'max_concurrency': 4}}; 'enabled': False skips a source
+    """
+    config = config or {}
+    sources = []
+    for key, source_class in _registry.items():
+        options = dict(config.get(key, {}))
+        if not options.pop('enabled', True):
+            continue
+        sources.append(source_class(**options))
+    return sources
+
+
+@register_source
+class IAmsterdamSource(EventSource):
+    """I amsterdam calendar"""
+
+    key = 'iamsterdam'
+    name = 'I amsterdam'
+    # Parse the calendar container by container while it downloads
+    stream_listing: bool = True
+
+    def __init__(self, **options):
+        super().__init__(**options)
+        self.scraper = IAmsterdamScraper(stream_listing=self.stream_listing)
+        self.guard_session(self.scraper.session)
+
+    def fetch(self) -> Iterable:
+        self.scraper.cancel_token = self.cancel_token
+        if self.stream_listing:
+            yield self.scraper.fetch_listing_stream()
+        else:
+            yield self.scraper.fetch_listing()
+
+    def split(self, raw) -> Iterable:
+        # A streamed page is cut into event containers as it downloads; each is parsed on its own
+        if self.stream_listing:
+            return self.scraper.iter_listing_containers(raw, self.max_events)
+        return (raw,)
+
+    def parse(self, raw) -> Iterable[Dict]:
+        if self.stream_listing:
+            event = self.scraper.parse_container(raw)
+            return [event] if event else []
+        return self.scraper.iter_listing(raw, self.max_events)
+
+    def parse_options(self) -> Dict:
+        return {'max_events': self.max_events, 'stream_listing': self.stream_listing}
+
+
+@register_source
+class EventbriteSource(EventSource):
+    """Eventbrite free events in Amsterdam"""
+
+    key = 'eventbrite'
+    name = 'Eventbrite'
+    max_concurrency = 4
+    # Prefer JSON-LD/embedded page data over DOM scraping and detail fetches
+    structured_first: bool = True
+
+    def __init__(self, **options):
+        super().__init__(**options)
+        self.scraper = EventbriteScraper(structured_first=self.structured_first)
+        self.guard_session(self.scraper.session)
+
+    def fetch(self) -> Iterable[bytes]:
+        self.scraper.cancel_token = self.cancel_token
+        yield self.scraper.fetch_listing()
+
+    def parse(self, raw: bytes) -> Iterable[Dict]:
+        return self.scraper.iter_listing(raw, self.max_events, fetch_details=False)
+
+    def enrich(self, events: Iterable[Dict]) -> Iterable[Dict]:
+        from src.scrapers.parsing import get_parse_pool
+
+        # Event pages are fetched by the enrich threads and parsed in the parse pool when it is enabled
+        pool = get_parse_pool()
+        self.scraper.detail_parser = (lambda content: pool.call(self, 'parse_detail', content)) if pool.enabled else None
+        return self.scraper.iter_with_details(events, max_workers=self.max_concurrency)
+
+    def parse_detail(self, raw: bytes) -> Dict:
+        """Details from a fetched event page (CPU-only, may run in a parse worker)"""
+        return self.scraper.parse_event_details(raw)
+
+    def parse_options(self) -> Dict:
+        return {'max_events': self.max_events, 'structured_first': self.structured_first}
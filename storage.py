@@ -0,0 +1,137 @@
+import os
+import logging
+from typing import Dict
+from sqlalchemy import inspect, text
+from sqlalchemy.orm import scoped_session, sessionmaker
+from flask import current_app
+from src.models.event import db
+
+logger = logging.getLogger(__name__)
+
+REPLICA_BIND = 'replica'
+
+# Trigram indexes backing the ILIKE search in Event.get_active_events
+POSTGRES_SEARCH_INDEXES = {
+    'ix_events_title_trgm': 'title',
+    'ix_events_description_trgm': 'description',
+    'ix_events_location_trgm': 'location',
+}
+
+
+def _normalize_uri(uri: str) -> str:
+    """Accept the postgres:// scheme used by most hosting providers"""
+    if uri.startswith('postgres://'):
+        return 'postgresql://' + uri[len('postgres://'):]
+    return uri
+
+
+def configure_database(app, default_uri: str):
+    """
+    Configure the primary (write) and optional replica (read) databases
+
+    Reads DATABASE_URL for the primary and DATABASE_REPLICA_URL for the
+    read replica. Without a replica all reads go to the primary.
+    """
+    primary_uri = _normalize_uri(os.environ.get('DATABASE_URL', default_uri))
+    replica_uri = os.environ.get('DATABASE_REPLICA_URL')
+
+    app.config['SQLALCHEMY_DATABASE_URI'] = primary_uri
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+
+    engine_options: Dict = {'pool_pre_ping': True}
+    if not primary_uri.startswith('sqlite'):
+        engine_options['pool_size'] = int(os.environ.get('DATABASE_POOL_SIZE', 5))
+    app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', engine_options)
+
+    if replica_uri:
+        app.config['SQLALCHEMY_BINDS'] = {REPLICA_BIND: _normalize_uri(replica_uri)}
+        logger.info("Database reads will use the configured replica")
+
+
+def init_storage(app):
+    """Set up the read session and backend-specific features (needs app context)"""
+    replica_session = None
+    if REPLICA_BIND in app.config.get('SQLALCHEMY_BINDS', {}):
+        replica_session = scoped_session(sessionmaker(bind=db.engines[REPLICA_BIND]))
+
+        @app.teardown_appcontext
+        def remove_replica_session(exception=None):
+            replica_session.remove()
+
+    app.extensions['storage'] = {'read_session': replica_session}
+
+    _ensure_columns()
+    _ensure_indexes()
+    _backfill_change_seq()
+
+    if dialect_name() == 'postgresql':
+        _create_postgres_search_indexes()
+
+
+def read_session():
+    """Session for read-only queries, bound to the replica when one is configured"""
+    storage = current_app.extensions.get('storage', {})
+    return storage.get('read_session') or db.session
+
+
+def dialect_name(session=None) -> str:
+    """Name of the SQL dialect behind the primary database"""
+    session = session or db.session
+    return session.get_bind().dialect.name
+
+
+def _ensure_columns():
+    """Add nullable model columns missing from tables that predate them"""
+    engine = db.engine
+    inspector = inspect(engine)
+    for table in db.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column['name'] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing or not column.nullable:
+                continue
+            column_type = column.type.compile(dialect=engine.dialect)
+            try:
+                with engine.begin() as connection:
+                    connection.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+                logger.info(f"Added column {table.name}.{column.name}")
+            except Exception as e:
+                logger.warning(f"Could not add column {table.name}.{column.name}: {str(e)}")
+
+
+def _backfill_change_seq():
+    """Give events that predate the change feed sequence number 0, so full syncs include them"""
+    try:
+        with db.engine.begin() as connection:
+            result = connection.execute(text('UPDATE events SET change_seq = 0 WHERE change_seq IS NULL'))
+        if result.rowcount:
+            logger.info(f"Set change_seq of {result.rowcount} existing events")
+    except Exception as e:
+        logger.warning(f"Could not backfill events.change_seq: {str(e)}")
+
+
+def _ensure_indexes():
+    """Create model indexes missing from tables that predate them"""
+    engine = db.engine
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            try:
+                index.create(bind=engine, checkfirst=True)
+            except Exception as e:
+                logger.warning(f"Could not create index {index.name}: {str(e)}")
+
+
+def _create_postgres_search_indexes():
+    """Create pg_trgm GIN indexes so substring search can use an index"""
+    try:
+        db.session.execute(text('CREATE EXTENSION IF NOT EXISTS pg_trgm'))
+        for index_name, column in POSTGRES_SEARCH_INDEXES.items():
+            db.session.execute(text(
+                f'CREATE INDEX IF NOT EXISTS {index_name} '
+                f'ON events USING gin ({column} gin_trgm_ops)'
+            ))
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        logger.warning(f"Could not create trigram search indexes: {str(e)}")
@@ -0,0 +1,242 @@
+"""
+Synthetic event data for load tests and benchmarks
+
+Usage:
+    python -m src.scrapers.synthetic --count 1000000             # into DATABASE_URL
+    python -m src.scrapers.synthetic --count 1000 --jsonl -      # JSON lines to stdout
+"""
+import sys
+import json
+import time
+import random
+import logging
+import argparse
+from datetime import date, timedelta
+from itertools import islice
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from src.models.event import Event, db
+from src.scrapers.geocoder import GAZETTEER
+
+logger = logging.getLogger(__name__)
+
+# Categories with their share of generated events
+CATEGORIES = ['Music', 'Art & Culture', 'Community', 'Sports & Fitness', 'Entertainment', 'Wellness']
+CATEGORY_WEIGHTS = [30, 22, 16, 12, 12, 8]
+TOPICS = {
+    'Music': ['Free Concert', 'Jazz Night', 'Open Mic', 'DJ Set', 'Choir Performance', 'Lunchtime Recital',
+              'Singer-Songwriter Session', 'Brass Band Parade'],
+    'Art & Culture': ['Gallery Opening', 'Exhibition Tour', 'Street Art Walk', 'Poetry Reading', 'Film Screening',
+                      'Architecture Walk', 'Museum Late', 'Photography Meetup'],
+    'Community': ['Community Lunch', 'Language Exchange', 'Networking Meetup', 'Repair Cafe', 'Neighbourhood Market',
+                  'Clothes Swap', 'Volunteer Day', 'Book Club'],
+    'Sports & Fitness': ['Yoga in the Park', 'Group Run', 'Bootcamp', 'Cycling Tour', 'Football Clinic',
+                         'Tai Chi', 'Outdoor Dance Class', 'Canal Swim'],
+    'Entertainment': ['Comedy Show', 'Quiz Night', 'Board Game Evening', 'Karaoke', 'Silent Disco',
+                      'Drag Bingo', 'Improv Theatre', 'Magic Show'],
+    'Wellness': ['Meditation Session', 'Breathwork Class', 'Mindfulness Walk', 'Sound Bath', 'Wellness Workshop',
+                 'Forest Bathing', 'Journaling Circle', 'Stretch & Relax'],
+}
+ADJECTIVES = ['Sunday', 'Late-Night', 'Outdoor', 'Beginner-Friendly', 'Family', 'Summer', 'Autumn',
+              'Monthly', 'Pop-Up']
+THEMES = ['Amsterdam Edition', 'Local Talent', 'Open to All', 'Spring Special', 'Neighbourhood Edition',
+          'International Night', 'Season Opener', 'Charity Special']
+HOSTS = ['Local Artists', 'the Community Choir', 'DJ Nova', 'Students of the Conservatory', 'Amsterdam Runners',
+         'the Library Team', 'Guest Speakers', 'Resident Collective']
+
+# (name, address, gazetteer key) with a popularity weight; a few venues host most events
+VENUES: List[Tuple[str, str, str, int]] = [
+    ('Vondelpark', 'Vondelpark 1, Amsterdam', 'vondelpark', 40),
+    ('Paradiso', 'Weteringschans 6-8, Amsterdam', 'paradiso', 30),
+    ('Melkweg', 'Lijnbaansgracht 234A, Amsterdam', 'melkweg', 25),
+    ('OBA Oosterdok', 'Oosterdok 143, Amsterdam', 'oba oosterdok', 25),
+    ('NDSM Wharf', 'NDSM-Plein 28, Amsterdam', 'ndsm', 20),
+    ('Westergas', 'Pazzanistraat 37, Amsterdam', 'westergas', 20),
+    ('De Hallen', 'Hannie Dankbaarpassage 47, Amsterdam', 'de hallen', 15),
+    ('Muziekgebouw', 'Piet Heinkade 1, Amsterdam', 'muziekgebouw', 15),
+    ('Zoku Amsterdam', 'Weesperstraat 105, Amsterdam', 'zoku amsterdam', 10),
+    ('Pakhuis de Zwijger', 'Piet Heinkade 179, Amsterdam', 'pakhuis de zwijger', 15),
+    ('Bimhuis', 'Piet Heinkade 3, Amsterdam', 'bimhuis', 10),
+    ('Concertgebouw', 'Concertgebouwplein 10, Amsterdam', 'concertgebouw', 12),
+    ('Museumplein', 'Museumplein, Amsterdam', 'museumplein', 12),
+    ('Westerpark', 'Westerpark, Amsterdam', 'westerpark', 15),
+    ('Oosterpark', 'Oosterpark, Amsterdam', 'oosterpark', 12),
+    ('Sarphatipark', 'Sarphatipark, Amsterdam', 'sarphatipark', 8),
+    ('Amsterdamse Bos', 'Bosbaanweg 5, Amstelveen', 'amsterdamse bos', 8),
+    ('De Balie', 'Kleine-Gartmanplantsoen 10, Amsterdam', 'de balie', 8),
+    ('Tolhuistuin', 'IJpromenade 2, Amsterdam', 'tolhuistuin', 8),
+    ('Pllek', 'T.T. Neveritaweg 59, Amsterdam', 'pllek', 6),
+    ('Felix Meritis', 'Keizersgracht 324, Amsterdam', 'felix meritis', 5),
+    ('Hortus Botanicus', 'Plantage Middenlaan 2a, Amsterdam', 'hortus botanicus', 5),
+]
+VENUE_WEIGHTS = [venue[3] for venue in VENUES]
+
+SOURCES = ['I amsterdam', 'Eventbrite']
+SOURCE_URLS = {
+    'I amsterdam': 'https://www.iamsterdam.com/en/whats-on/calendar/',
+    'Eventbrite': 'https://www.eventbrite.com/e/',
+}
+COSTS = ['Free', 'Free', 'Free', 'Free (donation welcome)', 'Free with registration']
+
+# Changes one source makes to another source's title for the same event
+NEAR_DUPLICATE_VARIANTS: List[Callable[[str], str]] = [
+    lambda title: f'FREE: {title}',
+    lambda title: f'{title} - Amsterdam',
+    lambda title: f'{title} (Free Entry)',
+    lambda title: title.lower(),
+]
+
+# Recent events that duplicates and near-duplicates are drawn from
+DUPLICATE_WINDOW = 256
+
+
+def _title(rng: random.Random, topic: str, venue: str) -> str:
+    template = rng.randrange(5)
+    if template == 0:
+        return topic
+    if template == 1:
+        return f'{topic} at {venue}'
+    if template == 2:
+        return f'{rng.choice(ADJECTIVES)} {topic}'
+    if template == 3:
+        return f'{topic}: {rng.choice(THEMES)}'
+    return f'{topic} with {rng.choice(HOSTS)}'
+
+
+def _time(rng: random.Random, category: str) -> str:
+    if category == 'Community' and rng.random() < 0.2:
+        return 'All day'
+    hour = rng.randint(7, 10) if category in ('Sports & Fitness', 'Wellness') and rng.random() < 0.5 else rng.randint(11, 22)
+    minute = rng.choice((0, 0, 0, 30))
+    if rng.random() < 0.15:
+        return f'{hour:02d}:{minute:02d}'
+    end = min(hour + rng.randint(1, 3), 23)
+    return f'{hour:02d}:{minute:02d} - {end:02d}:{minute:02d}'
+
+
+def _original(rng: random.Random, index: int, first_day: date, span: int) -> Dict:
+    category = rng.choices(CATEGORIES, CATEGORY_WEIGHTS)[0]
+    venue, address, gazetteer_key, _ = rng.choices(VENUES, VENUE_WEIGHTS)[0]
+    latitude, longitude = GAZETTEER[gazetteer_key]
+    source = rng.choice(SOURCES)
+    topic = rng.choice(TOPICS[category])
+    return {
+        # The running number keeps (title, date, source) unique across millions of events
+        'title': f'{_title(rng, topic, venue)} #{index + 1}',
+        'description': f'{topic} at {venue}. {rng.choice(THEMES)}, everyone is welcome.',
+        'date': (first_day + timedelta(days=rng.randrange(span))).strftime('%Y-%m-%d'),
+        'time': _time(rng, category),
+        'location': venue,
+        'address': address,
+        'category': category,
+        'cost': rng.choice(COSTS),
+        'organizer': venue,
+        'source': source,
+        'image': 'https://via.placeholder.com/400x250',
+        'source_url': f'{SOURCE_URLS[source]}{index + 1}',
+        'latitude': latitude,
+        'longitude': longitude,
+    }
+
+
+def _duplicate(rng: random.Random, original: Dict, near: bool) -> Dict:
+    """The same event as listed by the other source, optionally with a reworded title"""
+    copy = dict(original)
+    copy['source'] = SOURCES[1 - SOURCES.index(original['source'])]
+    copy['source_url'] = SOURCE_URLS[copy['source']] + original['source_url'].rsplit('/', 1)[-1]
+    if near:
+        copy['title'] = rng.choice(NEAR_DUPLICATE_VARIANTS)(original['title'])
+        if rng.random() < 0.3:
+            copy['description'] = original['description'].split('.')[0] + '.'
+    return copy
+
+
+def generate_events(count: int, seed: int = 0, start: Optional[date] = None, days: int = 180,
+                    past_days: int = 7, duplicate_rate: float = 0.05,
+                    near_duplicate_rate: float = 0.10) -> Iterator[Dict]:
+    """
+    Yield count synthetic scraped events, reproducible for a given seed
+
+    Categories and venues are skewed like real listings, dates are spread
+    from past_days before start (today by default) to days after it.
+    About duplicate_rate of the events are exact copies of a recent event
+    listed by the other source, and near_duplicate_rate are copies with a
+    reworded title. Every event has a distinct (title, date, source) key,
+    so count events give count rows in an empty database.
+    """
+    rng = random.Random(seed)
+    first_day = (start or date.today()) - timedelta(days=past_days)
+    span = past_days + days
+    recent: List[Dict] = []
+    for index in range(count):
+        roll = rng.random()
+        if recent and roll < duplicate_rate + near_duplicate_rate:
+            # Each event is copied at most once, so copies never collide
+            original = recent.pop(rng.randrange(len(recent)))
+            yield _duplicate(rng, original, near=roll >= duplicate_rate)
+            continue
+        event = _original(rng, index, first_day, span)
+        recent.append(event)
+        if len(recent) > DUPLICATE_WINDOW:
+            recent.pop(0)
+        yield event
+
+
+def seed_events(count: int, batch_size: int = 5000, seed: int = 0, days: int = 180) -> int:
+    """
+    Bulk insert count synthetic events (requires app context)
+
+    Each batch is one multi-row insert and one commit. Events that already
+    exist are skipped, so seeding the same seed twice adds nothing.
+
+    Returns:
+        Number of inserted events
+    """
+    logger.info(f"Seeding database with {count} synthetic events")
+    start = time.perf_counter()
+    events = generate_events(count, seed=seed, days=days)
+    inserted = 0
+    try:
+        while True:
+            batch = list(islice(events, batch_size))
+            if not batch:
+                break
+            inserted += Event.bulk_insert(batch)
+            db.session.commit()
+    except Exception as e:
+        logger.error(f"Error seeding synthetic data: {str(e)}")
+        db.session.rollback()
+        raise
+
+    elapsed = time.perf_counter() - start
+    logger.info(f"Seeded {inserted} synthetic events in {elapsed:.1f}s ({inserted / max(elapsed, 1e-9):.0f}/s)")
+    return inserted
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--days', type=int, default=180, help='Spread event dates over this many days')
+    parser.add_argument('--batch-size', type=int, default=5000)
+    parser.add_argument('--jsonl', help='Write events as JSON lines to this file (- for stdout) instead of the database')
+    args = parser.parse_args()
+
+    if args.jsonl:
+        output = sys.stdout if args.jsonl == '-' else open(args.jsonl, 'w')
+        try:
+            for event in generate_events(args.count, seed=args.seed, days=args.days):
+                output.write(json.dumps(event, ensure_ascii=False) + '\n')
+        finally:
+            if output is not sys.stdout:
+                output.close()
+        return
+
+    from src.main import create_app
+
+    app = create_app(start_scheduler=False)
+    with app.app_context():
+        seed_events(args.count, batch_size=args.batch_size, seed=args.seed, days=args.days)
+
+
+if __name__ == '__main__':
+    main()
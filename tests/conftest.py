@@ -0,0 +1,113 @@
+import os
+import sys
+import threading
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+# PostgreSQL database (postgresql://...) the storage tests also run against; skipped when unset or unreachable
+TEST_POSTGRES_URL = os.environ.get('TEST_POSTGRES_URL')
+
+
+@pytest.fixture
+def make_app(monkeypatch):
+    """Factory for apps from create_app() on given databases, without the scheduler"""
+
+    def make(database_url: str, replica_url: str = None):
+        monkeypatch.setenv('DATABASE_URL', database_url)
+        if replica_url:
+            monkeypatch.setenv('DATABASE_REPLICA_URL', replica_url)
+        else:
+            monkeypatch.delenv('DATABASE_REPLICA_URL', raising=False)
+        monkeypatch.setenv('SCHEDULER_ENABLED', '0')
+
+        from src.main import create_app
+
+        return create_app(start_scheduler=False)
+
+    return make
+
+
+@pytest.fixture
+def sqlite_url(tmp_path):
+    return f"sqlite:///{tmp_path / 'events.db'}"
+
+
+@pytest.fixture
+def app(make_app, sqlite_url):
+    return make_app(sqlite_url)
+
+
+@pytest.fixture(params=['sqlite', 'postgresql'])
+def database_url(request, sqlite_url):
+    """URL of each supported backend; its tables are dropped after the test"""
+    if request.param == 'sqlite':
+        return sqlite_url
+    if not TEST_POSTGRES_URL:
+        pytest.skip('TEST_POSTGRES_URL is not set')
+
+    from sqlalchemy import create_engine
+
+    try:
+        engine = create_engine(TEST_POSTGRES_URL)
+        with engine.connect():
+            pass
+        engine.dispose()
+    except Exception as e:
+        pytest.skip(f'PostgreSQL is not available: {str(e)}')
+    return TEST_POSTGRES_URL
+
+
+@pytest.fixture
+def db_app(make_app, database_url):
+    """App on each backend, with its tables dropped afterwards"""
+    from src.models.event import db
+
+    app = make_app(database_url)
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
+
+
+class StandInServer:
+    """Local HTTP server answering GET requests from a {path: (status, headers, body)} dict"""
+
+    def __init__(self):
+        self.routes = {}
+        self.requests = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests.append(self.path)
+                status, headers, body = server.routes.get(self.path, (404, {}, b'not found'))
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.httpd.server_address[1]}'
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def add(self, path: str, body: bytes, content_type: str = 'text/html; charset=utf-8', status: int = 200,
+            headers: dict = None):
+        self.routes[path] = (status, dict({'Content-Type': content_type}, **(headers or {})), body)
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def stand_in_server():
+    """Local stand-in for the scraped sites"""
+    server = StandInServer()
+    yield server
+    server.close()
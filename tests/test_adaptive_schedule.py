@@ -0,0 +1,43 @@
+from datetime import datetime
+from src.scrapers.adaptive_schedule import AdaptiveSchedule
+
+
+def test_quiet_hours_multiply_the_interval_in_local_time():
+    schedule = AdaptiveSchedule(initial_minutes=20, max_minutes=180)
+
+    # 01:00 - 07:00 Amsterdam time is 23:00 - 05:00 UTC in summer and 00:00 - 06:00 UTC in winter
+    assert schedule.current_interval(datetime(2030, 7, 1, 23, 30)) == 80
+    assert schedule.current_interval(datetime(2030, 7, 1, 5, 30)) == 20
+    assert schedule.current_interval(datetime(2030, 1, 15, 5, 30)) == 80
+    assert schedule.current_interval(datetime(2030, 1, 15, 23, 30)) == 20
+    assert schedule.to_dict(datetime(2030, 1, 15, 5, 30))['quiet_hours']
+
+    # Still capped at max_minutes
+    schedule.interval_minutes = 60
+    assert schedule.current_interval(datetime(2030, 7, 1, 23, 30)) == 180
+
+
+def test_quiet_hours_may_span_midnight_or_be_disabled():
+    schedule = AdaptiveSchedule(initial_minutes=20, quiet_hours=('23:00', '06:00'), quiet_multiplier=3,
+                                timezone_name='UTC')
+    assert [schedule.current_interval(datetime(2030, 7, 1, hour)) for hour in (22, 23, 0, 5, 6)] == [20, 60, 60, 60, 20]
+
+    schedule = AdaptiveSchedule(initial_minutes=20, quiet_hours=None)
+    assert schedule.current_interval(datetime(2030, 7, 1, 23, 30)) == 20
+
+
+def test_change_rate_halves_or_stretches_the_base_interval():
+    schedule = AdaptiveSchedule(initial_minutes=20, min_minutes=10, max_minutes=45, smoothing=1)
+
+    schedule.record_run(new=5, changed=5, removed=0, total=40)
+    assert schedule.interval_minutes == 10
+    schedule.record_run(new=5, changed=5, removed=0, total=40)
+    assert schedule.interval_minutes == 10
+
+    for expected in (15, 22.5, 33.75, 45, 45):
+        schedule.record_run(new=0, changed=0, removed=0, total=40)
+        assert schedule.interval_minutes == expected
+
+    # Between idle_rate and busy_rate the interval stays put
+    schedule.record_run(new=2, changed=2, removed=0, total=40)
+    assert schedule.interval_minutes == 45
@@ -0,0 +1,18 @@
+from src.instrumentation import db_statements_total, init_instrumentation
+from src.models.event import Event, db
+
+
+def test_create_app_boots_and_serves_health(app):
+    response = app.test_client().get('/api/health')
+    assert response.status_code == 200
+    assert response.get_json()['status'] == 'healthy'
+
+
+def test_engines_are_instrumented_once(app):
+    with app.app_context():
+        # A second call must not register a second pair of listeners
+        init_instrumentation(app)
+        before = db_statements_total.value(operation='SELECT')
+        Event.query.count()
+        assert db_statements_total.value(operation='SELECT') == before + 1
+        db.session.remove()
@@ -0,0 +1,84 @@
+import json
+from datetime import datetime
+from src.broadcast import Broadcaster, UpdateNotifier
+from src.models.event import Event, db
+from src.models.scrape_run import ScrapeRun
+from src.routes import events as events_routes
+
+
+def messages(subscriber):
+    """(id, data) of the messages queued for a subscriber"""
+    queued = []
+    while not subscriber.queue.empty():
+        item = subscriber.queue.get_nowait()
+        if item is None:
+            break
+        fields = dict(line.split(': ', 1) for line in item[1].decode('utf-8').strip().split('\n'))
+        queued.append((int(fields['id']), json.loads(fields['data'])))
+    return queued
+
+
+def test_reconnecting_clients_replay_the_history_after_last_event_id():
+    broadcaster = Broadcaster(history_size=3)
+    for message_id in range(1, 6):
+        broadcaster.publish('update', {'run_id': message_id}, message_id=message_id)
+
+    assert [message_id for message_id, _ in messages(broadcaster.subscribe('3'))] == [4, 5]
+    # Older than the history: everything still kept
+    assert [message_id for message_id, _ in messages(broadcaster.subscribe('1'))] == [3, 4, 5]
+    assert messages(broadcaster.subscribe('5')) == []
+    assert messages(broadcaster.subscribe()) == []
+    assert messages(broadcaster.subscribe('not-a-number')) == []
+
+    # Live messages follow the replayed ones
+    subscriber = broadcaster.subscribe('4')
+    broadcaster.publish('update', {'run_id': 6}, message_id=6)
+    assert messages(subscriber) == [(5, {'run_id': 5}), (6, {'run_id': 6})]
+
+
+def test_clients_falling_behind_are_dropped():
+    broadcaster = Broadcaster()
+    slow = broadcaster.subscribe()
+    slow.queue.maxsize = 2
+    for message_id in range(1, 4):
+        broadcaster.publish('update', {'run_id': message_id}, message_id=message_id)
+
+    assert slow.closed
+    assert len(broadcaster) == 0
+
+
+def test_stream_replays_run_summaries_after_last_event_id(db_app, monkeypatch):
+    broadcaster = Broadcaster()
+    notifier = UpdateNotifier(broadcaster)
+    monkeypatch.setattr(events_routes, 'broadcaster', broadcaster)
+    monkeypatch.setattr(notifier, 'start_watcher', lambda app: None)
+    monkeypatch.setattr(events_routes, 'update_notifier', notifier)
+
+    with db_app.app_context():
+        notifier.prime()
+        runs = []
+        for index in range(2):
+            started_at = datetime.utcnow()
+            Event.upsert_events([{'title': f'Concert #{index}', 'date': '2030-05-01', 'source': 'Test'}])
+            db.session.commit()
+            run = ScrapeRun.record(started_at, 'scheduled', {'total_events': 1})
+            runs.append(run.id)
+            assert notifier.publish_run(run)['counts'] == {'new': 1, 'changed': 0, 'removed': 0}
+        # Published once only
+        assert notifier.publish_run(run) is None
+
+    response = db_app.test_client().get('/api/events/stream', headers={'Last-Event-ID': str(runs[0])},
+                                        buffered=False)
+    assert response.mimetype == 'text/event-stream'
+    assert response.headers['Cache-Control'] == 'no-cache'
+    body = iter(response.response)
+    assert next(body).startswith(b'retry: ')
+    message = next(body).decode('utf-8')
+    response.close()
+
+    assert f'id: {runs[1]}\n' in message
+    summary = json.loads(message.split('data: ', 1)[1])
+    assert summary['run_id'] == runs[1]
+    assert [event['title'] for event in summary['new']] == ['Concert #1']
+    assert len(broadcaster) == 0
+
@@ -0,0 +1,50 @@
+from src.models.event import Event, db
+
+
+def event_data(title, **values):
+    return dict({'title': title, 'date': '2030-05-01', 'time': '20:00', 'location': 'Paradiso',
+                 'category': 'Music', 'source': 'Test'}, **values)
+
+
+def read_feed(client, since='', limit=2):
+    """All changes after since, page by page, and the final token"""
+    changes, pages = [], 0
+    while True:
+        page = client.get(f'/api/events/changes?since={since}&limit={limit}').get_json()
+        changes.extend(page['changes'])
+        since = page['token']
+        pages += 1
+        if not page['has_more']:
+            return changes, since, pages
+
+
+def test_change_feed_pages_through_events_sharing_a_change_seq(db_app):
+    client = db_app.test_client()
+    with db_app.app_context():
+        # One upsert batch: all five events get the same change_seq, pages break the tie on id
+        event_ids = Event.upsert_events([event_data(f'Concert #{index}') for index in range(5)])
+        db.session.commit()
+        ids = {event.title: event.id for event in Event.query}
+
+    changes, token, pages = read_feed(client)
+    assert [change['id'] for change in changes] == sorted(event_ids)
+    assert pages == 3
+
+    # Nothing new: same token, no changes
+    assert read_feed(client, token) == ([], token, 1)
+
+    with db_app.app_context():
+        Event.upsert_events([event_data('Concert #3', cost='EUR 5')] + [event_data(f'Concert #{index}') for index in (0, 1)])
+        Event.deactivate_old_events('Test', [ids[f'Concert #{index}'] for index in range(4)])
+        db.session.commit()
+
+    changes, _, _ = read_feed(client, token)
+    assert [(change['title'] if change['is_active'] else None) for change in changes] == ['Concert #3', None]
+    assert changes[0]['cost'] == 'EUR 5'
+    assert changes[1] == {'id': ids['Concert #4'], 'is_active': False}
+
+
+def test_change_feed_rejects_malformed_tokens(db_app):
+    client = db_app.test_client()
+    for token in ('abc', '12', '1-2-3', '-1-5'):
+        assert client.get(f'/api/events/changes?since={token}').status_code == 400
@@ -0,0 +1,82 @@
+from types import SimpleNamespace
+import pytest
+
+requests = pytest.importorskip('requests')
+
+from src.scrapers import circuit_breaker
+from src.scrapers.circuit_breaker import (
+    CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError, mount_circuit_breaker, parse_retry_after
+)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Manually advanced stand-in for the breaker's monotonic clock"""
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(circuit_breaker, 'time', SimpleNamespace(monotonic=lambda: clock.now))
+    return clock
+
+
+def guarded_session(breaker):
+    return mount_circuit_breaker(requests.Session(), breaker)
+
+
+def test_429_with_retry_after_opens_until_then_probes(stand_in_server, clock):
+    breaker = CircuitBreaker('Test', failure_threshold=3, reset_timeout=60)
+    session = guarded_session(breaker)
+    url = stand_in_server.url + '/events'
+
+    # A single 429 opens the circuit, for Retry-After seconds rather than reset_timeout
+    stand_in_server.add('/events', b'slow down', status=429, headers={'Retry-After': '120'})
+    assert session.get(url).status_code == 429
+    assert breaker.state == OPEN
+    clock.now += 100
+    with pytest.raises(CircuitOpenError):
+        session.get(url)
+    assert stand_in_server.requests == ['/events']
+
+    # After Retry-After one probe is let through; a 503 reopens with a doubled reset_timeout
+    clock.now += 20
+    stand_in_server.add('/events', b'unavailable', status=503)
+    assert not breaker.is_open()
+    assert session.get(url).status_code == 503
+    assert breaker.state == OPEN
+    clock.now += 119
+    assert breaker.is_open()
+
+    # The next probe succeeds and closes the circuit
+    clock.now += 1
+    stand_in_server.add('/events', b'ok')
+    assert session.get(url).status_code == 200
+    assert breaker.to_dict() == {'state': CLOSED, 'consecutive_failures': 0, 'retry_at': None,
+                                 'last_error': f'HTTP 503 from {url}'}
+    assert len(stand_in_server.requests) == 3
+
+
+def test_consecutive_errors_open_after_the_threshold(stand_in_server, clock):
+    breaker = CircuitBreaker('Test', failure_threshold=3, reset_timeout=60)
+    session = guarded_session(breaker)
+    stand_in_server.add('/events', b'error', status=500)
+
+    for _ in range(2):
+        session.get(stand_in_server.url + '/events')
+        assert breaker.state == CLOSED
+    session.get(stand_in_server.url + '/events')
+    assert breaker.state == OPEN
+    clock.now += 59
+    assert breaker.is_open()
+    clock.now += 1
+    assert not breaker.is_open()
+
+    # Half-open lets exactly one probe through until it reports back
+    assert breaker.allow_request()
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow_request()
+    assert breaker.is_open()
+
+
+def test_parse_retry_after_accepts_seconds_and_http_dates():
+    assert parse_retry_after('30') == 30
+    assert parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0
+    assert parse_retry_after('soon') is None
+    assert parse_retry_after(None) is None
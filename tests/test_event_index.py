@@ -0,0 +1,50 @@
+from itertools import product
+import pytest
+from src.models import event_index
+from src.models.event import Event
+from src.models.event_index import get_event_index, rebuild_event_index
+from src.models.storage import read_session
+from src.scrapers.synthetic import seed_events
+
+# Wildcards, short terms, case and accents exercise the LIKE semantics
+SEARCH_TERMS = [None, 'jazz', 'JAZZ', 'concert', 'vondelpark', 'free', '#12', 'a', 'ja', 'at par', 'yoga_',
+                '50%', '%', '_', 'café', 'no-such-term']
+DATE_FILTERS = [None, 'today', 'tomorrow', 'this-week', 'this-weekend', 'unknown']
+NEAR = [None, (52.3580, 4.8686), (52.3791, 4.9003)]
+
+
+@pytest.fixture
+def index_app(db_app, monkeypatch):
+    """db_app with synthetic events and no index left over from other tests"""
+    monkeypatch.setattr(event_index, '_index', None)
+    monkeypatch.setattr(event_index, '_attempted_at', float('-inf'))
+    with db_app.app_context():
+        seed_events(300, days=14)
+    return db_app
+
+
+def test_index_matches_the_database_on_every_filter_combination(index_app):
+    with index_app.app_context():
+        index = rebuild_event_index()
+        assert len(index) == 300
+
+        categories = [None, 'All'] + Event.get_categories() + ['Missing']
+        for search, category, date_filter, near in product(SEARCH_TERMS, categories, DATE_FILTERS, NEAR):
+            filters = {'search': search, 'category': category, 'date_filter': date_filter, 'near': near}
+            expected = [event.to_dict() for event in Event.get_active_events(**filters)]
+            # Radius queries set distance_km on the session's instances
+            read_session().expunge_all()
+            assert index.get_active_events(**filters) == expected, filters
+
+
+def test_stale_index_is_served_while_another_thread_rebuilds(index_app):
+    with index_app.app_context():
+        index = rebuild_event_index()
+        seed_events(10, seed=1, days=14)
+
+        with event_index._lock:
+            assert get_event_index(max_age=0) is index
+
+        rebuilt = get_event_index(max_age=0)
+        assert rebuilt.generation == index.generation + 1
+        assert len(rebuilt) == 310
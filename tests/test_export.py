@@ -0,0 +1,81 @@
+import io
+import csv
+import json
+import gzip
+import hashlib
+import pytest
+from src.models.event import Event, db
+from src.models.export import EXPORT_FIELDS, iter_export, write_export_files
+
+
+def seed(db_app):
+    """Active events with values CSV has to quote, plus one inactive event; returns the expected rows"""
+    with db_app.app_context():
+        Event.upsert_events([
+            {'title': f'Concert #{index}', 'date': '2030-05-01', 'source': 'Test', 'category': 'Music',
+             'description': 'Jazz, "live"\nand café', 'latitude': 52.36 + index / 1000, 'longitude': 4.88}
+            for index in range(7)
+        ] + [
+            {'title': 'No venue', 'date': '2030-05-02', 'source': 'Test', 'category': 'Art'},
+            {'title': 'Gone', 'date': '2030-05-02', 'source': 'Other', 'category': 'Art'}
+        ])
+        db.session.commit()
+        Event.deactivate_old_events('Other', [])
+        db.session.commit()
+        return [event.to_dict() for event in Event.query.filter(Event.is_active == True).order_by(Event.id)]
+
+
+def read_ndjson(data: bytes):
+    return [json.loads(line) for line in data.decode('utf-8').splitlines()]
+
+
+def read_csv(data: bytes):
+    return list(csv.DictReader(io.StringIO(data.decode('utf-8'), newline='')))
+
+
+def as_csv(events):
+    return [{field: '' if event[field] is None else str(event[field]) for field in EXPORT_FIELDS} for event in events]
+
+
+def test_ndjson_and_csv_exports_round_trip_across_chunks(db_app):
+    expected = seed(db_app)
+    assert len(expected) == 8
+
+    with db_app.app_context():
+        assert read_ndjson(b''.join(iter_export('ndjson', chunk_size=3))) == expected
+        assert read_csv(b''.join(iter_export('csv', chunk_size=3))) == as_csv(expected)
+        music = [event for event in expected if event['category'] == 'Music']
+        assert read_ndjson(b''.join(iter_export('ndjson', chunk_size=3, category='Music'))) == music
+
+    client = db_app.test_client()
+    response = client.get('/api/export?format=csv')
+    assert response.mimetype == 'text/csv'
+    assert read_csv(response.data) == as_csv(expected)
+    assert read_ndjson(client.get('/api/export').data) == expected
+    assert client.get('/api/export?format=xml').status_code == 400
+
+
+def test_export_files_are_gzipped_with_a_manifest(db_app, tmp_path):
+    expected = seed(db_app)
+
+    with db_app.app_context():
+        manifest = write_export_files(str(tmp_path), formats=['ndjson', 'csv'])
+
+    ndjson, csv_file = manifest['files']['ndjson'], manifest['files']['csv']
+    assert read_ndjson(gzip.decompress((tmp_path / ndjson['name']).read_bytes())) == expected
+    assert read_csv(gzip.decompress((tmp_path / csv_file['name']).read_bytes())) == as_csv(expected)
+    for entry in (ndjson, csv_file):
+        data = (tmp_path / entry['name']).read_bytes()
+        assert entry['events'] == len(expected)
+        assert (entry['bytes'], entry['sha256']) == (len(data), hashlib.sha256(data).hexdigest())
+    assert json.loads((tmp_path / 'manifest.json').read_text()) == manifest
+
+
+def test_parquet_export_round_trips(db_app):
+    parquet = pytest.importorskip('pyarrow.parquet')
+    expected = seed(db_app)
+
+    with db_app.app_context():
+        table = parquet.read_table(io.BytesIO(b''.join(iter_export('parquet', chunk_size=3))))
+    assert table.num_rows == len(expected)
+    assert table.to_pylist() == [{field: event[field] for field in EXPORT_FIELDS} for event in expected]
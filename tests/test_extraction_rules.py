@@ -0,0 +1,68 @@
+import os
+import sys
+import json
+import subprocess
+import pytest
+
+bs4 = pytest.importorskip('bs4')
+
+from src.scrapers.extraction_rules import DEFAULT_RULES, _load_overrides, compile_rules
+
+SRC_PARENT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+OVERRIDES = {
+    'Eventbrite': {
+        'title': [{'name': 'promo-heading', 'tags': ['h5'], 'class': 'promo-title'}]
+    },
+    'Uitagenda': {
+        'title': [{'name': 'heading', 'tags': ['h2']}]
+    }
+}
+
+
+def write_rules(tmp_path, rules) -> str:
+    path = tmp_path / 'rules.json'
+    path.write_text(rules if isinstance(rules, str) else json.dumps(rules), encoding='utf-8')
+    return str(path)
+
+
+def test_overrides_replace_only_the_fields_they_name(tmp_path):
+    rules = compile_rules(_load_overrides(write_rules(tmp_path, OVERRIDES)))
+    card = bs4.BeautifulSoup('<article><h3 class="event-card__title">Built-in</h3>'
+                             '<h5 class="Promo-Title">Override</h5></article>', 'html.parser')
+
+    assert [selector.name for selector in rules['Eventbrite'].title.selectors] == ['promo-heading']
+    # Class regexes match case-insensitively
+    assert rules['Eventbrite'].title.find(card).get_text() == 'Override'
+    # Other fields and sources keep the built-in rules; new sources are added
+    assert len(rules['Eventbrite'].location.selectors) == len(DEFAULT_RULES['Eventbrite']['location'])
+    assert len(rules['Eventbrite'].date_patterns.patterns) == len(DEFAULT_RULES['Eventbrite'].get('date_patterns', []))
+    assert [selector.name for selector in rules['I amsterdam'].title.selectors] == \
+        [rule['name'] for rule in DEFAULT_RULES['I amsterdam']['title']]
+    assert rules['Uitagenda'].title.find(bs4.BeautifulSoup('<h2>New</h2>', 'html.parser')).get_text() == 'New'
+
+
+def test_unreadable_rule_files_fall_back_to_the_built_in_rules(tmp_path):
+    assert _load_overrides(str(tmp_path / 'missing.json')) == {}
+    assert _load_overrides(write_rules(tmp_path, '{"Eventbrite": ')) == {}
+    assert _load_overrides(None) == {}
+
+
+def scraper_rules(rules_file: str) -> dict:
+    """Title rule names the scrapers use when started with EXTRACTION_RULES_FILE"""
+    script = ('import json\n'
+              'from src.scrapers.eventbrite_scraper import RULES\n'
+              'print(json.dumps([selector.name for selector in RULES.title.selectors]))\n')
+    env = dict(os.environ, EXTRACTION_RULES_FILE=rules_file,
+               PYTHONPATH=os.pathsep.join([SRC_PARENT] + sys.path))
+    output = subprocess.run([sys.executable, '-c', script], env=env, capture_output=True, text=True, check=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def test_extraction_rules_file_is_applied_at_import(tmp_path):
+    pytest.importorskip('requests')
+
+    assert scraper_rules(write_rules(tmp_path, OVERRIDES)) == ['promo-heading']
+    # An invalid regex in the file: the built-in rules are used instead
+    invalid = {'Eventbrite': {'title': [{'name': 'broken', 'tags': ['h3'], 'class': '(unclosed'}]}}
+    assert scraper_rules(write_rules(tmp_path, invalid)) == [rule['name'] for rule in DEFAULT_RULES['Eventbrite']['title']]
@@ -0,0 +1,68 @@
+import re
+import pytest
+from src.scrapers.html_stream import ContainerTokenizer, MAX_CONTAINER_CHARS, iter_containers
+
+CLASS_RE = re.compile('event|card|item')
+
+
+def containers(html, max_chars=MAX_CONTAINER_CHARS, chunk_size=None):
+    content = html.encode('utf-8')
+    if chunk_size:
+        content = [content[start:start + chunk_size] for start in range(0, len(content), chunk_size)]
+    return list(iter_containers(content, ['div', 'article'], CLASS_RE, max_chars=max_chars))
+
+
+def test_nested_containers_are_captured_separately_in_document_order():
+    html = ('<main><div class="event-card"><h3>Outer</h3>'
+            '<div class="wrapper"><article class="event-item"><h3>Inner &amp; caf&#233;</h3></article></div>'
+            '<p>after</p></div><div class="card"><br/>Last</div></main>')
+
+    expected = [
+        '<div class="event-card"><h3>Outer</h3><div class="wrapper"><article class="event-item">'
+        '<h3>Inner &amp; caf&#233;</h3></article></div><p>after</p></div>',
+        '<article class="event-item"><h3>Inner &amp; caf&#233;</h3></article>',
+        '<div class="card"><br/>Last</div>'
+    ]
+    assert containers(html) == expected
+    # Chunk boundaries inside tags, entities and multibyte characters change nothing
+    assert containers(html.replace('Last', 'Läst'), chunk_size=1) == expected[:2] + ['<div class="card"><br/>Läst</div>']
+
+
+def test_unclosed_containers_end_with_the_document():
+    assert containers('<div class="event"><p>Open') == ['<div class="event"><p>Open']
+
+
+def test_oversized_containers_are_dropped_in_place_and_counted():
+    filler = 'x' * 300
+    html = (f'<div class="event">First</div>'
+            f'<div class="event-wrapper">{filler}<div class="event-item">Nested</div>{filler}</div>'
+            f'<div class="event">Last</div>')
+
+    tokenizer = ContainerTokenizer(['div'], CLASS_RE, max_chars=200)
+    tokenizer.feed(html)
+    tokenizer.close()
+    # The wrapper is dropped where it started, the small container inside it is kept
+    assert list(tokenizer.released()) == [
+        '<div class="event">First</div>', None, '<div class="event-item">Nested</div>', '<div class="event">Last</div>'
+    ]
+    assert tokenizer.dropped == 1
+
+
+def test_streamed_and_document_paths_skip_the_same_oversized_containers():
+    pytest.importorskip('bs4')
+    pytest.importorskip('requests')
+    from src.scrapers.iamsterdam_scraper import IAmsterdamScraper
+
+    def card(index, description='Free entry.'):
+        return (f'<div class="event-card"><h3 class="event-title">Free Concert #{index}</h3>'
+                f'<span class="event-date">{index + 1} July 2030 19:00 - 21:00</span>'
+                f'<p class="event-location">Paradiso</p><p class="event-description">{description}</p></div>')
+
+    # The second card is larger than MAX_CONTAINER_CHARS: skipped, but one of the max_events slots
+    cards = [card(0), card(1, 'Free entry. ' * (MAX_CONTAINER_CHARS // 10)), card(2), card(3)]
+    page = f'<html><body><main>{"".join(cards)}</main></body></html>'.encode('utf-8')
+
+    streamed = IAmsterdamScraper(stream_listing=True).parse_listing(page, max_events=3)
+    document = IAmsterdamScraper(stream_listing=False).parse_listing(page, max_events=3)
+    assert [event['title'] for event in streamed] == ['Free Concert #0', 'Free Concert #2']
+    assert streamed == document
@@ -0,0 +1,92 @@
+import io
+import os
+import hashlib
+import pytest
+
+Image = pytest.importorskip('PIL.Image')
+pytest.importorskip('requests')
+
+from src.scrapers import image_cache
+from src.scrapers.image_cache import IMAGE_ROUTE, ImageCache, image_cache_lookups_total
+
+
+def png(width, height, color):
+    output = io.BytesIO()
+    Image.new('RGB', (width, height), color).save(output, format='PNG')
+    return output.getvalue()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ImageCache(directory=str(tmp_path / 'images'))
+
+
+def test_cache_url_stores_a_content_addressed_thumbnail(cache, stand_in_server):
+    stand_in_server.add('/red.png', png(1600, 1000, 'red'), content_type='image/png')
+    stand_in_server.add('/copy-of-red.png', png(1600, 1000, 'red'), content_type='image/png')
+
+    name = cache.cache_url(stand_in_server.url + '/red.png')
+    with open(cache.path_for(name), 'rb') as stored:
+        data = stored.read()
+    assert name == hashlib.sha256(data).hexdigest() + '.webp'
+    with Image.open(io.BytesIO(data)) as thumbnail:
+        assert thumbnail.format == 'WEBP'
+        assert thumbnail.size == (800, 500)
+
+    # Known URLs are not downloaded again, identical images share one file
+    assert cache.cache_url(stand_in_server.url + '/red.png') == name
+    assert cache.cache_url(stand_in_server.url + '/copy-of-red.png') == name
+    assert stand_in_server.requests == ['/red.png', '/copy-of-red.png']
+
+
+def test_failed_and_placeholder_urls_are_not_requested_again(cache, stand_in_server):
+    missing = stand_in_server.url + '/missing.png'
+    before = image_cache_lookups_total.value(result='skipped')
+
+    assert cache.cache_url(missing) is None
+    assert cache.cache_url(missing) is None
+    assert cache.cache_url('https://via.placeholder.com/400x250') is None
+    assert stand_in_server.requests == ['/missing.png']
+    assert image_cache_lookups_total.value(result='skipped') == before + 2
+
+    # Retried once the failure is older than failure_ttl
+    cache.failure_ttl = 0
+    stand_in_server.add('/missing.png', png(40, 25, 'blue'), content_type='image/png')
+    assert cache.cache_url(missing)
+    assert stand_in_server.requests == ['/missing.png', '/missing.png']
+
+
+def test_evict_removes_least_recently_used_images_not_kept(cache, stand_in_server):
+    names = []
+    for index, color in enumerate(('red', 'green', 'blue')):
+        stand_in_server.add(f'/{index}.png', png(400, 250, color), content_type='image/png')
+        names.append(cache.cache_url(f'{stand_in_server.url}/{index}.png'))
+    for age, name in enumerate(names):
+        os.utime(cache.path_for(name), (1000 * age, 1000 * age))
+    sizes = [os.path.getsize(cache.path_for(name)) for name in names]
+    cache.max_bytes = sum(sizes) - 1
+
+    assert cache.over_budget()
+    assert cache.evict(keep={names[0]}) == 1
+    assert cache.path_for(names[0])
+    assert cache.path_for(names[1]) is None
+    assert cache.path_for(names[2])
+
+
+def test_image_route_serves_cached_images_as_immutable(app, cache, stand_in_server, monkeypatch):
+    monkeypatch.setattr(image_cache, '_image_cache', cache)
+    stand_in_server.add('/red.png', png(400, 250, 'red'), content_type='image/png')
+    name = cache.cache_url(stand_in_server.url + '/red.png')
+
+    client = app.test_client()
+    response = client.get(IMAGE_ROUTE + name)
+    assert response.status_code == 200
+    assert response.mimetype == 'image/webp'
+    assert response.headers['Cache-Control'] == 'public, max-age=31536000, immutable'
+    assert response.data == open(cache.path_for(name), 'rb').read()
+    response.close()
+
+    revalidated = client.get(IMAGE_ROUTE + name, headers={'If-None-Match': response.headers['ETag']})
+    assert revalidated.status_code == 304
+    assert client.get(IMAGE_ROUTE + '0' * 64 + '.webp').status_code == 404
+    assert client.get(IMAGE_ROUTE + '..%2Fevents.db').status_code == 404
@@ -0,0 +1,76 @@
+import pytest
+
+pytest.importorskip('bs4')
+pytest.importorskip('requests')
+
+from src.scrapers import parsing
+from src.scrapers.parsing import ParsePool, parse_pool_units_total
+from src.scrapers.sources import get_registered_sources
+
+
+def iamsterdam_page(events):
+    cards = ''.join(
+        f'<div class="event-card"><h3 class="event-title">Free Concert #{index}</h3>'
+        f'<span class="event-date">{index % 28 + 1} July 2030 19:00 - 21:00</span>'
+        f'<p class="event-location">Paradiso</p><p class="event-description">Free entry.</p></div>'
+        for index in range(events)
+    )
+    return f'<html><body><main>{cards}</main></body></html>'.encode('utf-8')
+
+
+def eventbrite_page(base_url, events):
+    cards = ''.join(
+        f'<article class="search-event-card"><h3 class="event-card__title">Jazz Night #{index}</h3>'
+        f'<a href="{base_url}/e/event-{index}">Details</a><time datetime="2030-07-{index % 28 + 1:02d}T20:00:00">x</time>'
+        f'<div class="event-card__location">Bimhuis</div></article>'
+        for index in range(events)
+    )
+    return f'<html><body>{cards}</body></html>'.encode('utf-8')
+
+
+def detail_page(index):
+    description = f'Event {index}: an evening of improvised music with local and visiting musicians.'
+    return f'<html><body><div class="event-description">{description}</div></body></html>'.encode('utf-8')
+
+
+def scrape(source_key, pool, monkeypatch, configure, **options):
+    monkeypatch.setattr(parsing, '_parse_pool', pool)
+    source = get_registered_sources()[source_key](
+        adaptive=None, circuit_breaker=None, cache_images=False, max_events=100, **options)
+    configure(source.scraper)
+    try:
+        return list(source.scrape())
+    finally:
+        pool.shutdown()
+
+
+def test_streamed_listing_containers_are_parsed_in_workers(stand_in_server, monkeypatch):
+    stand_in_server.add('/calendar', iamsterdam_page(40))
+
+    def configure(scraper):
+        scraper.events_url = stand_in_server.url + '/calendar'
+
+    in_process = scrape('iamsterdam', ParsePool(workers=0), monkeypatch, configure)
+    before = parse_pool_units_total.value(source='I amsterdam', method='parse')
+    pooled = scrape('iamsterdam', ParsePool(workers=2, batch_size=4), monkeypatch, configure)
+
+    assert len(in_process) == 40
+    assert pooled == in_process
+    # Every container went to a worker, in 10 batches
+    assert parse_pool_units_total.value(source='I amsterdam', method='parse') - before == 40
+
+
+def test_event_pages_are_parsed_in_workers(stand_in_server, monkeypatch):
+    stand_in_server.add('/listing', eventbrite_page(stand_in_server.url, 12))
+    for index in range(12):
+        stand_in_server.add(f'/e/event-{index}', detail_page(index))
+
+    def configure(scraper):
+        scraper.search_url = stand_in_server.url + '/listing'
+
+    before = parse_pool_units_total.value(source='Eventbrite', method='parse_detail')
+    events = scrape('eventbrite', ParsePool(workers=2), monkeypatch, configure, structured_first=False)
+
+    assert len(events) == 12
+    assert parse_pool_units_total.value(source='Eventbrite', method='parse_detail') - before == 12
+    assert all(event['description'].startswith(f"Event {event['title'].split('#')[1]}:") for event in events)
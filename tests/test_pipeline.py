@@ -0,0 +1,26 @@
+from src.models.event import Event, db
+from src.scrapers.pipeline import BatchedEventWriter, events_rejected_total
+
+
+def event_data(title, **values):
+    return dict({'title': title, 'date': '2030-05-01', 'time': '20:00', 'location': 'Paradiso',
+                 'category': 'Music', 'source': 'Test'}, **values)
+
+
+def test_rejected_rows_are_skipped_without_failing_the_batch(db_app):
+    with db_app.app_context():
+        before = events_rejected_total.value(source='Test')
+        writer = BatchedEventWriter(batch_size=100)
+        events = [event_data(f'Concert #{index}') for index in range(10)]
+        # title is NOT NULL, so the database rejects this row
+        events.insert(4, event_data(None))
+        for event in events:
+            writer.add('Test', event)
+        result = writer.finish('Test')
+
+        assert result['events_processed'] == 10
+        assert result['events_new'] == 10
+        assert result['events_rejected'] == 1
+        assert events_rejected_total.value(source='Test') == before + 1
+        db.session.expire_all()
+        assert Event.query.filter(Event.is_active == True).count() == 10
@@ -0,0 +1,56 @@
+import gzip
+import json
+from datetime import date, timedelta
+from sqlalchemy import text
+from src.instrumentation import db_statements_total
+from src.models.event import Event, db
+from src.models.retention import deactivate_missing_events, delete_past_events
+
+
+def event_data(title, days_from_today=1, source='Test'):
+    event_date = (date.today() + timedelta(days=days_from_today)).strftime('%Y-%m-%d')
+    return {'title': title, 'date': event_date, 'time': '20:00', 'location': 'Paradiso',
+            'category': 'Music', 'source': source}
+
+
+def test_delete_past_events_deletes_in_batches_and_archives(db_app, tmp_path):
+    with db_app.app_context():
+        Event.upsert_events(
+            [event_data(f'Past #{index}', days_from_today=-45) for index in range(7)]
+            + [event_data('Last week', days_from_today=-7), event_data('Tomorrow'), dict(event_data('Undated'), date='')]
+        )
+        db.session.commit()
+
+        before = db_statements_total.value(operation='DELETE')
+        assert delete_past_events(days_old=30, batch_size=3, archive_dir=str(tmp_path)) == 7
+        # Batches of 3, 3 and 1 rows, one statement and transaction each
+        assert db_statements_total.value(operation='DELETE') == before + 3
+
+        db.session.expire_all()
+        assert sorted(event.title for event in Event.query) == ['Last week', 'Tomorrow', 'Undated']
+        (archive,) = tmp_path.glob('events-*.ndjson.gz')
+        with gzip.open(archive, 'rt', encoding='utf-8') as lines:
+            archived = [json.loads(line) for line in lines]
+        assert sorted(event['title'] for event in archived) == [f'Past #{index}' for index in range(7)]
+
+
+def test_deactivate_missing_events_anti_joins_the_seen_ids(db_app):
+    with db_app.app_context():
+        # More ids than SQLite allows bound parameters in one statement
+        event_ids = Event.upsert_events([event_data(f'Concert #{index}') for index in range(1200)])
+        other_ids = Event.upsert_events([event_data('Elsewhere', source='Other')])
+        db.session.commit()
+        seen = event_ids[:1100]
+        before = max(event.change_seq for event in Event.query)
+
+        assert deactivate_missing_events('Test', seen) == 100
+        db.session.commit()
+
+        db.session.expire_all()
+        inactive = Event.query.filter(Event.is_active == False).all()
+        assert sorted(event.id for event in inactive) == sorted(event_ids[1100:])
+        assert all(event.change_seq > before for event in inactive)
+        assert db.session.get(Event, other_ids[0]).is_active
+        assert db.session.execute(text('SELECT COUNT(*) FROM seen_event_ids')).scalar() == 0
+        # Nothing left to deactivate on the next run
+        assert deactivate_missing_events('Test', seen) == 0
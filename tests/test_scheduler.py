@@ -0,0 +1,58 @@
+from datetime import timezone
+from types import SimpleNamespace
+import pytest
+from src.models import event_index
+from src.models.scrape_run import ScrapeRun
+from src.scheduler import EventScheduler
+
+
+@pytest.fixture
+def scheduler(db_app, monkeypatch):
+    """EventScheduler on db_app whose one-off jobs are collected instead of scheduled"""
+    monkeypatch.setattr(event_index, '_index', None)
+    scheduler = EventScheduler()
+    scheduler.app = db_app
+    scheduler.jobs = []
+    scheduler.scheduler = SimpleNamespace(timezone=timezone.utc, add_job=lambda **job: scheduler.jobs.append(job))
+    scheduler.updates = []
+
+    def update_all_events(force, cancel_token):
+        scheduler.updates.append(force)
+        return {'total_events': 0, 'errors': [], 'sources': {}}
+
+    scheduler.data_manager = SimpleNamespace(update_all_events=update_all_events)
+    return scheduler
+
+
+def run_job(job):
+    return job['func'](*job.get('args', ()), **job.get('kwargs', {}))
+
+
+def test_queued_manual_job_is_skipped_once_a_periodic_run_took_the_request(scheduler):
+    assert scheduler.trigger_manual_update()
+    (job,) = scheduler.jobs
+
+    # The periodic tick starts first and runs the pending request as a forced manual run
+    scheduler.scheduled_update()
+    assert scheduler.updates == [True]
+    assert run_job(job) is None
+    assert scheduler.updates == [True]
+
+    with scheduler.app.app_context():
+        assert [run['trigger'] for run in ScrapeRun.recent()] == ['manual']
+
+
+def test_queued_manual_job_runs_a_pending_request(scheduler):
+    assert scheduler.trigger_manual_update()
+    # Coalesced into the pending request, no second job
+    assert scheduler.trigger_manual_update()
+    (job,) = scheduler.jobs
+
+    assert run_job(job) is not None
+    assert scheduler.updates == [True]
+    # A periodic tick afterwards is an ordinary scheduled run
+    scheduler.scheduled_update()
+    assert scheduler.updates == [True, False]
+
+    with scheduler.app.app_context():
+        assert [run['trigger'] for run in ScrapeRun.recent()] == ['scheduled', 'manual']
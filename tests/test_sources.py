@@ -0,0 +1,23 @@
+import pytest
+
+pytest.importorskip('bs4')
+pytest.importorskip('requests')
+
+from src.scrapers.sources import EventSource, get_registered_sources
+
+
+def test_source_options_are_copied_per_instance():
+    source_class = get_registered_sources()['eventbrite']
+    options = {'failure_threshold': 5}
+    first = source_class(circuit_breaker=options)
+    second = source_class()
+
+    first.adaptive['min_minutes'] = 1
+    first.circuit_breaker['reset_timeout'] = 1
+    assert second.adaptive == {} and second.circuit_breaker == {}
+    assert EventSource.adaptive == {} and EventSource.circuit_breaker == {}
+    assert options == {'failure_threshold': 5}
+    assert first.breaker.failure_threshold == 5
+
+    disabled = source_class(adaptive=None, circuit_breaker=None)
+    assert disabled.schedule is None and disabled.breaker is None
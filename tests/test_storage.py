@@ -0,0 +1,202 @@
+from sqlalchemy import text
+from src.models.event import Event, db
+from src.models.storage import POSTGRES_SEARCH_INDEXES, REPLICA_BIND, dialect_name, read_session
+
+
+def event_data(title, **values):
+    data = {
+        'title': title,
+        'description': '',
+        'date': '2030-05-01',
+        'time': '20:00',
+        'location': 'Paradiso',
+        'category': 'Music',
+        'cost': 'Free',
+        'source': 'Test'
+    }
+    data.update(values)
+    return data
+
+
+def events_by_title():
+    db.session.expire_all()
+    return {event.title: event for event in Event.query}
+
+
+def test_upsert_events_inserts_new_events(db_app):
+    with db_app.app_context():
+        event_ids = Event.upsert_events([event_data('Jazz Night'), event_data('Poetry Slam')])
+        db.session.commit()
+
+        events = events_by_title()
+        assert sorted(event_ids) == sorted(event.id for event in events.values())
+        assert all(event.is_active and event.change_seq > 0 for event in events.values())
+
+
+def test_upsert_events_updates_on_conflict(db_app):
+    with db_app.app_context():
+        first_ids = Event.upsert_events([event_data('Jazz Night'), event_data('Poetry Slam')])
+        db.session.commit()
+        before = {title: event.change_seq for title, event in events_by_title().items()}
+
+        # Same unique key: RETURNING yields the existing rows, only changed ones move in the change feed
+        event_ids = Event.upsert_events([event_data('Jazz Night'), event_data('Poetry Slam', cost='EUR 5')])
+        db.session.commit()
+
+        events = events_by_title()
+        assert len(events) == 2
+        assert sorted(event_ids) == sorted(first_ids)
+        assert events['Poetry Slam'].cost == 'EUR 5'
+        assert events['Poetry Slam'].change_seq > before['Poetry Slam']
+        assert events['Jazz Night'].change_seq == before['Jazz Night']
+
+
+def test_upsert_events_reactivates_and_deduplicates(db_app):
+    with db_app.app_context():
+        Event.upsert_events([event_data('Jazz Night')])
+        db.session.commit()
+        Event.deactivate_old_events('Test', [])
+        db.session.commit()
+        before = events_by_title()['Jazz Night'].change_seq
+
+        event_ids = Event.upsert_events([event_data('Jazz Night'), event_data('Jazz Night', time='21:00')])
+        db.session.commit()
+
+        event = events_by_title()['Jazz Night']
+        assert event_ids == [event.id]
+        assert event.is_active
+        assert event.time == '21:00'
+        assert event.change_seq > before
+
+
+def test_upsert_events_keeps_cached_image_when_download_failed(db_app):
+    with db_app.app_context():
+        Event.upsert_events([event_data('Jazz Night', image='/api/images/' + 'a' * 64 + '.webp')])
+        db.session.commit()
+        before = events_by_title()['Jazz Night']
+        image, change_seq = before.image, before.change_seq
+
+        # The image could not be cached this run, so the scraper kept the remote URL
+        scraped = [event_data('Jazz Night', image='https://example.com/jazz.jpg')]
+        assert Event.count_changes('Test', scraped) == {'new': 0, 'changed': 0, 'unchanged': 1}
+        Event.upsert_events(scraped)
+        db.session.commit()
+
+        event = events_by_title()['Jazz Night']
+        assert event.image == image
+        assert event.change_seq == change_seq
+
+
+def test_upsert_events_keeps_coordinates_when_geocoding_failed(db_app):
+    with db_app.app_context():
+        Event.upsert_events([event_data('Jazz Night', latitude=52.362, longitude=4.883)])
+        db.session.commit()
+        before = events_by_title()['Jazz Night']
+        geo_cell, change_seq = before.geo_cell, before.change_seq
+
+        # No coordinates this run: the geocoder failed, was skipped or the run was cancelled
+        scraped = [event_data('Jazz Night')]
+        assert Event.count_changes('Test', scraped) == {'new': 0, 'changed': 0, 'unchanged': 1}
+        Event.upsert_events(scraped)
+        db.session.commit()
+
+        event = events_by_title()['Jazz Night']
+        assert (event.latitude, event.longitude, event.geo_cell) == (52.362, 4.883, geo_cell)
+        assert event.change_seq == change_seq
+
+
+def test_count_changes_matches_on_title_and_date(db_app):
+    with db_app.app_context():
+        Event.upsert_events([event_data('Jazz Night'), event_data('Jazz Night', date='2030-05-08')])
+        db.session.commit()
+
+        scraped = [
+            event_data('Jazz Night'),
+            event_data('Jazz Night', date='2030-05-08', cost='EUR 5'),
+            event_data('Jazz Night', date='2030-05-15')
+        ]
+        assert Event.count_changes('Test', scraped) == {'new': 1, 'changed': 1, 'unchanged': 1}
+        assert Event.count_changes('Other', scraped) == {'new': 3, 'changed': 0, 'unchanged': 0}
+        assert Event.count_changes('Test', []) == {'new': 0, 'changed': 0, 'unchanged': 0}
+
+
+def test_upsert_event_only_moves_changed_events_in_the_change_feed(db_app):
+    with db_app.app_context():
+        Event.upsert_event(event_data('Jazz Night', latitude=52.362, longitude=4.883))
+        db.session.commit()
+        before = events_by_title()['Jazz Night']
+        change_seq, geo_cell = before.change_seq, before.geo_cell
+
+        # Seen again without coordinates: unchanged
+        Event.upsert_event(event_data('Jazz Night'))
+        db.session.commit()
+        event = events_by_title()['Jazz Night']
+        assert event.change_seq == change_seq
+        assert (event.latitude, event.longitude, event.geo_cell) == (52.362, 4.883, geo_cell)
+
+        Event.upsert_event(event_data('Jazz Night', cost='EUR 5'))
+        db.session.commit()
+        event = events_by_title()['Jazz Night']
+        assert event.cost == 'EUR 5'
+        assert event.change_seq > change_seq
+
+
+def test_search_matches_substrings_case_insensitively(db_app):
+    with db_app.app_context():
+        Event.upsert_events([
+            event_data('Jazz Night', description='Live music in the Bimhuis'),
+            event_data('Poetry Slam', location='OBA Oosterdok'),
+            event_data('Canal Tour', category='Tours')
+        ])
+        db.session.commit()
+
+        def titles(search):
+            return sorted(event.title for event in Event.get_active_events(search=search))
+
+        assert titles('BIMHUIS') == ['Jazz Night']
+        assert titles('oosterdok') == ['Poetry Slam']
+        assert titles('slam') == ['Poetry Slam']
+        assert titles('night') == ['Jazz Night']
+        assert titles('opera') == []
+
+
+def test_postgres_creates_trigram_search_indexes(db_app):
+    with db_app.app_context():
+        if dialect_name() != 'postgresql':
+            return
+        indexes = {
+            row[0] for row in db.session.execute(text("SELECT indexname FROM pg_indexes WHERE tablename = 'events'"))
+        }
+        assert set(POSTGRES_SEARCH_INDEXES) <= indexes
+        assert db.session.execute(text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")).scalar() == 1
+
+
+def test_read_session_defaults_to_primary(db_app):
+    with db_app.app_context():
+        assert read_session() is db.session
+
+
+def test_read_session_routes_reads_to_replica(make_app, database_url, tmp_path):
+    # SQLite gets a separate replica file; PostgreSQL uses the same database through a second bind
+    replica_url = f"sqlite:///{tmp_path / 'replica.db'}" if database_url.startswith('sqlite') else database_url
+    app = make_app(database_url, replica_url=replica_url)
+    try:
+        with app.app_context():
+            db.metadata.create_all(db.engines[REPLICA_BIND])
+            assert read_session().get_bind() is db.engines[REPLICA_BIND]
+
+            Event.upsert_events([event_data('Jazz Night')])
+            db.session.commit()
+            assert Event.query.count() == 1
+
+            titles = [event.title for event in Event.get_active_events()]
+            if replica_url == database_url:
+                assert titles == ['Jazz Night']
+            else:
+                # Written to the primary only, so reads from the replica do not see it
+                assert titles == []
+    finally:
+        with app.app_context():
+            read_session().remove()
+            db.session.remove()
+            db.drop_all()